@@ -4,19 +4,23 @@ from pygame.math import Vector2
 from logic_circuits.pygame_representation import fonts
 from logic_circuits.pygame_representation.colors import BG, TEXT, WIRE_HOT
 from logic_circuits.pygame_representation.utils import (
-    draw_grid, cubic_bezier,
-    cut_wired, block_under_mouse,
-    port_under_mouse, find_wire_under_mouse,
-    truthtable_print
+    cubic_bezier,
+    cut_wired,
+    cut_removed_ports,
+    truthtable_print, make_play_button
 )
 from logic_circuits.pygame_representation.gates_graphical import (
     GatePass_graphical, SysIN_graphical
 )
 from logic_circuits.pygame_representation.wires import Wire
-from logic_circuits.pygame_representation.button import Button
 from logic_circuits.pygame_representation.library import library_items
+from logic_circuits.pygame_representation.render import (
+    Renderer, background, bounding_rect, block_item, wire_item
+)
+from logic_circuits.pygame_representation.spatial import EditorIndex
+from logic_circuits.pygame_representation.persistence import save_editor, load_editor
 from logic_circuits.pygame_representation.pygame_cfg import *
-from logic_circuits.gates.gates import make_combined_gate_class
+from logic_circuits.simulation.worker import SimulationWorker, CircuitCapture
 
 import numpy as np
 def main():
@@ -29,18 +33,12 @@ def main():
     screen = pygame.display.set_mode((W, H))
     pygame.display.set_caption("Wire Editor")
     clock = pygame.time.Clock()
+    renderer = Renderer(screen, background(W, H))
 
     # -------------------
     # UI ELEMENTS
     # -------------------
-    play_button = Button(
-        rect=(W - 140, 20, 120, 40),
-        text="Play",
-        font=fonts.FONT,
-        bg_color=(50, 180, 90),
-        fg_color=(255, 255, 255),
-        hover_color=(70, 200, 110),
-    )
+    play_button = make_play_button()
 
     # -------------------
     # BLOCKS / STATE
@@ -48,11 +46,47 @@ def main():
     sysin = SysIN_graphical(name="SysIN", num_in=2, num_out=2, x=50, y = (H-140)//2)
     sysout = GatePass_graphical(name="SysOUT", num_in=2, num_out=2, x=600, y = (H-140)//2)
     blocks = [sysin, sysout]
+    index = EditorIndex()
+    for b in blocks:
+        index.add_block(b)
+
+    # the circuit is simulated on a background thread; drawing only reads
+    # its latest snapshot, a new one wakes the (possibly idle) loop
+    SNAPSHOT = pygame.event.custom_type()
+    worker = SimulationWorker(on_publish=lambda snap: pygame.event.post(pygame.event.Event(SNAPSHOT)))
+
+    def resimulate():
+        worker.load(blocks, connections, sysin)
+        worker.set_inputs(sysin.state)
 
     # Interaction state
     wires = []
     connections = []
 
+    def save(path=EDITOR_FILE):
+        try:
+            save_editor(path, blocks, connections, sysin, sysout)
+            print(f"saved {path}")
+        except (OSError, ValueError) as e:
+            print(f"could not save {path}: {e}")
+
+    def open_file(path=EDITOR_FILE):
+        nonlocal blocks, wires, connections, sysin, sysout, index
+        try:
+            loaded = load_editor(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"could not load {path}: {e}")
+            return
+        blocks, wires, connections, sysin, sysout = loaded
+        index = EditorIndex()
+        for b in blocks:
+            index.add_block(b)
+        for w in wires:
+            index.add_wire(w)
+        renderer.invalidate()
+        resimulate()
+        print(f"loaded {path}")
+
     dragging_library_item = None
     ghost_gate = None
 
@@ -66,14 +100,20 @@ def main():
 
     truth_lines = None
     running = True
+    idle = False
+    resimulate()
 
     # -------------------
     # MAIN LOOP
     # -------------------
     while running:
+        events = pygame.event.get()
+        if not events and idle:
+            # nothing changed last frame: sleep until something happens
+            events = [pygame.event.wait(250)]
         mx, my = pygame.mouse.get_pos()
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
@@ -89,8 +129,8 @@ def main():
                         break
                 else:
                     # Normal port/gate drag logic
-                    port_g = port_under_mouse((mx, my), blocks)
-                    gate_g = block_under_mouse((mx, my), blocks)
+                    port_g = index.port_at((mx, my))
+                    gate_g = index.block_at((mx, my))
                     if port_g and port_g.kind == "out":
                         drag_start_port_g = port_g
                         port_drag_pos = Vector2(mx, my)
@@ -99,18 +139,33 @@ def main():
                         drag_start_gate_g = gate_g
                         block_drag_offset = Vector2(mx - gate_g.rect.x, my - gate_g.rect.y)
         
-                for b in blocks:
-                    if isinstance(b, (SysIN_graphical, GatePass_graphical)):
-                        if b.hover_plus((mx, my)):
-                            b.increase_ports()
-                            wires = cut_wired(wires, b)
-
-                        # if isinstance(b, SysIN_graphical):
-                        #     b.
-
-                        if b.hover_minus((mx, my)):
-                            b.decrease_ports()
-                            wires = cut_wired(wires, b)
+                for b in index.resizers_at((mx, my)):
+                    if b.hover_plus((mx, my)):
+                        b.increase_ports()
+                        index.update_block(b)
+                        resimulate()
+
+                    # if isinstance(b, SysIN_graphical):
+                    #     b.
+
+                    if b.hover_minus((mx, my)):
+                        # the gates drop the wiring of the removed ports
+                        # themselves; the editor only forgets its wires
+                        b.decrease_ports()
+                        kept = cut_removed_ports(wires, b)
+                        for w in set(wires).difference(kept):
+                            index.remove_wire(w)
+                        wires = kept
+                        index.update_block(b)
+                        connections[:] = [c for c in connections if c[2] < c[0].num_out and c[3] < c[1].num_in]
+                        resimulate()
+
+            elif event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL and event.key in (pygame.K_s, pygame.K_o):
+                if event.key == pygame.K_s:
+                    save()
+                else:
+                    drag_start_port_g = drag_start_gate_g = ghost_gate = dragging_library_item = None
+                    open_file()
 
             elif event.type == pygame.KEYDOWN:
                 state_now = sysin.state.copy()
@@ -122,13 +177,13 @@ def main():
                 # back to bools
                 out = [(n >> i) & 1 == 1 for i in reversed(range(len(state_now)))]  # [True, True]
                 sysin.set_state(np.arange(len(state_now)), out)
+                worker.set_inputs(sysin.state)
 
             # MOUSE MOVE
             # -------------------
             elif event.type == pygame.MOUSEMOTION:
                 if ghost_gate:
                     ghost_gate.rect.center = (mx, my)
-                    ghost_gate._make_ports()
                 if drag_start_port_g:
                     port_drag_pos = Vector2(mx, my)
                 if drag_start_gate_g:
@@ -148,16 +203,19 @@ def main():
                             w=100, h=100
                         )
                         blocks.append(new_gate)
+                        index.add_block(new_gate)
+                        resimulate()
                     ghost_gate = None
                     dragging_library_item = None
 
                 elif drag_start_port_g:
-                    drag_stop_port_g = port_under_mouse((mx, my), blocks, kind="in")
+                    drag_stop_port_g = index.port_at((mx, my), kind="in")
                     if drag_stop_port_g and drag_stop_port_g != drag_start_port_g:
                         if drag_start_port_g.gate != drag_stop_port_g.gate:
                             drag_stop_port_g.gate.wire_up(gate_g, drag_stop_port_g.gate, drag_start_port_g.index, drag_stop_port_g.index)
                             
                             wires.append(Wire(drag_start_port_g, drag_stop_port_g))
+                            index.add_wire(wires[-1])
                             print(f"wiring {drag_start_port_g.gate.name}[{drag_start_port_g.index}] -> {drag_stop_port_g.gate.name}[{drag_stop_port_g.index}]")
                             
                             connections.append(
@@ -168,6 +226,7 @@ def main():
                                     drag_stop_port_g.index,
                                 )
                             )
+                            resimulate()
                     drag_start_port_g = None
 
                 if drag_start_gate_g:
@@ -184,22 +243,27 @@ def main():
                     drag_start_port_g = None
                 else:
                     # Try wire
-                    w = find_wire_under_mouse((mx, my), wires)
+                    w = index.wire_at((mx, my))
                     if w:
                         wires.remove(w)
+                        index.remove_wire(w)
                         conn_tuple = (w.a.gate, w.b.gate, w.a.index, w.b.index)
                         if conn_tuple in connections:
                             connections.remove(conn_tuple)
+                        resimulate()
                     else:
                         # Try block
-                        g = block_under_mouse((mx, my), blocks)
+                        g = index.block_at((mx, my))
                         if g and g in blocks:
                             wires = cut_wired(wires, g)
+                            index.remove_wires_of(g)
                             connections[:] = [
                                 c for c in connections if c[0] != g and c[1] != g
                             ]
                             if not isinstance(g, (SysIN_graphical, GatePass_graphical)):
                                 blocks.remove(g)
+                                index.remove_block(g)
+                            resimulate()
 
             # -------------------
             # ESC to cancel drags
@@ -215,17 +279,10 @@ def main():
             # -------------------
             if play_button.handle_event(event):
                 if len(connections) > 0:
-                    new_gate = make_combined_gate_class(
-                        "SysOut",
-                        connections=connections,
-                        end_gates=[sysout],
-                        num_in=sysin.num_in,
-                        num_out=sysout.num_out,
-                        x=0, y=0
-                    )
-                    this_gate = new_gate("SysOUT")
-                    # truthtable_window(this_gate, sysin)
-                    truthtable_print(this_gate, sysin)
+                    # the wiring is captured here, compiled and tabulated on
+                    # the job thread while the editor keeps running
+                    circuit = CircuitCapture([sysout], connections, sysin)
+                    worker.submit(lambda: truthtable_print(circuit.compile(), None))
 
         # -------------------
         # Dragging gates around
@@ -234,8 +291,8 @@ def main():
             grid_size = 10
             snapped_x = (mx - block_drag_offset.x) // grid_size * grid_size
             snapped_y = (my - block_drag_offset.y) // grid_size * grid_size
+            moved = drag_start_gate_g.rect.topleft != (snapped_x, snapped_y)
             drag_start_gate_g.rect.topleft = (snapped_x, snapped_y)
-            drag_start_gate_g._make_ports()
             if isinstance(drag_start_gate_g, (SysIN_graphical, GatePass_graphical)):
                 drag_start_gate_g.plus.topleft = (
                     snapped_x + drag_start_gate_g._w // 2,
@@ -245,30 +302,30 @@ def main():
                     snapped_x + drag_start_gate_g._w // 2,
                     snapped_y + drag_start_gate_g._h - drag_start_gate_g._h // 10,
                 )
+            if moved:
+                index.update_block(drag_start_gate_g)
 
         # -------------------
-        # Drawing
+        # Drawing: describe the scene, the renderer redraws what changed
         # -------------------
-        screen.fill(BG)
-        draw_grid(screen, W, H)
-
-        # Draw library sidebar
-        # pygame.draw.rect(screen, (30, 30, 30), (0, 200, LIBRARY_WIDTH, LIBRARY_HEIGHT))
-        for item in library_items:
-            item.draw(screen)
+        mouse = (mx, my)
+        items = []
+        for i, item in enumerate(library_items):
+            items.append((("library", i), item.rect, item.text, item.draw))
 
         # Blocks
         for b_ in blocks:
-            b_.draw(screen)
+            items.append(block_item(b_, mouse))
 
         # Ghost gate being dragged
         if ghost_gate:
-            ghost_gate.draw(screen)
+            items.append(("ghost", ghost_gate.rect.inflate(4, 4), tuple(ghost_gate.rect), ghost_gate.draw))
 
         # Wires
-        hot_wire = find_wire_under_mouse((mx, my), wires)
+        hot_wire = index.wire_at(mouse)
+        snapshot = worker.snapshot
         for w in wires:
-            w.draw(screen, hot=(w is hot_wire))
+            items.append(wire_item(w, hot=(w is hot_wire), value=snapshot.value(w.a.gate, w.a.index)))
 
         # Live wire being dragged
         if drag_start_port_g:
@@ -277,34 +334,38 @@ def main():
             dx = max(40, abs(p3.x - p0.x) * 0.5)
             c1, c2 = Vector2(p0.x + dx, p0.y), Vector2(p3.x - dx, p3.y)
             pts = cubic_bezier(p0, c1, c2, p3, steps=36)
-            pygame.draw.lines(screen, WIRE_HOT, False, pts, 3)
+            drag_stop_port_g = index.port_at(mouse, kind="in")
+
+            def draw_live(surf, pts=pts, port=drag_stop_port_g):
+                pygame.draw.lines(surf, WIRE_HOT, False, pts, 3)
+                if port:
+                    port.draw(surf, hot=True)
 
-            drag_stop_port_g = port_under_mouse((mx, my), blocks, kind="in")
+            rect = bounding_rect(pts, 4)
             if drag_stop_port_g:
-                drag_stop_port_g.draw(screen, hot=True)
+                rect.union_ip(bounding_rect([drag_stop_port_g.screen_pos()], 40))
+            items.append(("live", rect, (pts[0], pts[-1], id(drag_stop_port_g)), draw_live))
+            hint_text = "Release on input to connect (RMB/ESC cancel)"
+        else:
+            hint_text = f"LMB drag block | LMB drag from output→input | RMB delete wire/gate \n UP/DOWN toggle input | Ctrl+S save, Ctrl+O open"
 
-            hint = fonts.FONT.render(
-                "Release on input to connect (RMB/ESC cancel)", True, TEXT
-            )
-            screen.blit(hint, (12, 10))
+        hint_rect = pygame.Rect((12, 10), fonts.FONT.size(hint_text))
+        items.append(("hint", hint_rect, hint_text,
+                      lambda surf, text=hint_text: surf.blit(fonts.render(text, TEXT), (12, 10))))
 
-        else:
-            hint = fonts.FONT.render(
-                f"LMB drag block | LMB drag from output→input | RMB delete wire/gate \n UP/DOWN toggle input",
-                True,
-                TEXT,
-            )
-            screen.blit(hint, (12, 10))
-
-        play_button.draw(screen)
+        items.append(("play", play_button.rect, play_button.is_hovered, play_button.draw))
         if truth_lines:
             x, y = LIBRARY_WIDTH + 20, H - 150   # position bottom right
             for i, line in enumerate(truth_lines):
-                surf = fonts.FONT.render(line, True, (255, 255, 255))
-                screen.blit(surf, (x, y + i * 20))
-        pygame.display.flip()
+                rect = pygame.Rect((x, y + i * 20), fonts.FONT.size(line))
+                items.append((("truth", i), rect, line,
+                              lambda surf, line=line, pos=rect.topleft: surf.blit(fonts.render(line, (255, 255, 255)), pos)))
+
+        dirty = renderer.frame(items)
+        idle = not dirty and not (drag_start_gate_g or drag_start_port_g or ghost_gate)
         clock.tick(60)
 
+    worker.close()
     pygame.quit()
 
 
@@ -1,4 +1,18 @@
 from .gates.port import *
 from .gates.gates import *
-from . import pygame_representation
+from .simulation import *
 
+# the GUI (pygame, tkinter) and the benchmarks are only imported on first access,
+# so the simulation core loads with NumPy alone
+_LAZY = ("pygame_representation", "benchmarks")
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,81 @@
+import argparse
+import sys
+
+import numpy as np
+
+from logic_circuits.simulation.storage import load_netlist
+from logic_circuits.simulation.bitparallel import truth_table
+from logic_circuits.simulation.stream import simulate_file, write_truth_table, FORMATS
+
+
+def _info(args) -> int:
+    nl = load_netlist(args.circuit)
+    print(nl)
+    print(f"registers: {nl.num_state}")
+    print("inputs: ", " ".join(nl.names[n] for n in nl.inputs.tolist()))
+    print("outputs:", " ".join(nl.names[n] for n in nl.outputs.tolist()))
+    return 0
+
+
+def _truth_table(args) -> int:
+    nl = load_netlist(args.circuit)
+    if nl.num_in > args.max_inputs:
+        print(f"{args.circuit}: {nl.num_in} inputs, refusing more than --max-inputs {args.max_inputs}.",
+              file=sys.stderr)
+        return 2
+    table = truth_table(nl, backend=args.backend)
+    if args.out:
+        write_truth_table(table, args.out, args.format)
+        return 0
+
+    out = sys.stdout
+    out.write(",".join(list(table.in_names) + list(table.out_names)) + "\n")
+    for _, ins, outs in table.chunks():
+        rows = np.hstack([ins, outs]).astype(np.uint8) + ord("0")
+        out.write("\n".join(",".join(map(chr, row)) for row in rows.tolist()) + "\n")
+    return 0
+
+
+def _simulate(args) -> int:
+    nl = load_netlist(args.circuit)
+    n = simulate_file(nl, args.stimuli, args.out, in_fmt=args.in_format, out_fmt=args.out_format,
+                      chunk_vectors=args.chunk, backend=args.backend)
+    print(f"{n} vectors -> {args.out}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m logic_circuits",
+        description="Run saved circuits headless (no pygame or tkinter needed).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("info", help="summary of a saved circuit")
+    p.add_argument("circuit", help="file written by save_netlist/save_circuit")
+    p.set_defaults(run=_info)
+
+    p = sub.add_parser("truth-table", help="exhaustive truth table (CSV on stdout or a vector file)")
+    p.add_argument("circuit")
+    p.add_argument("-o", "--out", help="write to this file instead of stdout")
+    p.add_argument("--format", choices=FORMATS, help="output file format (default: from the extension)")
+    p.add_argument("--backend", choices=("netlist", "codegen"), default="netlist")
+    p.add_argument("--max-inputs", type=int, default=24)
+    p.set_defaults(run=_truth_table)
+
+    p = sub.add_parser("simulate", help="stream a stimulus vector file through the circuit")
+    p.add_argument("circuit")
+    p.add_argument("stimuli", help="input vectors (.csv/.txt or packed bits)")
+    p.add_argument("out", help="response file")
+    p.add_argument("--in-format", choices=FORMATS)
+    p.add_argument("--out-format", choices=FORMATS)
+    p.add_argument("--chunk", type=int, default=1 << 20, help="vectors per chunk")
+    p.add_argument("--backend", choices=("netlist", "codegen"), default="netlist")
+    p.set_defaults(run=_simulate)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
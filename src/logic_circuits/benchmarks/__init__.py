@@ -0,0 +1,7 @@
+"""
+benchmarks: generated reference circuits and a timing harness for the
+evaluation paths. Run `python -m logic_circuits.benchmarks --help`.
+"""
+
+from .circuits import *
+from .runner import *
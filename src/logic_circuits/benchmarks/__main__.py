@@ -0,0 +1,32 @@
+import argparse
+import sys
+
+from logic_circuits.benchmarks.runner import SUITES, run_suite, save_results, load_results, compare
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m logic_circuits.benchmarks",
+        description="Benchmark the simulation paths on generated circuits.",
+    )
+    parser.add_argument("--suite", choices=list(SUITES), default="quick")
+    parser.add_argument("--vectors", type=int, default=1 << 16, help="stimuli per batch benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.suite, args.vectors, args.repeat)
+    if args.out:
+        save_results(results, args.out)
+    if args.baseline:
+        regressions = compare(load_results(args.baseline), results, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
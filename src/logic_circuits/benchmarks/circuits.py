@@ -0,0 +1,131 @@
+from typing import List, Optional, Tuple
+import numpy as np
+
+from logic_circuits.gates.gates import GateAND, GateNOT, SysIN, SysOUT
+
+__all__ = [
+    "ripple_carry_adder",
+    "array_multiplier",
+    "parity_tree",
+    "not_chain",
+    "random_dag",
+]
+
+# a signal is an output port: (gate, port)
+Signal = Tuple[object, int]
+
+
+class _Builder:
+    """Wires AND/NOT primitives into a circuit between one SysIN and one SysOUT."""
+
+    def __init__(self, num_in: int, name: str):
+        self.name = name
+        self.sysin = SysIN(f"{name}.in", num_in=num_in, num_out=num_in)
+        self.count = 0
+
+    def input(self, k: int) -> Signal:
+        return (self.sysin, k)
+
+    def AND(self, a: Signal, b: Signal) -> Signal:
+        g = GateAND(f"{self.name}.g{self.count}")
+        self.count += 1
+        g.wire_up(a[0], g, a[1], 0)
+        g.wire_up(b[0], g, b[1], 1)
+        return (g, 0)
+
+    def NOT(self, a: Signal) -> Signal:
+        g = GateNOT(f"{self.name}.g{self.count}")
+        self.count += 1
+        g.wire_up(a[0], g, a[1], 0)
+        return (g, 0)
+
+    def OR(self, a: Signal, b: Signal) -> Signal:
+        return self.NOT(self.AND(self.NOT(a), self.NOT(b)))
+
+    def XOR(self, a: Signal, b: Signal) -> Signal:
+        # four NANDs
+        nab = self.NOT(self.AND(a, b))
+        return self.NOT(self.AND(self.NOT(self.AND(a, nab)), self.NOT(self.AND(b, nab))))
+
+    def full_adder(self, a: Signal, b: Signal, c: Signal) -> Tuple[Signal, Signal]:
+        axb = self.XOR(a, b)
+        return self.XOR(axb, c), self.OR(self.AND(a, b), self.AND(axb, c))
+
+    def finish(self, outs: List[Signal]) -> Tuple[SysOUT, SysIN]:
+        sysout = SysOUT(f"{self.name}.out", num_in=len(outs), num_out=len(outs))
+        for k, (g, p) in enumerate(outs):
+            sysout.wire_up(g, sysout, p, k)
+        return sysout, self.sysin
+
+
+def ripple_carry_adder(n: int) -> Tuple[SysOUT, SysIN]:
+    """n-bit adder: inputs a0..a(n-1), b0..b(n-1), cin (LSB first);
+    outputs s0..s(n-1), cout."""
+    b = _Builder(2 * n + 1, f"add{n}")
+    carry = b.input(2 * n)
+    outs = []
+    for i in range(n):
+        s, carry = b.full_adder(b.input(i), b.input(n + i), carry)
+        outs.append(s)
+    return b.finish(outs + [carry])
+
+
+def array_multiplier(n: int) -> Tuple[SysOUT, SysIN]:
+    """n x n unsigned array multiplier: inputs a0..a(n-1), b0..b(n-1)
+    (LSB first); outputs p0..p(2n-1)."""
+    b = _Builder(2 * n, f"mul{n}")
+    zero = b.AND(b.input(0), b.NOT(b.input(0)))
+    a = [b.input(i) for i in range(n)]
+    y = [b.input(n + i) for i in range(n)]
+
+    row = [b.AND(a[i], y[0]) for i in range(n)] + [zero]
+    outs = [row[0]]
+    for j in range(1, n):
+        carry = zero
+        nxt = []
+        for i in range(n):
+            s, carry = b.full_adder(row[i + 1], b.AND(a[i], y[j]), carry)
+            nxt.append(s)
+        row = nxt + [carry]
+        outs.append(row[0])
+    return b.finish(outs + row[1:])
+
+
+def parity_tree(n: int) -> Tuple[SysOUT, SysIN]:
+    """XOR of n inputs as a balanced tree of depth ceil(log2 n) XORs."""
+    b = _Builder(n, f"parity{n}")
+    level = [b.input(i) for i in range(n)]
+    while len(level) > 1:
+        nxt = [b.XOR(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return b.finish(level)
+
+
+def not_chain(depth: int) -> Tuple[SysOUT, SysIN]:
+    """One input through `depth` NOT gates."""
+    b = _Builder(1, f"chain{depth}")
+    s = b.input(0)
+    for _ in range(depth):
+        s = b.NOT(s)
+    return b.finish([s])
+
+
+def random_dag(num_in: int, num_gates: int, num_out: int = 8, seed: Optional[int] = None,
+               p_not: float = 0.3) -> Tuple[SysOUT, SysIN]:
+    """Random acyclic AND/NOT network. Every gate draws its inputs from the
+    primary inputs and earlier gates, biased towards recent ones so the
+    depth grows with the size; the last `num_out` gates are the outputs."""
+    rng = np.random.default_rng(seed)
+    b = _Builder(num_in, f"dag{num_in}x{num_gates}")
+    signals = [b.input(i) for i in range(num_in)]
+    window = max(num_in, 64)
+    for is_not in (rng.random(num_gates) < p_not).tolist():
+        lo = max(0, len(signals) - window)
+        if is_not:
+            signals.append(b.NOT(signals[rng.integers(lo, len(signals))]))
+        else:
+            i, j = rng.integers(lo, len(signals), size=2)
+            signals.append(b.AND(signals[i], signals[j]))
+    return b.finish(signals[-min(num_out, num_gates or 1):])
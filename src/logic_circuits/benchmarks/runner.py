@@ -0,0 +1,200 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from logic_circuits.simulation.netlist import compile_circuit
+from logic_circuits.simulation.optimize import gate_count
+from logic_circuits.simulation.batch import simulate
+from logic_circuits.simulation.bitparallel import truth_table
+from logic_circuits.benchmarks.circuits import (
+    ripple_carry_adder, array_multiplier, parity_tree, not_chain, random_dag,
+)
+
+__all__ = [
+    "SUITES",
+    "run_suite",
+    "save_results",
+    "load_results",
+    "compare",
+]
+
+# (circuit name, generator, params) per suite
+SUITES: Dict[str, List[Tuple[str, Callable, dict]]] = {
+    "quick": [
+        ("adder", ripple_carry_adder, {"n": 16}),
+        ("multiplier", array_multiplier, {"n": 8}),
+        ("parity", parity_tree, {"n": 64}),
+        ("not_chain", not_chain, {"depth": 2000}),
+        ("random_dag", random_dag, {"num_in": 32, "num_gates": 5000, "seed": 0}),
+    ],
+    "full": [
+        ("adder", ripple_carry_adder, {"n": 64}),
+        ("multiplier", array_multiplier, {"n": 16}),
+        ("parity", parity_tree, {"n": 1024}),
+        ("not_chain", not_chain, {"depth": 20000}),
+        ("random_dag", random_dag, {"num_in": 64, "num_gates": 100000, "seed": 0}),
+    ],
+}
+
+# truth-table sweep: parity trees of these input counts
+TT_INPUTS = {"quick": range(8, 19, 2), "full": range(8, 25, 2)}
+
+# metrics where a larger value is better; all others are costs
+_HIGHER_IS_BETTER = ("gates_per_s", "vectors_per_s")
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_bytes(fn: Callable[[], object]) -> int:
+    """Peak traced allocation while running fn (NumPy buffers included)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _record(circuit: str, params: dict, path: str, **metrics) -> dict:
+    return {"circuit": circuit, "params": params, "path": path, "metrics": metrics}
+
+
+def _bench_circuit(name: str, make: Callable, params: dict, vectors: int, repeat: int) -> List[dict]:
+    records = []
+    t0 = time.perf_counter()
+    sysout, sysin = make(**params)
+    build = time.perf_counter() - t0
+
+    compile_s = _best_time(lambda: compile_circuit(sysout, sysin), repeat)
+    nl = compile_circuit(sysout, sysin)
+    gates = gate_count(nl)
+    records.append(_record(
+        name, params, "compile", gates=gates, build_s=build, seconds=compile_s,
+        gates_per_s=gates / compile_s, peak_bytes=_peak_bytes(lambda: compile_circuit(sysout, sysin)),
+    ))
+
+    stim = np.random.default_rng(0).integers(0, 2, (vectors, nl.num_in)).astype(bool)
+    for backend in ("netlist", "codegen"):
+        run = lambda: simulate(nl, stim, backend=backend)
+        run()   # warm-up (code generation is cached)
+        s = _best_time(run, repeat)
+        records.append(_record(
+            name, params, f"batch_{backend}", gates=gates, vectors=vectors, seconds=s,
+            vectors_per_s=vectors / s, gates_per_s=gates * vectors / s, peak_bytes=_peak_bytes(run),
+        ))
+
+    # live GUI path: toggle one input and read the outputs (event-driven sync)
+    toggles = 200
+    sysout.state
+    def live():
+        for k in range(toggles):
+            sysin.set_state(k % sysin.num_out, bool(k & 1))
+            sysout.state
+    s = _best_time(live, repeat)
+    records.append(_record(
+        name, params, "live_toggle", gates=gates, vectors=toggles, seconds=s,
+        vectors_per_s=toggles / s, peak_bytes=_peak_bytes(live),
+    ))
+    return records
+
+
+def _bench_truth_tables(inputs, repeat: int) -> List[dict]:
+    records = []
+    for n in inputs:
+        sysout, sysin = parity_tree(n)
+        nl = compile_circuit(sysout, sysin)
+        run = lambda: truth_table(nl)
+        s = _best_time(run, repeat)
+        records.append(_record(
+            "parity", {"n": n}, "truth_table", gates=gate_count(nl), seconds=s,
+            vectors_per_s=(1 << n) / s, peak_bytes=_peak_bytes(run),
+        ))
+    return records
+
+
+def run_suite(suite: str = "quick", vectors: int = 1 << 16, repeat: int = 3,
+              log: Optional[Callable[[str], None]] = print) -> dict:
+    """Run every benchmark of `suite` and return the JSON-ready results."""
+    if suite not in SUITES:
+        raise ValueError(f"Unknown suite {suite!r}, expected one of {list(SUITES)}.")
+    results = []
+    for name, make, params in SUITES[suite]:
+        records = _bench_circuit(name, make, params, vectors, repeat)
+        results += records
+        if log:
+            for r in records:
+                log(_format(r))
+    records = _bench_truth_tables(TT_INPUTS[suite], repeat)
+    results += records
+    if log:
+        for r in records:
+            log(_format(r))
+
+    return {
+        "meta": {
+            "suite": suite,
+            "vectors": vectors,
+            "repeat": repeat,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def _format(r: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in r["params"].items())
+    metrics = "  ".join(
+        f"{k}={v:.3g}" if isinstance(v, float) else f"{k}={v}" for k, v in r["metrics"].items()
+    )
+    return f"{r['circuit']}({params}) {r['path']}: {metrics}"
+
+
+def save_results(results: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _key(r: dict) -> str:
+    return f"{r['circuit']}{json.dumps(r['params'], sort_keys=True)}:{r['path']}"
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.2) -> List[str]:
+    """Regressions of `current` against `baseline`: every seconds, *_per_s
+    and peak_bytes metric that got worse by more than `tolerance` (relative)."""
+    base = {_key(r): r["metrics"] for r in baseline["results"]}
+    found = []
+    for r in current["results"]:
+        old = base.get(_key(r))
+        if old is None:
+            continue
+        for metric, new in r["metrics"].items():
+            if metric not in old or metric in ("gates", "vectors", "build_s") or not old[metric]:
+                continue
+            ratio = new / old[metric]
+            worse = ratio < 1 - tolerance if metric in _HIGHER_IS_BETTER else ratio > 1 + tolerance
+            if worse:
+                found.append(f"{_key(r)} {metric}: {old[metric]:.4g} -> {new:.4g} ({ratio:.2f}x)")
+    return found
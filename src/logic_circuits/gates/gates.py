@@ -3,25 +3,31 @@ from logic_circuits.utils import (
     Idxs, 
     HasState
 )
-from logic_circuits.gates.port import Port
+from logic_circuits.gates.port import Port, word_bits
 
 from typing import (
     List, 
+    Optional,
     Union, 
     Type
 )
 import numpy as np
+import weakref
+import logic_circuits.simulation.memo as memo
 
 
 def _read(src: GateBase, idxs: Idxs) -> np.ndarray:
-    s = np.concatenate([p.state for p in src._outs])
-    return np.array(s[idxs], dtype=bool, ndmin=1)
+    """Values of the output port(s) `idxs` of `src`, (width,) per port."""
+    return np.array(src._values.reshape(src.num_out, src.width)[idxs], dtype=bool, ndmin=1)
 
 
 class GateNOT(GateBase):
-    def __init__(self, name = "NOT", num_in=1, num_out=1):
+    """Bitwise NOT of a wire or bus."""
+    __slots__ = ()
+
+    def __init__(self, name = "NOT", num_in=1, num_out=1, width=1):
         assert (num_in==1 and num_out==1), "Not gate must have one/one I/O"
-        super().__init__(num_in, num_out, name=name)
+        super().__init__(num_in, num_out, name=name, width=width)
 
     def _compute(self) -> np.ndarray:
         inputs = self._collect_inputs()
@@ -30,31 +36,33 @@ class GateNOT(GateBase):
 
 class GateAND(GateBase):
     """Elementwise AND. Both inputs must have the same width."""
-    def __init__(self, name = "AND", num_in=2, num_out=1):
+    __slots__ = ()
+
+    def __init__(self, name = "AND", num_in=2, num_out=1, width=1):
         assert (num_in==2 and num_out==1), "Not gate must have one/one I/O"
-        super().__init__(num_in, num_out, name=name)
+        super().__init__(num_in, num_out, name=name, width=width)
     def _compute(self) -> np.ndarray:
         inputs = self._collect_inputs()
         return np.logical_and(*inputs)
 
 
 class GatePASS(GateBase):
-    def __init__(self, name = "PASS", num_in=1, num_out = 1):
-        super().__init__(num_in, num_out, name=name)
-
-    def _compute(self) -> np.ndarray:
-        for g in self.from_gate: 
-            g._recompute()
+    __slots__ = ()
 
-        for _from_gate, _from_port, _to_port in zip(self.from_gate, self.from_port, self.to_port):
-            self.brigde[_to_port] = _read(_from_gate, _from_port)
+    def __init__(self, name = "PASS", num_in=1, num_out = 1, width=1):
+        super().__init__(num_in, num_out, name=name, width=width)
 
-        return self.brigde
+    def _compute(self) -> np.ndarray:
+        return self._collect_inputs()
 
 
 class SysIN(GatePASS):
-    def __init__(self, name="SysIN", num_in=1, num_out=1):
-        super().__init__(name, num_in, num_out)
+    """Primary inputs. On a bus, a port is set from a bool array of `width`
+    bits or an int word (bit b = line b)."""
+    __slots__ = ()
+
+    def __init__(self, name="SysIN", num_in=1, num_out=1, width=1):
+        super().__init__(name, num_in, num_out, width=width)
         self.base_layer = True
 
     def set_state(self, port_nums = Union[int, List[int]], assign = Union[bool, List[bool]]) -> None:
@@ -66,13 +74,65 @@ class SysIN(GatePASS):
         if len(port_nums) != len(assign):
             raise ValueError("idxs and vals length mismatch.")
 
-        curr_state[port_nums] = assign
+        if self.width > 1:
+            assign = [
+                word_bits(v, self.width) if isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) else v
+                for v in assign
+            ]
+        curr_state[port_nums] = np.asarray(assign, dtype=bool).reshape(len(port_nums), self.width)
         self._set_state_vec(curr_state)
 
+        # push the change through the fan-out cone of the compiled circuit
+        if self._netlist is not None and not self._netlist.stale:
+            self._netlist.sync()
+
     def _compute(self) -> np.ndarray:
         return _read(self, [idx for idx in range(self.num_out)])
 
 
+class SysOUT(GatePASS):
+    """Primary outputs: passes its input ports (wires or buses) through unchanged."""
+    __slots__ = ()
+
+    def __init__(self, name="SysOUT", num_in=1, num_out=1, width=1):
+        assert num_in == num_out, "SysOUT must have as many outputs as inputs"
+        super().__init__(name, num_in, num_out, width=width)
+
+
+class GateDFF(GateBase):
+    """D flip-flop. Q takes D on every clock; with a second input (EN) only while EN is set."""
+    __slots__ = ("init",)
+
+    def __init__(self, name = "DFF", num_in=1, num_out=1, init: bool = False):
+        assert (num_in in (1, 2) and num_out==1), "DFF gate must have D (and optional EN) / Q"
+        super().__init__(num_in, num_out, name=name)
+        self.init = init
+        self._values[0] = init
+
+    def _compute(self) -> np.ndarray:
+        # Q only changes on a clock edge, see clock()
+        return self._values.copy()
+
+    def clock(self) -> None:
+        """Clock every register of the compiled circuit this flip-flop belongs to."""
+        self.compile().clock()
+
+
+class GateLATCH(GateBase):
+    """Level-sensitive D latch with inputs (D, EN): transparent while EN is set, holds otherwise."""
+    __slots__ = ("init",)
+
+    def __init__(self, name = "LATCH", num_in=2, num_out=1, init: bool = False):
+        assert (num_in==2 and num_out==1), "Latch gate must have D, EN / Q"
+        super().__init__(num_in, num_out, name=name)
+        self.init = init
+        self._values[0] = init
+
+    def _compute(self) -> np.ndarray:
+        d, en = self._collect_inputs()
+        return np.array([d], dtype=bool) if en else self._values.copy()
+
+
 
 def make_combined_gate_class(
     name: str,
@@ -80,16 +140,26 @@ def make_combined_gate_class(
     end_gates: List[GateBase],
     num_in: int,
     num_out: int,
-    *args, **kwargs
+    *args, width: int = 1, memoize: bool = False, **kwargs
 ) -> Type[GateBase]:
     """
     Factory that creates a new composite gate class.
+    With `width` > 1 its ports are buses; input k then feeds bits
+    k*width..(k+1)*width-1 of the inner SysIN.
+    With `memoize`, the class is created with memoize() already called.
     """
 
     class _CombinedGate(GateBase):
+        # memoize() arguments, and the CompositeMemo built from them on first use
+        _memo_args = None
+        _memo = None
+        # every instance, so memoize() can drop their compiled netlists
+        _instances: "weakref.WeakSet" = weakref.WeakSet()
+
         def __init__(self, instance_name=None):
             # call GateBase init
-            super().__init__(num_in, num_out, name=name)
+            super().__init__(num_in, num_out, name=name, width=width)
+            type(self)._instances.add(self)
             self.wire_idx = 0
             self.name = instance_name or name
 
@@ -97,16 +167,61 @@ def make_combined_gate_class(
                 self.wire_up(from_gate, to_gate, from_port, to_port)
 
             self.end_gates = end_gates
+            # share one compiled netlist (and signal buffer) with the end gates
+            for eg in end_gates:
+                eg._fanout.append(self)
+                eg._invalidate()
 
         def wire_up(self, from_gate: GateBase, to_gate: GateBase, from_port: int, to_port: int):
+            if to_gate is self:
+                # wiring into this composite's own inputs (it is nested in a larger design)
+                super().wire_up(from_gate, to_gate, from_port, to_port)
+                return
             to_gate.wire_up(from_gate, to_gate, from_port, to_port)
             self.wire_idx += 1
 
+        @classmethod
+        def memoize(cls, maxsize: int = 1024, table: Optional[bool] = None) -> None:
+            """Evaluate every instance through an output cache keyed by the
+            packed input bits (see CompositeMemo): an LRU of `maxsize`
+            entries, or with `table` (default for <= 16 inputs) a lookup
+            table precomputed on the first evaluation. Compiled netlists
+            evaluate the instances as lookup nodes instead of their gates."""
+            cls._memo_args = (maxsize, table)
+            cls._memo = None
+            cls._recompile()
+
+        @classmethod
+        def unmemoize(cls) -> None:
+            cls._memo_args = None
+            cls._memo = None
+            cls._recompile()
+
+        @classmethod
+        def _recompile(cls) -> None:
+            for inst in list(cls._instances):
+                inst._invalidate()
+
+        @classmethod
+        def _get_memo(cls) -> Optional["memo.CompositeMemo"]:
+            """The class's CompositeMemo, built on first use; None unless memoized."""
+            if cls._memo_args is None:
+                return None
+            if cls._memo is None:
+                cls._memo = memo.CompositeMemo(end_gates, *cls._memo_args)
+            return cls._memo
+
+        @classmethod
+        def cache_info(cls) -> Optional[dict]:
+            return cls._memo.info() if cls._memo is not None else None
+
         def _compute(self) -> np.ndarray:
-            end_state = []
-            for eg in self.end_gates:
-                end_state += list(eg.state)
-            return np.array(end_state)
+            if self._memo_args is None:
+                return np.concatenate([eg.state for eg in self.end_gates])
+            # the compiled netlist evaluates this instance with the memo
+            return self.state
 
     _CombinedGate.__name__ = name
+    if memoize:
+        _CombinedGate.memoize()
     return _CombinedGate
@@ -2,29 +2,55 @@ from typing import Union
 import numpy as np
 
 class Port:
-    """Single boolean wire stored as (1,) ndarray."""
+    """Wire of `width` bits (1 for a single boolean, more for a bus), stored
+    as consecutive slots of a (possibly shared) bool buffer."""
+    __slots__ = ("parent", "_buf", "_idx", "width")
 
-    def __init__(self, parent=None, init_val: bool=False):
+    def __init__(self, parent=None, init_val: bool=False, buf: np.ndarray=None, idx: int=0, width: int=1):
+        if width < 1:
+            raise ValueError("Port width must be >= 1")
         self.parent = parent
-        self._state = np.array([init_val], dtype=bool)
+        self.width = width
+        if buf is None:
+            buf, idx = np.zeros(width, dtype=bool), 0
+        self._buf = buf
+        self._idx = idx
+        self._buf[idx:idx + width] = init_val
+
+    def bind(self, buf: np.ndarray, idx: int) -> None:
+        """Move this port onto slots idx..idx+width-1 of `buf`, keeping its value."""
+        buf[idx:idx + self.width] = self._buf[self._idx:self._idx + self.width]
+        self._buf = buf
+        self._idx = idx
 
     @property
-    def state(self) -> np.ndarray:      # shape: (1,)
-        return self._state
+    def state(self) -> np.ndarray:      # shape: (width,), view on the buffer
+        return self._buf[self._idx:self._idx + self.width]
 
     @state.setter
     def state(self, v: Union[bool, np.ndarray]) -> None:
         if isinstance(v, np.ndarray):
-            if v.size != 1:
-                raise ValueError("Port expects a single boolean.")
-            v = bool(v.reshape(-1)[0])
-        self._state[:] = v
+            if v.size != self.width:
+                raise ValueError(f"Port expects {self.width} boolean(s), got {v.size}.")
+            v = v.reshape(-1)
+        self._buf[self._idx:self._idx + self.width] = v
 
-    # for a scalar bool
+    # a bool for a single wire, an int word (bit b = line b) for a bus
     @property
-    def value(self) -> bool:
-        return bool(self._state[0])
+    def value(self) -> Union[bool, int]:
+        if self.width == 1:
+            return bool(self._buf[self._idx])
+        bits = np.packbits(self.state, bitorder="little")
+        return int.from_bytes(bits.tobytes(), "little")
 
     @value.setter
-    def value(self, v: Union[bool, np.ndarray]) -> None:
-        self.state = v
\ No newline at end of file
+    def value(self, v: Union[bool, int, np.ndarray]) -> None:
+        if self.width > 1 and isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)):
+            v = word_bits(v, self.width)
+        self.state = v
+
+
+def word_bits(word: int, width: int) -> np.ndarray:
+    """Bits of the integer `word` as a (width,) bool array, bit b at index b."""
+    raw = int(word & ((1 << width) - 1)).to_bytes(-(-width // 8), "little")
+    return np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")[:width].astype(bool)
@@ -7,6 +7,8 @@ from .wires import Wire
 from . import colors
 from . import utils
 from . import fonts
+from . import persistence
+from . import render
 
 __all__ = [
     "Block",
@@ -15,4 +17,6 @@ __all__ = [
     "colors",
     "utils",
     "fonts",
+    "persistence",
+    "render",
 ]
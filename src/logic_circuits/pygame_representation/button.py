@@ -1,4 +1,5 @@
 import pygame
+from . import fonts
 
 class Button:
     def __init__(self, rect, text, font, bg_color, fg_color, hover_color):
@@ -15,7 +16,7 @@ class Button:
         pygame.draw.rect(surface, color, self.rect, border_radius=8)
         pygame.draw.rect(surface, self.fg_color, self.rect, 2, border_radius=8)
 
-        label = self.font.render(self.text, True, self.fg_color)
+        label = fonts.render(self.text, self.fg_color, font=self.font)
         surface.blit(
             label,
             label.get_rect(center=self.rect.center)
@@ -1,8 +1,31 @@
 import pygame
+from collections import OrderedDict
 
 FONT = None
 
+# rendered text surfaces keyed by (font, text, color, antialias)
+_CACHE: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+CACHE_SIZE = 1024
+
 def init():
     """Initialize global fonts (call after pygame.init())."""
     global FONT
     FONT = pygame.font.SysFont("consolas", 18)
+
+def render(text, color, antialias=True, font=None) -> pygame.Surface:
+    """font.render() through an LRU cache of the last CACHE_SIZE labels
+    (default font: FONT). The surface is shared, do not draw on it."""
+    font = font or FONT
+    key = (font, text, tuple(color), antialias)
+    surf = _CACHE.get(key)
+    if surf is None:
+        surf = font.render(text, antialias, color)
+        _CACHE[key] = surf
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(key)
+    return surf
+
+def clear_cache():
+    _CACHE.clear()
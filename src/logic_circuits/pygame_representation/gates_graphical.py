@@ -1,5 +1,5 @@
 import pygame
-from .ports import Port_graphical
+from .ports import Port_graphical, place_ports
 from .colors import BLOCK_FILL, BLOCK_OUTL, TEXT
 from . import fonts
 from pygame.math import Vector2
@@ -30,8 +30,8 @@ class GateAND_graphical(GateAND):
         ys_in   = [self.rect.h * (idx+1)/(self.num_in+1) for idx in range(self.num_in)]
         ys_out   = [self.rect.h * (idx+1)/(self.num_out+1) for idx in range(self.num_out)]
         
-        self.inputs  = [Port_graphical(self, 'in',  (left_x,  y), idx) for idx, y in enumerate(ys_in)]
-        self.outputs = [Port_graphical(self, 'out', (right_x, y), idx) for idx, y in enumerate(ys_out)]
+        self.inputs  = place_ports(self, self.inputs,  'in',  left_x,  ys_in)
+        self.outputs = place_ports(self, self.outputs, 'out', right_x, ys_out)
 
     
     def hover(self, mouse):
@@ -45,7 +45,7 @@ class GateAND_graphical(GateAND):
         pygame.draw.rect(surf, BLOCK_FILL, self.rect, border_radius=self.CORNER)
         pygame.draw.rect(surf, BLOCK_OUTL, self.rect, 2, border_radius=self.CORNER)
         if fonts.FONT:
-            label = fonts.FONT.render(self.name, True, TEXT)
+            label = fonts.render(self.name, TEXT)
             label_rect = label.get_rect(center=(self.rect.centerx, self.rect.centery-35))
             surf.blit(label, label_rect) 
             
@@ -78,8 +78,8 @@ class GateNOT_graphical(GateNOT):
         ys_in   = [self.rect.h * (idx+1)/(self.num_in+1) for idx in range(self.num_in)]
         ys_out   = [self.rect.h * (idx+1)/(self.num_out+1) for idx in range(self.num_out)]
         
-        self.inputs  = [Port_graphical(self, 'in',  (left_x,  y), idx) for idx, y in enumerate(ys_in)]
-        self.outputs = [Port_graphical(self, 'out', (right_x, y), idx) for idx, y in enumerate(ys_out)]
+        self.inputs  = place_ports(self, self.inputs,  'in',  left_x,  ys_in)
+        self.outputs = place_ports(self, self.outputs, 'out', right_x, ys_out)
 
     
     def hover(self, mouse):
@@ -92,7 +92,7 @@ class GateNOT_graphical(GateNOT):
         pygame.draw.rect(surf, BLOCK_FILL, self.rect, border_radius=self.CORNER)
         pygame.draw.rect(surf, BLOCK_OUTL, self.rect, 2, border_radius=self.CORNER)
         if fonts.FONT:
-            label = fonts.FONT.render(self.name, True, TEXT)
+            label = fonts.render(self.name, TEXT)
             label_rect = label.get_rect(center=(self.rect.centerx, self.rect.centery-30))
             surf.blit(label, label_rect) 
 
@@ -129,15 +129,17 @@ class GatePass_graphical(GatePASS):
         ys_in   = [self.rect.h * (idx+1)/(self.num_in+1) for idx in range(self.num_in)]
         ys_out   = [self.rect.h * (idx+1)/(self.num_out+1) for idx in range(self.num_out)]
         
-        self.inputs  = [Port_graphical(self, 'in',  (left_x,  y), idx) for idx, y in enumerate(ys_in)]
-        self.outputs = [Port_graphical(self, 'out', (right_x, y), idx) for idx, y in enumerate(ys_out)]
+        self.inputs  = place_ports(self, self.inputs,  'in',  left_x,  ys_in)
+        self.outputs = place_ports(self, self.outputs, 'out', right_x, ys_out)
 
     def increase_ports(self):
-        self.__init__(self.name, self._x, self._y, self._w, self._h, self.num_in+1, self.num_in+1)
+        self._resize(self.num_in+1, self.num_in+1)
+        self._make_ports()
     
     def decrease_ports(self):
         if self.num_in>1:
-            self.__init__(self.name, self._x, self._y, self._w, self._h, self.num_in-1, self.num_in-1)
+            self._resize(self.num_in-1, self.num_in-1)
+            self._make_ports()
     
     def hover(self, mouse):
         return self.rect.collidepoint(mouse)
@@ -162,16 +164,16 @@ class GatePass_graphical(GatePASS):
         pygame.draw.rect(surf, (255, 0, 0), self.minus)
 
         if fonts.FONT:
-            plus_label = fonts.FONT.render("+", True, (0, 0, 0))
+            plus_label = fonts.render("+", (0, 0, 0))
             plus_rect = plus_label.get_rect(center=self.plus.center)
             surf.blit(plus_label, plus_rect)
 
-            minus_label = fonts.FONT.render("-", True, (0, 0, 0))
+            minus_label = fonts.render("-", (0, 0, 0))
             minus_rect = minus_label.get_rect(center=self.minus.center)
             surf.blit(minus_label, minus_rect)
 
         if fonts.FONT:
-            label = fonts.FONT.render(self.name, True, TEXT)
+            label = fonts.render(self.name, TEXT)
             label_rect = label.get_rect(center=(self.rect.centerx, self.rect.centery))
             surf.blit(label, label_rect)
 
@@ -208,15 +210,17 @@ class SysIN_graphical(SysIN):
         ys_in   = [self.rect.h * (idx+1)/(self.num_in+1) for idx in range(self.num_in)]
         ys_out   = [self.rect.h * (idx+1)/(self.num_out+1) for idx in range(self.num_out)]
         
-        self.inputs  = [Port_graphical(self, 'in',  (left_x,  y), idx) for idx, y in enumerate(ys_in)]
-        self.outputs = [Port_graphical(self, 'out', (right_x, y), idx) for idx, y in enumerate(ys_out)]
+        self.inputs  = place_ports(self, self.inputs,  'in',  left_x,  ys_in)
+        self.outputs = place_ports(self, self.outputs, 'out', right_x, ys_out)
 
     def increase_ports(self):
-        self.__init__(self.name, self._x, self._y, self._w, self._h, self.num_in+1, self.num_in+1)
+        self._resize(self.num_in+1, self.num_in+1)
+        self._make_ports()
     
     def decrease_ports(self):
         if self.num_in>1:
-            self.__init__(self.name, self._x, self._y, self._w, self._h, self.num_in-1, self.num_in-1)
+            self._resize(self.num_in-1, self.num_in-1)
+            self._make_ports()
     
     def hover(self, mouse):
         return self.rect.collidepoint(mouse)
@@ -239,16 +243,16 @@ class SysIN_graphical(SysIN):
         pygame.draw.rect(surf, (255, 0, 0), self.minus)
 
         if fonts.FONT:
-            plus_label = fonts.FONT.render("+", True, (0, 0, 0))
+            plus_label = fonts.render("+", (0, 0, 0))
             plus_rect = plus_label.get_rect(center=self.plus.center)
             surf.blit(plus_label, plus_rect)
 
-            minus_label = fonts.FONT.render("-", True, (0, 0, 0))
+            minus_label = fonts.render("-", (0, 0, 0))
             minus_rect = minus_label.get_rect(center=self.minus.center)
             surf.blit(minus_label, minus_rect)
 
         if fonts.FONT:
-            label = fonts.FONT.render(self.name, True, TEXT)
+            label = fonts.render(self.name, TEXT)
             label_rect = label.get_rect(center=(self.rect.centerx, self.rect.centery))
             surf.blit(label, label_rect)
 
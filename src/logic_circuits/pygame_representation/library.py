@@ -12,7 +12,7 @@ class LibraryItem:
     def draw(self, surface):
         pygame.draw.rect(surface, (60, 60, 60), self.rect)
         pygame.draw.rect(surface, (200, 200, 200), self.rect, 2)
-        label = fonts.FONT.render(self.text, True, (255, 255, 255))
+        label = fonts.render(self.text, (255, 255, 255))
         surface.blit(label, (self.rect.x+10, self.rect.y+10))
 
     def hover(self, pos):
@@ -0,0 +1,39 @@
+from typing import List, Tuple
+from .gates_graphical import GateAND_graphical, GateNOT_graphical, GatePass_graphical, SysIN_graphical
+from .wires import Wire
+from logic_circuits.simulation.storage import CircuitFile, save_circuit
+
+_GRAPHICAL = {
+    "SYSIN": SysIN_graphical,
+    "SYSOUT": GatePass_graphical,
+    "PASS": GatePass_graphical,
+    "AND": GateAND_graphical,
+    "NOT": GateNOT_graphical,
+}
+
+
+def save_editor(path, blocks, connections, sysin, sysout) -> None:
+    """Save the editor state: every block with its position and the wires."""
+    save_circuit(path, [sysout], sysin, connections=connections, blocks=blocks)
+
+
+def _make_block(kind, name, num_in, num_out, width, init, layout):
+    if kind not in _GRAPHICAL:
+        raise ValueError(f"The editor has no block for {kind} gates.")
+    x, y, w, h, _x, _y = layout or (0, 0, 220, 140, 0, 0)
+    block = _GRAPHICAL[kind](name, x=_x, y=_y, w=w, h=h, num_in=num_in, num_out=num_out)
+    block.rect.topleft = (x, y)
+    block._make_ports()
+    if hasattr(block, "plus"):
+        block.plus.topleft = (x + w / 2, y)
+        block.minus.topleft = (x + w / 2, y + h - h / 10)
+    return block
+
+
+def load_editor(path) -> Tuple[List[object], List[Wire], list, object, object]:
+    """Load a file written by save_editor(); returns (blocks, wires,
+    connections, sysin, sysout) ready to drop into the editor loop."""
+    blocks, connections, inputs, outputs = CircuitFile(path).gates(_make_block, wire=False)
+    wires = [Wire(a.outputs[fp], b.inputs[tp]) for a, b, fp, tp in connections]
+    sysin = inputs[0] if inputs else next(b for b in blocks if isinstance(b, SysIN_graphical))
+    return blocks, wires, connections, sysin, outputs[0]
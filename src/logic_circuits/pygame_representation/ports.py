@@ -31,7 +31,18 @@ class Port_graphical(Port):
         pygame.draw.circle(surf, PORT_HOVER if hot else self.color, p, self.R)
 
         if fonts.FONT:
-            label = fonts.FONT.render(str(self.index), True, TEXT)
+            label = fonts.render(str(self.index), TEXT)
             if self.kind == "in": dir = +15
             else: dir = -(15+self.R)
-            surf.blit(label, (p[0] + dir, p[1] - 1.3*self.R))
\ No newline at end of file
+            surf.blit(label, (p[0] + dir, p[1] - 1.3*self.R))
+
+
+def place_ports(gate, ports, kind, x, ys):
+    """Ports of `gate` at offsets (x, y) for y in `ys`. Existing Port_graphical
+    objects are moved in place and reused, new ones only created for extra
+    slots, so wires and indexes keep pointing at the same ports."""
+    ports = ports[:len(ys)]
+    for p, y in zip(ports, ys):
+        p.offset.update(x, y)
+    ports += [Port_graphical(gate, kind, (x, y), idx) for idx, y in enumerate(ys) if idx >= len(ports)]
+    return ports
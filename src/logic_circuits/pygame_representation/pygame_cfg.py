@@ -2,4 +2,7 @@ W, H = 900, 600
 LIBRARY_WIDTH = 140
 
 LIBRARY_WIDTH = 140
-LIBRARY_HEIGHT = 150
\ No newline at end of file
+LIBRARY_HEIGHT = 150
+
+# the editor saves here on Ctrl+S and reopens it on Ctrl+O
+EDITOR_FILE = "circuit.lcnl"
@@ -0,0 +1,129 @@
+import pygame
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+from .colors import BG, GRID
+
+# an item of the scene: (key, screen rect, signature, draw(surface))
+Item = Tuple[Hashable, pygame.Rect, Hashable, Callable[[pygame.Surface], None]]
+
+_BACKGROUNDS: Dict[Tuple[int, int, int], pygame.Surface] = {}
+
+
+def background(W, H, gap=24) -> pygame.Surface:
+    """The static BG + grid, rendered once per size."""
+    key = (W, H, gap)
+    surf = _BACKGROUNDS.get(key)
+    if surf is None:
+        surf = pygame.Surface((W, H))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill(BG)
+        for x in range(0, W, gap):
+            pygame.draw.line(surf, GRID, (x, 0), (x, H))
+        for y in range(0, H, gap):
+            pygame.draw.line(surf, GRID, (0, y), (W, y))
+        _BACKGROUNDS[key] = surf
+    return surf
+
+
+def bounding_rect(points, pad=0) -> pygame.Rect:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    x0, y0 = int(min(xs)) - pad, int(min(ys)) - pad
+    return pygame.Rect(x0, y0, int(max(xs)) + pad - x0 + 1, int(max(ys)) + pad - y0 + 1)
+
+
+class Renderer:
+    """Retained-mode renderer: redraws only what changed since the last frame.
+
+    Every frame the caller describes the scene as items in z-order, each
+    with a key, its screen rect and a signature of everything that affects
+    how it looks. Items whose rect or signature changed, appeared or
+    disappeared mark their old and new rects dirty; only those regions are
+    restored from the cached background, redrawn (every item overlapping
+    them, clipped) and pushed with pygame.display.update(rects).
+    """
+
+    # fall back to a full redraw beyond this many dirty rects
+    MAX_RECTS = 48
+
+    def __init__(self, screen: pygame.Surface, bg: pygame.Surface = None):
+        self.screen = screen
+        self.bg = bg if bg is not None else background(*screen.get_size())
+        self._last: Dict[Hashable, Tuple[pygame.Rect, Hashable]] = {}
+        self._full = True
+
+    def invalidate(self) -> None:
+        """Redraw the whole screen on the next frame."""
+        self._full = True
+
+    def _dirty(self, items: List[Item]) -> List[pygame.Rect]:
+        dirty = []
+        seen = {}
+        for key, rect, sig, _ in items:
+            seen[key] = (rect, sig)
+            old = self._last.get(key)
+            if old is None:
+                dirty.append(rect)
+            elif old[1] != sig or old[0] != rect:
+                dirty.append(old[0])
+                dirty.append(rect)
+        for key, (rect, _) in self._last.items():
+            if key not in seen:
+                dirty.append(rect)
+        self._last = seen
+        return [r for r in dirty if r.w > 0 and r.h > 0]
+
+    def _merge(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Union overlapping rects so no region is redrawn twice."""
+        merged: List[pygame.Rect] = []
+        for r in rects:
+            r = r.clip(self.screen.get_rect())
+            if not r.w or not r.h:
+                continue
+            i = r.collidelist(merged)
+            while i >= 0:
+                r = r.union(merged.pop(i))
+                i = r.collidelist(merged)
+            merged.append(r)
+        return merged
+
+    def frame(self, items: Iterable[Item]) -> List[pygame.Rect]:
+        """Draw the changes of `items` and update the display. Returns the
+        updated rects (empty when nothing changed)."""
+        items = list(items)
+        dirty = self._merge(self._dirty(items))
+        if self._full or len(dirty) > self.MAX_RECTS:
+            self._full = False
+            dirty = [self.screen.get_rect()]
+        if not dirty:
+            return []
+
+        for r in dirty:
+            self.screen.set_clip(r)
+            self.screen.blit(self.bg, r, r)
+            for _, rect, _, draw in items:
+                if rect.colliderect(r):
+                    draw(self.screen)
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        return dirty
+
+
+def block_item(b, mouse) -> Item:
+    """Scene item of a gate block; its look depends on the hovered port."""
+    hovered = ()
+    if b.rect.collidepoint(mouse):
+        hovered = tuple(p.hover(mouse) for p in b.inputs + b.outputs)
+    sig = (tuple(b.rect), b.name, b.num_in, b.num_out, hovered)
+    return (b, b.rect.inflate(4, 4), sig, b.draw)
+
+
+def wire_item(w, hot=False, value=None) -> Item:
+    """Scene item of a wire; its look depends on the endpoints, hover and
+    value (read from the driving gate if not given)."""
+    pts = w._points()
+    if value is None:
+        value = w.parent_gate.state[w.a.index]
+    value = bool(value)
+    sig = (pts[0], pts[-1], hot, value)
+    return (w, bounding_rect(pts, 12), sig, lambda surf: w.draw(surf, hot=hot, value=value))
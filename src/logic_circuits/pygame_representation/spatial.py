@@ -0,0 +1,194 @@
+import pygame
+import numpy as np
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+from .render import bounding_rect
+from .utils import segment_distances
+
+Cell = Tuple[int, int]
+
+
+class SpatialGrid:
+    """Uniform grid over screen space: every object is stored in the cells
+    its rect overlaps, so a point query only looks at one cell."""
+
+    def __init__(self, cell: int = 64):
+        self.cell = cell
+        self._cells: Dict[Cell, Dict[Hashable, None]] = {}
+        self._where: Dict[Hashable, Tuple[pygame.Rect, List[Cell]]] = {}
+
+    def _span(self, rect: pygame.Rect) -> List[Cell]:
+        c = self.cell
+        return [
+            (cx, cy)
+            for cx in range(rect.left // c, (rect.right - 1) // c + 1)
+            for cy in range(rect.top // c, (rect.bottom - 1) // c + 1)
+        ]
+
+    def insert(self, obj: Hashable, rect: pygame.Rect) -> None:
+        """Add `obj` or move it to `rect`; only cells it leaves or enters are touched."""
+        rect = pygame.Rect(rect)
+        old = self._where.get(obj)
+        cells = self._span(rect)
+        if old is not None and old[1] == cells:
+            self._where[obj] = (rect, cells)
+            return
+        if old is not None:
+            self.remove(obj)
+        for cell in cells:
+            self._cells.setdefault(cell, {})[obj] = None
+        self._where[obj] = (rect, cells)
+
+    def remove(self, obj: Hashable) -> None:
+        old = self._where.pop(obj, None)
+        if old is None:
+            return
+        for cell in old[1]:
+            bucket = self._cells[cell]
+            del bucket[obj]
+            if not bucket:
+                del self._cells[cell]
+
+    def rect(self, obj: Hashable) -> Optional[pygame.Rect]:
+        old = self._where.get(obj)
+        return old[0] if old else None
+
+    def at(self, pos) -> Iterator[Hashable]:
+        """Objects whose rect contains `pos`."""
+        c = self.cell
+        for obj in self._cells.get((int(pos[0]) // c, int(pos[1]) // c), ()):
+            if self._where[obj][0].collidepoint(pos):
+                yield obj
+
+    def __contains__(self, obj) -> bool:
+        return obj in self._where
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+
+class EditorIndex:
+    """Spatial index of the editor's blocks, ports and wires for hit tests.
+
+    Keep it in step with the scene: add_block/remove_block, add_wire/
+    remove_wire, and update_block after a block moved or changed its ports
+    (its ports and attached wires are re-indexed with it). Queries return
+    the same object as the linear scans in utils (first block, top-most wire).
+    """
+
+    WIRE_TOL = 6
+    # wires are indexed as pieces of this many bezier segments
+    WIRE_PIECE = 6
+
+    def __init__(self, cell: int = 64):
+        self.blocks = SpatialGrid(cell)
+        self.ports = SpatialGrid(cell)
+        self.wires = SpatialGrid(cell)
+        # blocks with +/- buttons, by the area their buttons can be in
+        self.resizers = SpatialGrid(cell)
+        self._order: Dict[object, int] = {}
+        self._count = 0
+        self._block_ports: Dict[object, list] = {}
+        self._block_wires: Dict[object, Dict[object, None]] = {}
+        self._wire_pieces: Dict[object, list] = {}
+        self._piece_pts: Dict[Tuple[object, int], np.ndarray] = {}
+
+    def _stamp(self, obj) -> None:
+        self._order[obj] = self._count
+        self._count += 1
+
+    # ----------------------------------------------------------------- blocks
+
+    def add_block(self, b) -> None:
+        self._stamp(b)
+        self._block_wires.setdefault(b, {})
+        self.update_block(b)
+
+    def update_block(self, b) -> None:
+        self.blocks.insert(b, b.rect)
+        if hasattr(b, "plus"):
+            # draw() only re-centres the buttons on the block horizontally
+            self.resizers.insert(b, b.rect.unionall([b.plus, b.minus]))
+        for p in self._block_ports.get(b, ()):
+            self.ports.remove(p)
+        ports = b.inputs + b.outputs
+        r = ports[0].R + 2 if ports else 0
+        for p in ports:
+            pos = p.screen_pos()
+            self.ports.insert(p, pygame.Rect(pos.x - r, pos.y - r, 2 * r + 1, 2 * r + 1))
+        self._block_ports[b] = ports
+        for w in self._block_wires.get(b, ()):
+            self._index_wire(w)
+
+    def remove_block(self, b) -> None:
+        self.remove_wires_of(b)
+        self.blocks.remove(b)
+        self.resizers.remove(b)
+        for p in self._block_ports.pop(b, ()):
+            self.ports.remove(p)
+        self._block_wires.pop(b, None)
+        self._order.pop(b, None)
+
+    # ------------------------------------------------------------------ wires
+
+    def _index_wire(self, w) -> None:
+        # one entry per piece of the polyline, so a long wire only shows up
+        # in the cells it actually passes through
+        self._drop_pieces(w)
+        pts = w.points_array().astype(float)
+        n = self.WIRE_PIECE
+        pieces = []
+        for k in range(0, max(1, len(pts) - 1), n):
+            piece = (w, k)
+            self._piece_pts[piece] = pts[k:k + n + 1]
+            self.wires.insert(piece, bounding_rect(pts[k:k + n + 1], self.WIRE_TOL))
+            pieces.append(piece)
+        self._wire_pieces[w] = pieces
+
+    def _drop_pieces(self, w) -> None:
+        for piece in self._wire_pieces.pop(w, ()):
+            self.wires.remove(piece)
+            del self._piece_pts[piece]
+
+    def add_wire(self, w) -> None:
+        self._stamp(w)
+        for g in (w.a.gate, w.b.gate):
+            self._block_wires.setdefault(g, {})[w] = None
+        self._index_wire(w)
+
+    def remove_wire(self, w) -> None:
+        self._drop_pieces(w)
+        self._order.pop(w, None)
+        for g in (w.a.gate, w.b.gate):
+            self._block_wires.get(g, {}).pop(w, None)
+
+    def remove_wires_of(self, b) -> None:
+        """Forget every wire attached to `b` (see utils.cut_wired)."""
+        for w in list(self._block_wires.get(b, ())):
+            self.remove_wire(w)
+
+    # ---------------------------------------------------------------- queries
+
+    def block_at(self, pos):
+        hits = list(self.blocks.at(pos))
+        return min(hits, key=self._order.__getitem__) if hits else None
+
+    def resizers_at(self, pos) -> List[object]:
+        """Blocks whose +/- buttons may contain `pos`, in block order; test
+        them with hover_plus/hover_minus as a scan over all blocks would."""
+        return sorted(self.resizers.at(pos), key=self._order.__getitem__)
+
+    def port_at(self, pos, kind=None):
+        hits = [p for p in self.ports.at(pos) if (kind is None or p.kind == kind) and p.hover(pos)]
+        return min(hits, key=lambda p: self._order[p.gate]) if hits else None
+
+    def wire_at(self, pos):
+        pieces = list(self.wires.at(pos))
+        if not pieces:
+            return None
+        # all candidate segments in one distance computation
+        pts = [self._piece_pts[piece] for piece in pieces]
+        p = np.concatenate([a[:-1] for a in pts])
+        q = np.concatenate([a[1:] for a in pts])
+        owner = np.repeat(np.arange(len(pieces)), [len(a) - 1 for a in pts])
+        hits = {pieces[i][0] for i in owner[segment_distances(p, q, pos) <= self.WIRE_TOL].tolist()}
+        return max(hits, key=self._order.__getitem__) if hits else None
@@ -1,7 +1,6 @@
 import pygame
+import numpy as np
 from .colors import GRID
-import io, contextlib
-import tkinter as tk
 from .pygame_cfg import *
 from logic_circuits.gates.gates import GateBase,SysIN
 
@@ -15,18 +14,32 @@ def draw_grid(surface, W, H, gap=24):
 def lerp(a, b, t):
     return a + (b - a) * t
 
+_BERNSTEIN = {}
+
+def bernstein(steps):
+    """(steps+1, 4) cubic Bernstein basis at t = 0, 1/steps, ..., 1."""
+    B = _BERNSTEIN.get(steps)
+    if B is None:
+        t = np.linspace(0.0, 1.0, steps + 1)[:, None]
+        B = _BERNSTEIN[steps] = np.hstack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3])
+    return B
+
+def bezier_array(p0, p1, p2, p3, steps=30) -> np.ndarray:
+    """(steps+1, 2) int points of the cubic bezier, truncated like int()."""
+    P = np.array([tuple(p0), tuple(p1), tuple(p2), tuple(p3)], dtype=float)
+    return (bernstein(steps) @ P).astype(int)
+
 def cubic_bezier(p0, p1, p2, p3, steps=30):
-    pts = []
-    for i in range(steps + 1):
-        t = i / steps
-        a = lerp(p0, p1, t)
-        b = lerp(p1, p2, t)
-        c = lerp(p2, p3, t)
-        d = lerp(a, b, t)
-        e = lerp(b, c, t)
-        f = lerp(d, e, t)
-        pts.append((int(f.x), int(f.y)))
-    return pts
+    return list(map(tuple, bezier_array(p0, p1, p2, p3, steps).tolist()))
+
+def segment_distances(p: np.ndarray, q: np.ndarray, pos) -> np.ndarray:
+    """Distance from `pos` to every segment p[i]-q[i] (both (n, 2))."""
+    m = np.asarray(pos, dtype=float)
+    d = q - p
+    l2 = (d * d).sum(axis=1)
+    t = np.clip(((m - p) * d).sum(axis=1) / np.where(l2 < 1e-10, 1.0, l2), 0.0, 1.0)
+    e = p + t[:, None] * d - m
+    return np.sqrt((e * e).sum(axis=1))
 
 def cut_wired(wires, gate):
     new_wires = [
@@ -34,7 +47,16 @@ def cut_wired(wires, gate):
     ]
     return new_wires
 
-from typing import List
+def cut_removed_ports(wires, gate):
+    """Drop the wires attached to ports `gate` no longer has after a resize."""
+    new_wires = [
+        wire for wire in wires
+        if not (wire.a.gate == gate and wire.a.index >= gate.num_out)
+        and not (wire.b.gate == gate and wire.b.index >= gate.num_in)
+    ]
+    return new_wires
+
+from typing import Iterator, List
 from logic_circuits.utils.base_classes import Port
 def all_ports(blocks) -> List[Port]:
     return [p for b in blocks for p in b.inputs + b.outputs]
@@ -52,43 +74,128 @@ def port_under_mouse(mouse, blocks, kind=None):
     return None
 
 
-def find_wire_under_mouse(mouse, wires):
-    for w in reversed(wires):
-        if w.hit_test(mouse):
-            return w
-    return None
-import itertools
+def find_wire_under_mouse(mouse, wires, tol=6):
+    """Top-most wire within `tol` of `mouse`, all cached polylines tested at once."""
+    if not wires:
+        return None
+    pts = [w.points_array() for w in wires]
+    p = np.concatenate([a[:-1] for a in pts]).astype(float)
+    q = np.concatenate([a[1:] for a in pts]).astype(float)
+    owner = np.repeat(np.arange(len(wires)), [len(a) - 1 for a in pts])
+    hits = owner[segment_distances(p, q, mouse) <= tol]
+    return wires[hits.max()] if len(hits) else None
+from logic_circuits.simulation.bitparallel import TruthTable, truth_table
+from logic_circuits.simulation.stream import write_truth_table
 
 
 import numpy as np
-def truthtable(gate: GateBase, inputs: SysIN):
-    cols = "  ".join([f"I{i}" for i in range(inputs.num_out)])
+def truthtable_header(gate: GateBase, table: TruthTable) -> List[str]:
+    cols = "  ".join([f"I{i}" for i in range(table.num_in)])
+    # a compiled Netlist has no name, label it by its output nets
+    name = getattr(gate, "name", None) or " ".join(table.out_names)
+    return [
+        f"{cols}   | {name}",
+        "-" * (4*table.num_in + 10),
+    ]
 
-    print(f"{cols}   | {getattr(gate, 'name', gate.name)}")
-    print("-" * (4*inputs.num_out + 10))
+def truthtable_rows(table: TruthTable, start: int = 0, stop: int = None, chunk_rows: int = 4096) -> Iterator[str]:
+    """Formatted rows start..stop-1, unpacked and formatted one chunk at a time."""
+    for _, ins, outs in table.chunks(chunk_rows, start, stop):
+        for combo, out in zip(ins.astype(np.uint8).tolist(), outs.astype(np.uint8).tolist()):
+            yield "   ".join(map(str, combo)) + "   |  [" + " ".join(map(str, out)) + "]"
 
-    for combo in itertools.product([False, True], repeat=inputs.num_out):
-        inputs.set_state(np.arange(inputs.num_out), list(combo))
+def truthtable_lines(gate: GateBase, inputs: SysIN) -> Iterator[str]:
+    """Lazily yield the lines of the printed truth table."""
+    table = truth_table(gate, inputs)
+    yield from truthtable_header(gate, table)
+    yield from truthtable_rows(table)
 
-        out = np.array(gate.state, dtype=int)
-        bits = "   ".join(str(int(b)) for b in combo)
-        
-        print(f"{bits}   |  {out}")
+def truthtable(gate: GateBase, inputs: SysIN):
+    for line in truthtable_lines(gate, inputs):
+        print(line)
 
 
 
 def truthtable_str(this_gate, sysin):
-    buf = io.StringIO()
-    with contextlib.redirect_stdout(buf):
-        truthtable(this_gate, sysin)
-    return buf.getvalue().splitlines()
+    return list(truthtable_lines(this_gate, sysin))
 
 def truthtable_print(this_gate, sysin):
-    lines = truthtable_str(this_gate, sysin)
-    print("\n".join(lines))
+    truthtable(this_gate, sysin)
+
+
+class TruthTableViewer:
+    """Paged Tk view of a truth table: the Text widget only ever holds the
+    rows that fit in the window, re-rendered on scroll and resize."""
+
+    def __init__(self, master, gate: GateBase, table: TruthTable):
+        import tkinter as tk
+        import tkinter.font as tkfont
+
+        self.table = table
+        self.top = 0
+        self.header = truthtable_header(gate, table)
+
+        bar = tk.Frame(master)
+        bar.pack(side="top", fill="x")
+        tk.Button(bar, text="Export CSV", command=lambda: self.export("csv")).pack(side="left")
+        tk.Button(bar, text="Export bits", command=lambda: self.export("bits")).pack(side="left")
+        self.status = tk.Label(bar, anchor="e")
+        self.status.pack(side="right")
+
+        self.scroll = tk.Scrollbar(master, command=self._on_scroll)
+        self.scroll.pack(side="right", fill="y")
+        self.text = tk.Text(master, wrap="none")
+        self.text.pack(expand=True, fill="both")
+        self.line_height = tkfont.Font(font=self.text["font"]).metrics("linespace")
+
+        self.text.bind("<Configure>", lambda e: self.render())
+        self.text.bind("<MouseWheel>", lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.text.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.render()
+
+    @property
+    def visible_rows(self) -> int:
+        return max(1, self.text.winfo_height() // self.line_height - len(self.header))
+
+    def scroll_to(self, row: int) -> None:
+        self.top = max(0, min(int(row), self.table.num_rows - self.visible_rows))
+        self.render()
+
+    def scroll_by(self, rows: int) -> None:
+        self.scroll_to(self.top + rows)
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * self.table.num_rows)
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.visible_rows)
+        else:
+            self.scroll_by(int(amount))
+
+    def render(self) -> None:
+        stop = min(self.top + self.visible_rows, self.table.num_rows)
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("end", "\n".join(self.header + list(truthtable_rows(self.table, self.top, stop))))
+        self.text.configure(state="disabled")
+        n = self.table.num_rows
+        self.scroll.set(self.top / n, stop / n)
+        self.status.configure(text=f"rows {self.top}-{stop - 1} of {n}")
+
+    def export(self, fmt: str) -> None:
+        from tkinter import filedialog
+
+        ext = ".csv" if fmt == "csv" else ".bits"
+        path = filedialog.asksaveasfilename(defaultextension=ext, filetypes=[(fmt, "*" + ext)])
+        if path:
+            write_truth_table(self.table, path, fmt)
+
 
 def truthtable_window(this_gate, sysin, root=None):
-    lines = truthtable_str(this_gate, sysin)
+    import tkinter as tk
+
+    table = truth_table(this_gate, sysin)
 
     if root is None:
         root = tk.Tk()
@@ -99,26 +206,24 @@ def truthtable_window(this_gate, sysin, root=None):
     win = tk.Toplevel(root) if not owns_root else root
     win.title("Truth Table")
 
-    text = tk.Text(win, wrap="none")
-    text.pack(expand=True, fill="both")
-
-    for line in lines:
-        text.insert("end", line + "\n")
+    viewer = TruthTableViewer(win, this_gate, table)
 
     if owns_root:
         # only start the loop if we created the root ourselves
         root.mainloop()
+    return viewer
 
 
 from logic_circuits.pygame_representation.button import Button  # if in separate file
 from logic_circuits.pygame_representation import fonts
 
-play_button = Button(
-    rect=(W - 140, 20, 120, 40),   # position + size
-    text="Play",
-    font=fonts.FONT,
-    bg_color=(50, 180, 90),
-    fg_color=(255, 255, 255),
-    hover_color=(70, 200, 110),
-)
-
+def make_play_button() -> Button:
+    """The editor's Play button (build it after fonts.init())."""
+    return Button(
+        rect=(W - 140, 20, 120, 40),   # position + size
+        text="Play",
+        font=fonts.FONT,
+        bg_color=(50, 180, 90),
+        fg_color=(255, 255, 255),
+        hover_color=(70, 200, 110),
+    )
@@ -1,6 +1,7 @@
 import pygame
+import numpy as np
 from pygame.math import Vector2
-from .utils import cubic_bezier
+from .utils import bezier_array, segment_distances
 from .colors import WIRE_FALSE, WIRE_TRUE, WIRE_HOT
 from logic_circuits.gates.port import Port
 
@@ -11,34 +12,43 @@ class Wire:
         self.b = end_port
         self.parent_gate = self.a.gate
         self.col = WIRE_FALSE
+        # polyline cache, valid while both endpoints stay where they were
+        self._key = None
+        self._pts = None
+        self._pts_list = None
         # print(f"connecting {self.a, self.b}")
         # print(f"start {self.a.state,}")
         # print(f"end {self.b.state,}")
 
 
     def hit_test(self, mouse, tol=6):
-        pts = self._points()
-        mv = Vector2(mouse)
-        for i in range(len(pts) - 1):
-            p = Vector2(pts[i]); q = Vector2(pts[i + 1])
-            if (q - p).length() < 1e-5:
-                d = (mv - p).length()
-            else:
-                t = max(0, min(1, (mv - p).dot(q - p) / (q - p).length_squared()))
-                proj = p + t * (q - p)
-                d = (mv - proj).length()
-            if d <= tol:
-                return True
-        return False
+        pts = self.points_array().astype(float)
+        return bool((segment_distances(pts[:-1], pts[1:], mouse) <= tol).any())
 
-    def _points(self):
+    def points_array(self) -> np.ndarray:
+        """(37, 2) int polyline, recomputed only when an endpoint moved."""
         p0 = self.a.screen_pos(); p3 = self.b.screen_pos()
-        dx = max(40, abs(p3.x - p0.x) * 0.5)
-        c1 = Vector2(p0.x + dx, p0.y); c2 = Vector2(p3.x - dx, p3.y)
-        return cubic_bezier(p0, c1, c2, p3, steps=36)
+        key = (p0.x, p0.y, p3.x, p3.y)
+        if key != self._key:
+            dx = max(40, abs(p3.x - p0.x) * 0.5)
+            c1 = Vector2(p0.x + dx, p0.y); c2 = Vector2(p3.x - dx, p3.y)
+            self._pts = bezier_array(p0, c1, c2, p3, steps=36)
+            self._pts_list = None
+            self._key = key
+        return self._pts
+
+    def _points(self):
+        pts = self.points_array()
+        if self._pts_list is None:
+            self._pts_list = list(map(tuple, pts.tolist()))
+        return self._pts_list
 
-    def draw(self, surf, hot=False):
-        if not self.parent_gate.state[self.a.index]: self.col = WIRE_FALSE
+    def draw(self, surf, hot=False, value=None):
+        """`value` is the driven bit (e.g. from a simulation Snapshot); by
+        default it is read from the driving gate."""
+        if value is None:
+            value = self.parent_gate.state[self.a.index]
+        if not value: self.col = WIRE_FALSE
         else: self.col = WIRE_TRUE
         
         pts = self._points()
@@ -0,0 +1,18 @@
+"""
+simulation: compiled evaluation engines for logic circuits.
+"""
+
+from .netlist import *
+from .codegen import *
+from .bitparallel import *
+from .batch import *
+from .optimize import *
+from .parallel import *
+from .sat import *
+from .equivalence import *
+from .bdd import *
+from .sequential import *
+from .storage import *
+from .stream import *
+from .memo import *
+from .worker import *
@@ -0,0 +1,60 @@
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, as_netlist
+from logic_circuits.simulation.bitparallel import _evaluator
+
+__all__ = [
+    "pack_vectors",
+    "unpack_vectors",
+    "simulate",
+]
+
+
+def pack_vectors(columns: np.ndarray) -> np.ndarray:
+    """(k, N) bool -> (k, ceil(N / 64)) uint64, vector j in bit j of the row."""
+    columns = np.asarray(columns, dtype=bool)
+    k, n = columns.shape
+    packed = np.packbits(columns, axis=1, bitorder="little")
+    pad = -packed.shape[1] % 8
+    if pad or packed.shape[1] == 0:
+        packed = np.pad(packed, ((0, 0), (0, pad or 8)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def unpack_vectors(packed: np.ndarray, n: int) -> np.ndarray:
+    """Inverse of pack_vectors: (k, words) uint64 -> (k, n) bool."""
+    bits = np.unpackbits(np.ascontiguousarray(packed).view(np.uint8), axis=1, bitorder="little")
+    return bits[:, :n].astype(bool)
+
+
+def simulate(
+    circuit,
+    inputs: np.ndarray,
+    sysin=None,
+    batch_size: int = 1 << 20,
+    backend: str = "netlist",
+) -> np.ndarray:
+    """Evaluate `circuit` on a batch of stimuli.
+
+    `inputs` has shape (N, num_in) (or (num_in,) for a single vector), with
+    columns in SysIN port order. Returns (N, num_out) bool. Vectors are packed
+    64 per machine word, so each gate costs one bitwise op per 64 vectors.
+    `backend` is "netlist" (levelized interpreter) or "codegen" (generated
+    code, for netlists of up to codegen.MAX_NODES nodes).
+    """
+    nl: Netlist = as_netlist(circuit, sysin)
+    evaluate = _evaluator(nl, backend)
+    inputs = np.asarray(inputs, dtype=bool)
+    single = inputs.ndim == 1
+    if single:
+        inputs = inputs[None, :]
+    if inputs.ndim != 2 or inputs.shape[1] != nl.num_in:
+        raise ValueError(f"Expected inputs of shape (N, {nl.num_in}), got {inputs.shape}")
+
+    n = inputs.shape[0]
+    out = np.empty((n, nl.num_out), dtype=bool)
+    for lo in range(0, n, batch_size):
+        hi = min(lo + batch_size, n)
+        words = evaluate(pack_vectors(inputs[lo:hi].T))
+        out[lo:hi] = unpack_vectors(words, hi - lo).T
+    return out[0] if single else out
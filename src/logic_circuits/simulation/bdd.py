@@ -0,0 +1,241 @@
+import itertools
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import numpy as np
+
+from logic_circuits.simulation.netlist import (
+    Netlist, as_netlist,
+    OP_CONST0, OP_BUF, OP_NOT, OP_AND,
+)
+
+__all__ = [
+    "BDD",
+    "circuit_to_bdd",
+    "bdd_equivalent",
+]
+
+
+class BDD:
+    """Reduced ordered BDD manager.
+
+    Nodes are ints: 0 and 1 are the terminals, every other node is stored as
+    (var, lo, hi) in a unique table, so equal functions are the same int.
+    ITE results are memoized in a fixed-size direct-mapped cache (colliding
+    entries simply overwrite each other). Variable order can be changed in
+    place with swap() and sift(); node ids keep their meaning.
+    """
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, num_vars: int, cache_size: int = 1 << 16):
+        self.num_vars = num_vars
+        self._var: List[int] = [-1, -1]
+        self._lo: List[int] = [0, 1]
+        self._hi: List[int] = [0, 1]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._by_var: List[Set[int]] = [set() for _ in range(num_vars)]
+        self.var2level = list(range(num_vars))
+        self.level2var = list(range(num_vars))
+
+        size = 1 << max(1, int(cache_size - 1).bit_length())
+        self._cache: List[Optional[Tuple[int, int, int, int]]] = [None] * size
+        self._mask = size - 1
+
+    # ---- construction ----
+    def _level(self, f: int) -> int:
+        return self.num_vars if f < 2 else self.var2level[self._var[f]]
+
+    def _mk(self, v: int, lo: int, hi: int) -> int:
+        if lo == hi:
+            return lo
+        key = (v, lo, hi)
+        f = self._unique.get(key)
+        if f is None:
+            f = len(self._var)
+            self._var.append(v); self._lo.append(lo); self._hi.append(hi)
+            self._unique[key] = f
+            self._by_var[v].add(f)
+        return f
+
+    def var(self, v: int) -> int:
+        return self._mk(v, 0, 1)
+
+    def _cofactors(self, f: int, level: int) -> Tuple[int, int]:
+        if f < 2 or self.var2level[self._var[f]] != level:
+            return f, f
+        return self._lo[f], self._hi[f]
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        if f == 1:
+            return g
+        if f == 0:
+            return h
+        if g == h:
+            return g
+        if g == 1 and h == 0:
+            return f
+
+        slot = hash((f, g, h)) & self._mask
+        entry = self._cache[slot]
+        if entry is not None and entry[0] == f and entry[1] == g and entry[2] == h:
+            return entry[3]
+
+        top = min(self._level(f), self._level(g), self._level(h))
+        f0, f1 = self._cofactors(f, top)
+        g0, g1 = self._cofactors(g, top)
+        h0, h1 = self._cofactors(h, top)
+        r = self._mk(self.level2var[top], self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self._cache[slot] = (f, g, h, r)
+        return r
+
+    def NOT(self, f: int) -> int:
+        return self.ite(f, 0, 1)
+
+    def AND(self, f: int, g: int) -> int:
+        return self.ite(f, g, 0)
+
+    def OR(self, f: int, g: int) -> int:
+        return self.ite(f, 1, g)
+
+    def XOR(self, f: int, g: int) -> int:
+        return self.ite(f, self.NOT(g), g)
+
+    # ---- queries ----
+    def evaluate(self, f: int, assignment: Sequence[bool]) -> bool:
+        while f >= 2:
+            f = self._hi[f] if assignment[self._var[f]] else self._lo[f]
+        return f == 1
+
+    def count_sat(self, f: int) -> int:
+        """Number of satisfying assignments over all num_vars variables."""
+        memo: Dict[int, int] = {0: 0, 1: 1}
+
+        def count(g: int) -> int:
+            if g in memo:
+                return memo[g]
+            lv = self._level(g)
+            lo, hi = self._lo[g], self._hi[g]
+            c = (count(lo) << (self._level(lo) - lv - 1)) + (count(hi) << (self._level(hi) - lv - 1))
+            memo[g] = c
+            return c
+
+        return count(f) << self._level(f)
+
+    def pick_sat(self, f: int) -> Optional[np.ndarray]:
+        """One satisfying assignment (unconstrained variables False), or None."""
+        if f == 0:
+            return None
+        bits = np.zeros(self.num_vars, dtype=bool)
+        while f >= 2:
+            if self._lo[f] != 0:
+                f = self._lo[f]
+            else:
+                bits[self._var[f]] = True
+                f = self._hi[f]
+        return bits
+
+    def size(self, roots: Sequence[int]) -> int:
+        """Number of internal nodes reachable from `roots`."""
+        seen = set()
+        stack = [r for r in roots if r >= 2]
+        while stack:
+            f = stack.pop()
+            if f in seen:
+                continue
+            seen.add(f)
+            for c in (self._lo[f], self._hi[f]):
+                if c >= 2 and c not in seen:
+                    stack.append(c)
+        return len(seen)
+
+    def iter_truth_table(self, roots: Sequence[int]) -> Iterator[Tuple[Tuple[bool, ...], Tuple[bool, ...]]]:
+        """Lazily yield (inputs, outputs) rows in itertools.product order."""
+        for combo in itertools.product([False, True], repeat=self.num_vars):
+            yield combo, tuple(self.evaluate(r, combo) for r in roots)
+
+    # ---- reordering ----
+    def swap(self, level: int) -> None:
+        """Exchange the variables at `level` and `level + 1` in place."""
+        x, y = self.level2var[level], self.level2var[level + 1]
+        self.level2var[level], self.level2var[level + 1] = y, x
+        self.var2level[x], self.var2level[y] = level + 1, level
+
+        var, lo, hi = self._var, self._lo, self._hi
+        for f in list(self._by_var[x]):
+            f0, f1 = lo[f], hi[f]
+            if var[f0] != y and var[f1] != y:
+                continue
+            f00, f01 = (lo[f0], hi[f0]) if var[f0] == y else (f0, f0)
+            f10, f11 = (lo[f1], hi[f1]) if var[f1] == y else (f1, f1)
+            g0 = self._mk(x, f00, f10)
+            g1 = self._mk(x, f01, f11)
+            del self._unique[(x, f0, f1)]
+            self._by_var[x].discard(f)
+            var[f], lo[f], hi[f] = y, g0, g1
+            self._unique[(y, g0, g1)] = f
+            self._by_var[y].add(f)
+
+    def _move(self, v: int, target: int, roots: Sequence[int], best: List[int]) -> None:
+        while self.var2level[v] < target:
+            self.swap(self.var2level[v])
+            self._track(v, roots, best)
+        while self.var2level[v] > target:
+            self.swap(self.var2level[v] - 1)
+            self._track(v, roots, best)
+
+    def _track(self, v: int, roots: Sequence[int], best: List[int]) -> None:
+        s = self.size(roots)
+        if s < best[0]:
+            best[0], best[1] = s, self.var2level[v]
+
+    def sift(self, roots: Sequence[int]) -> int:
+        """Rudell sifting: move each variable to the level that minimizes the
+        number of nodes reachable from `roots`. Returns the new size."""
+        order = sorted(range(self.num_vars), key=lambda v: -len(self._by_var[v]))
+        for v in order:
+            best = [self.size(roots), self.var2level[v]]
+            self._move(v, self.num_vars - 1, roots, best)
+            self._move(v, 0, roots, best)
+            self._move(v, best[1], roots, [best[0], best[1]])
+        return self.size(roots)
+
+    def __repr__(self):
+        return f"BDD(num_vars={self.num_vars}, nodes={len(self._var) - 2})"
+
+
+def circuit_to_bdd(circuit, inputs=None, manager: Optional[BDD] = None) -> Tuple[BDD, List[int]]:
+    """Build the outputs of `circuit` as BDDs, walking the compiled gate graph
+    from the SysIN inputs to the end gates in topological order.
+    Returns (manager, output roots); input k of the circuit is variable k."""
+    nl: Netlist = as_netlist(circuit, inputs)
+    nl.check_combinational()
+    bdd = manager or BDD(nl.num_in)
+    if bdd.num_vars < nl.num_in:
+        raise ValueError(f"Manager has {bdd.num_vars} variables, circuit needs {nl.num_in}.")
+
+    f = [0] * nl.num_nodes
+    for k, n in enumerate(nl.inputs.tolist()):
+        f[n] = bdd.var(k)
+    op, fa, fb = nl.op.tolist(), nl.fanin[:, 0].tolist(), nl.fanin[:, 1].tolist()
+    for n in np.argsort(nl.level, kind="stable").tolist():
+        o = op[n]
+        if o == OP_BUF:
+            f[n] = f[fa[n]]
+        elif o == OP_NOT:
+            f[n] = bdd.NOT(f[fa[n]])
+        elif o == OP_AND:
+            f[n] = bdd.AND(f[fa[n]], f[fb[n]])
+        elif o == OP_CONST0:
+            f[n] = 0
+    return bdd, [f[n] for n in nl.outputs.tolist()]
+
+
+def bdd_equivalent(circuit_a, circuit_b, inputs_a=None, inputs_b=None) -> bool:
+    """Build both circuits in one manager; by canonicity they are equivalent
+    iff their output nodes are identical."""
+    nl_a: Netlist = as_netlist(circuit_a, inputs_a)
+    nl_b: Netlist = as_netlist(circuit_b, inputs_b)
+    if (nl_a.num_in, nl_a.num_out) != (nl_b.num_in, nl_b.num_out):
+        return False
+    bdd, roots_a = circuit_to_bdd(nl_a)
+    _, roots_b = circuit_to_bdd(nl_b, manager=bdd)
+    return roots_a == roots_b
@@ -0,0 +1,154 @@
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, as_netlist
+import logic_circuits.simulation.codegen as codegen
+
+__all__ = [
+    "WORD_BITS",
+    "TruthTable",
+    "input_patterns",
+    "truth_table",
+]
+
+WORD_BITS = 64
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# bit r of _LOW_PATTERNS[k] is bit k of the row index r
+_LOW_PATTERNS = [
+    np.uint64(sum(1 << r for r in range(WORD_BITS) if (r >> k) & 1)) for k in range(6)
+]
+
+
+def _num_words(num_in: int) -> int:
+    return max(1, (1 << num_in) // WORD_BITS)
+
+
+def input_patterns(num_in: int, word_lo: int = 0, word_hi: Optional[int] = None) -> np.ndarray:
+    """Packed input columns of the exhaustive truth table, shape (num_in, words).
+
+    Row r of the table is bit r % 64 of word r // 64. Input 0 is the most
+    significant bit of the row index, matching itertools.product ordering.
+    """
+    if word_hi is None:
+        word_hi = _num_words(num_in)
+    words = np.arange(word_lo, word_hi, dtype=np.uint64)
+    pats = np.empty((num_in, len(words)), dtype=np.uint64)
+    for i in range(num_in):
+        k = num_in - 1 - i
+        if k < 6:
+            pats[i] = _LOW_PATTERNS[k]
+        else:
+            pats[i] = np.where((words >> np.uint64(k - 6)) & np.uint64(1), _ALL_ONES, np.uint64(0))
+    return pats
+
+
+class TruthTable:
+    """Exhaustive truth table stored as packed output bits, shape (num_out, words)."""
+
+    def __init__(self, num_in: int, packed: np.ndarray, in_names: List[str] = None, out_names: List[str] = None):
+        self.num_in = num_in
+        self.num_out = packed.shape[0]
+        self.packed = packed
+        self.in_names = in_names or [f"I{i}" for i in range(num_in)]
+        self.out_names = out_names or [f"O{i}" for i in range(self.num_out)]
+
+    @property
+    def num_rows(self) -> int:
+        return 1 << self.num_in
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def input_rows(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        stop = self.num_rows if stop is None else stop
+        rows = np.arange(start, stop, dtype=np.int64)
+        shifts = np.arange(self.num_in - 1, -1, -1, dtype=np.int64)
+        return ((rows[:, None] >> shifts) & 1).astype(bool)
+
+    def output_rows(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        stop = self.num_rows if stop is None else stop
+        w0, w1 = start // WORD_BITS, -(-stop // WORD_BITS)
+        words = self.packed[:, w0:w1].astype("<u8")
+        bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")
+        lo = start - w0 * WORD_BITS
+        return bits[:, lo:lo + (stop - start)].T.astype(bool)
+
+    def chunks(self, chunk_rows: int = 1 << 16, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """Lazily yield (first row, inputs, outputs) for consecutive blocks of
+        at most `chunk_rows` rows; only one block is unpacked at a time."""
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        for lo in range(start, stop, chunk_rows):
+            hi = min(lo + chunk_rows, stop)
+            yield lo, self.input_rows(lo, hi), self.output_rows(lo, hi)
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[bool, ...], Tuple[bool, ...]]]:
+        """Lazily yield (inputs, outputs) rows in itertools.product order."""
+        for _, ins, outs in self.chunks():
+            yield from zip(map(tuple, ins.tolist()), map(tuple, outs.tolist()))
+
+    @property
+    def inputs(self) -> np.ndarray:
+        """(rows, num_in) bool"""
+        return self.input_rows()
+
+    @property
+    def outputs(self) -> np.ndarray:
+        """(rows, num_out) bool"""
+        return self.output_rows()
+
+    def to_array(self) -> np.ndarray:
+        """(rows, num_in + num_out) uint8"""
+        return np.hstack([self.inputs, self.outputs]).astype(np.uint8)
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.to_array()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TruthTable):
+            return NotImplemented
+        return (self.num_in == other.num_in
+                and self.packed.shape == other.packed.shape
+                and bool(np.array_equal(self.output_rows(), other.output_rows())))
+
+    def __repr__(self):
+        return f"TruthTable(num_in={self.num_in}, num_out={self.num_out}, rows={self.num_rows})"
+
+
+def _evaluator(nl: Netlist, backend: str):
+    nl.check_combinational()
+    if backend == "netlist":
+        return nl.evaluate
+    if backend == "codegen":
+        if nl.num_nodes > codegen.MAX_NODES:
+            return nl.evaluate
+        return codegen.compile_python(nl).evaluate
+    raise ValueError(f"Unknown backend {backend!r}")
+
+
+def truth_table(circuit, inputs=None, chunk_words: int = 1 << 12, backend: str = "netlist") -> TruthTable:
+    """Exhaustive truth table with every input combination evaluated at once.
+
+    Each input is assigned its packed bit pattern and every gate is evaluated
+    once per chunk of `chunk_words` * 64 rows with bitwise AND/NOT.
+    `backend` is "netlist" (levelized interpreter) or "codegen" (generated
+    code, for netlists of up to codegen.MAX_NODES nodes).
+    """
+    nl: Netlist = as_netlist(circuit, inputs)
+    evaluate = _evaluator(nl, backend)
+    n_words = _num_words(nl.num_in)
+    packed = np.empty((nl.num_out, n_words), dtype=np.uint64)
+    for w0 in range(0, n_words, chunk_words):
+        w1 = min(w0 + chunk_words, n_words)
+        packed[:, w0:w1] = evaluate(input_patterns(nl.num_in, w0, w1))
+
+    if nl.num_in < 6:
+        packed &= np.uint64((1 << (1 << nl.num_in)) - 1)
+
+    return TruthTable(
+        nl.num_in,
+        packed,
+        in_names=[f"I{i}" for i in range(nl.num_in)],
+        out_names=[nl.names[n] for n in nl.outputs],
+    )
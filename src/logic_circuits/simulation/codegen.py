@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from typing import Callable, List, Sequence
+import numpy as np
+
+from logic_circuits.simulation.netlist import (
+    Netlist, as_netlist,
+    OP_CONST0, OP_BUF, OP_NOT, OP_AND,
+)
+
+__all__ = [
+    "CompiledCircuit",
+    "generate_source",
+    "compile_python",
+]
+
+# compiled functions keyed by Netlist.structural_hash()
+_CACHE: "OrderedDict[str, Callable]" = OrderedDict()
+CACHE_SIZE = 64
+
+# the "codegen" backend evaluates larger netlists with Netlist.evaluate: past
+# about this size the generated function runs no faster than the levelized
+# interpreter, and compiling it takes longer than a whole simulation
+MAX_NODES = 20_000
+
+
+def generate_source(nl: Netlist, func_name: str = "circuit") -> str:
+    """Straight-line Python source with one assignment per AND/NOT node.
+
+    The function takes the inputs as positional arguments and `one`, the
+    all-ones value of the operand type (True, a uint64 max, or (1 << w) - 1
+    for Python ints), so NOT is written as `x ^ one` and works for bools,
+    ints and NumPy arrays alike. It returns a tuple with the outputs.
+    """
+    nl.check_combinational()
+    names = node_names(nl)
+    args = [names[n] for n in nl.inputs.tolist()] + ["one"]
+    lines = [f"def {func_name}({', '.join(args)}):"]
+    lines += body_lines(nl, names, "    ")
+    outs = ", ".join(names[n] for n in nl.outputs.tolist())
+    lines.append(f"    return ({outs}{',' if nl.num_out == 1 else ''})")
+    return "\n".join(lines) + "\n"
+
+
+def node_names(nl: Netlist) -> List[str]:
+    """Variable names of the nodes that are not computed by body_lines():
+    "i<k>" for input k and "s<k>" for register k."""
+    names: List[str] = [""] * nl.num_nodes
+    for k, n in enumerate(nl.inputs.tolist()):
+        names[n] = f"i{k}"
+    for k, n in enumerate(nl.state_nodes.tolist()):
+        names[n] = f"s{k}"
+    return names
+
+
+def body_lines(nl: Netlist, names: List[str], indent: str) -> List[str]:
+    """One assignment per AND/NOT node in topological order; fills in `names`."""
+    lines = []
+    op, fa, fb = nl.op.tolist(), nl.fanin[:, 0].tolist(), nl.fanin[:, 1].tolist()
+    for n in np.argsort(nl.level, kind="stable").tolist():
+        o = op[n]
+        if o == OP_CONST0:
+            names[n] = "0"
+        elif o == OP_BUF:
+            names[n] = names[fa[n]]
+        elif o == OP_NOT:
+            names[n] = f"n{n}"
+            lines.append(f"{indent}n{n} = {names[fa[n]]} ^ one")
+        elif o == OP_AND:
+            names[n] = f"n{n}"
+            lines.append(f"{indent}n{n} = {names[fa[n]]} & {names[fb[n]]}")
+    return lines
+
+
+def compile_source(key: str, make_source: Callable[[], str], func_name: str) -> Callable:
+    """Compile the function `func_name` from make_source(), cached under `key`."""
+    fn = _CACHE.get(key)
+    if fn is None:
+        source = make_source()
+        namespace = {}
+        exec(compile(source, f"<circuit {key[:12]}>", "exec"), namespace)
+        fn = namespace[func_name]
+        _CACHE[key] = fn
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(key)
+    return fn
+
+
+class CompiledCircuit:
+    """Generated-code evaluator with the same evaluate() interface as Netlist."""
+
+    def __init__(self, nl: Netlist, fn: Callable):
+        self.netlist = nl
+        self.fn = fn
+
+    @property
+    def num_in(self) -> int:
+        return self.netlist.num_in
+
+    @property
+    def num_out(self) -> int:
+        return self.netlist.num_out
+
+    def evaluate(self, inputs: np.ndarray) -> np.ndarray:
+        """(num_in, ...) bool or unsigned int array -> (num_out, ...)."""
+        inputs = np.asarray(inputs)
+        if inputs.shape[:1] != (self.num_in,):
+            raise ValueError(f"Expected {self.num_in} inputs, got shape {inputs.shape}")
+        if inputs.dtype == bool:
+            one = True
+        else:
+            one = inputs.dtype.type(np.iinfo(inputs.dtype).max)
+        outs = self.fn(*inputs, one)
+
+        result = np.empty((self.num_out,) + inputs.shape[1:], dtype=inputs.dtype)
+        for k, o in enumerate(outs):
+            result[k] = o
+        return result
+
+    __call__ = evaluate
+
+    def evaluate_ints(self, inputs: Sequence[int], width: int) -> List[int]:
+        """Evaluate on Python ints used as `width`-bit vectors (bit j = vector j)."""
+        mask = (1 << width) - 1
+        return [o & mask for o in self.fn(*inputs, mask)]
+
+
+def compile_python(circuit, inputs=None) -> CompiledCircuit:
+    """Generate, compile and cache a straight-line Python function for `circuit`.
+
+    Compiled functions are cached by the structural hash of the netlist, so
+    repeated simulations of the same design skip code generation. This only
+    pays off for small circuits, see MAX_NODES.
+    """
+    nl: Netlist = as_netlist(circuit, inputs)
+    fn = compile_source(nl.structural_hash(), lambda: generate_source(nl), "circuit")
+    return CompiledCircuit(nl, fn)
@@ -0,0 +1,128 @@
+from typing import Optional
+import numpy as np
+
+from logic_circuits.simulation.netlist import (
+    Netlist, as_netlist,
+    OP_CONST0, OP_INPUT, OP_NOT, OP_AND,
+)
+from logic_circuits.simulation.optimize import optimize
+from logic_circuits.simulation.batch import unpack_vectors
+from logic_circuits.simulation.sat import solve, tseitin
+
+__all__ = [
+    "EquivalenceResult",
+    "miter",
+    "equivalent",
+]
+
+
+class EquivalenceResult:
+    """Outcome of equivalent(); truthy when the circuits are equivalent."""
+
+    def __init__(self, equivalent: bool, counterexample: Optional[np.ndarray], method: str):
+        self.equivalent = equivalent
+        self.counterexample = counterexample   # input vector on which the outputs differ
+        self.method = method                   # "structural", "simulation" or "sat"
+
+    def __bool__(self) -> bool:
+        return self.equivalent
+
+    def __repr__(self):
+        return (f"EquivalenceResult(equivalent={self.equivalent}, "
+                f"counterexample={self.counterexample}, method={self.method!r})")
+
+
+def miter(a: Netlist, b: Netlist) -> Netlist:
+    """Single-output netlist over the shared inputs of `a` and `b` that is 1
+    exactly when some output of `a` differs from the same output of `b`."""
+    a.check_combinational()
+    b.check_combinational()
+    if (a.num_in, a.num_out) != (b.num_in, b.num_out):
+        raise ValueError("Circuits have different numbers of inputs or outputs.")
+
+    op = [OP_CONST0] + [OP_INPUT] * a.num_in
+    fanin = [(-1, -1)] * (1 + a.num_in)
+    names = ["0"] + [a.names[n] for n in a.inputs.tolist()]
+
+    def copy(nl: Netlist, prefix: str) -> np.ndarray:
+        m = np.zeros(nl.num_nodes, dtype=np.int64)
+        m[nl.inputs] = np.arange(1, 1 + nl.num_in)
+        body = np.flatnonzero((nl.op != OP_CONST0) & (nl.op != OP_INPUT))
+        m[body] = np.arange(len(op), len(op) + len(body))
+        for n in body.tolist():
+            f0, f1 = nl.fanin[n].tolist()
+            op.append(int(nl.op[n]))
+            fanin.append((int(m[f0]) if f0 >= 0 else -1, int(m[f1]) if f1 >= 0 else -1))
+            names.append(prefix + nl.names[n])
+        return m[nl.outputs]
+
+    def add(o: int, x: int, y: int = -1) -> int:
+        op.append(o); fanin.append((x, y)); names.append(f"miter{len(op)}")
+        return len(op) - 1
+
+    def nand(x: int, y: int) -> int:
+        return add(OP_NOT, add(OP_AND, x, y))
+
+    outs_a, outs_b = copy(a, "a."), copy(b, "b.")
+    same = []
+    for x, y in zip(outs_a.tolist(), outs_b.tolist()):
+        xor = nand(nand(x, add(OP_NOT, y)), nand(add(OP_NOT, x), y))
+        same.append(add(OP_NOT, xor))
+    all_same = same[0] if same else add(OP_NOT, 0)
+    for s in same[1:]:
+        all_same = add(OP_AND, all_same, s)
+    out = add(OP_NOT, all_same)
+
+    return Netlist(
+        op=np.array(op, dtype=np.int8),
+        fanin=np.array(fanin, dtype=np.int64).reshape(-1, 2),
+        inputs=np.arange(1, 1 + a.num_in, dtype=np.int64),
+        outputs=np.array([out], dtype=np.int64),
+        names=names,
+        gate_nodes={},
+        sysins=a.sysins,
+    )
+
+
+def equivalent(
+    circuit_a,
+    circuit_b,
+    inputs_a=None,
+    inputs_b=None,
+    sim_words: int = 1024,
+    seed: Optional[int] = None,
+    max_conflicts: Optional[int] = None,
+) -> EquivalenceResult:
+    """Combinational equivalence check without enumerating 2^n inputs.
+
+    Builds a miter of the two circuits and optimizes it (structurally equal
+    logic collapses to constant 0). Then `sim_words` * 64 random input vectors
+    are simulated bit-parallel to find a counterexample quickly. Only if none
+    is found does the built-in CDCL SAT solver prove or refute equivalence.
+    """
+    nl_a: Netlist = as_netlist(circuit_a, inputs_a)
+    nl_b: Netlist = as_netlist(circuit_b, inputs_b)
+    m, _ = optimize(miter(nl_a, nl_b))
+    out = int(m.outputs[0])
+    if m.op[out] == OP_CONST0:
+        return EquivalenceResult(True, None, "structural")
+
+    # random bit-parallel simulation
+    rng = np.random.default_rng(seed)
+    if m.num_in and sim_words:
+        pats = rng.integers(0, 1 << 64, size=(m.num_in, sim_words), dtype=np.uint64)
+        diff = m.evaluate(pats)[0]
+        hits = np.flatnonzero(diff)
+        if len(hits):
+            w = int(hits[0])
+            bits = unpack_vectors(pats[:, w:w + 1], 64)
+            lane = int(np.flatnonzero(unpack_vectors(diff[None, w:w + 1], 64)[0])[0])
+            return EquivalenceResult(False, bits[:, lane], "simulation")
+
+    # SAT on the miter output
+    clauses = tseitin(m) + [[out + 1]]
+    model = solve(m.num_nodes, clauses, max_conflicts=max_conflicts)
+    if model is None:
+        return EquivalenceResult(True, None, "sat")
+    cex = np.array([model[n + 1] for n in m.inputs.tolist()], dtype=bool)
+    return EquivalenceResult(False, cex, "sat")
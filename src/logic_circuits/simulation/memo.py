@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from typing import Optional, Sequence
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, compile_circuit
+from logic_circuits.simulation.bitparallel import truth_table
+
+__all__ = [
+    "TABLE_MAX_INPUTS",
+    "CompositeMemo",
+]
+
+# composites with at most this many input bits get a full lookup table by default
+TABLE_MAX_INPUTS = 16
+
+
+class CompositeMemo:
+    """Output cache of one composite gate class, shared by all its instances.
+
+    The composite's end gates are compiled once into a template netlist.
+    Outputs are cached by the packed input bits, keeping the `maxsize` most
+    recently used entries, or, with `table` (default for at most
+    TABLE_MAX_INPUTS inputs), the whole truth table is computed up front and
+    every evaluation is a single row lookup. Compiled netlists call
+    evaluate_bits() for batches and lookup() when propagating one change.
+    """
+
+    def __init__(self, end_gates: Sequence[object], maxsize: int = 1024, table: Optional[bool] = None):
+        self.netlist: Netlist = compile_circuit(list(end_gates))
+        self.netlist.check_combinational()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._pad = -self.netlist.num_in % 8
+
+        if table is None:
+            table = self.netlist.num_in <= TABLE_MAX_INPUTS
+        self.table: Optional[np.ndarray] = None
+        if table:
+            # (2**num_in, num_out), row index = input bits with input 0 as MSB
+            self.table = truth_table(self.netlist).output_rows()
+
+    def _bits(self, inputs: np.ndarray) -> np.ndarray:
+        """Input bits in template order, unwired template inputs read as 0."""
+        bits = np.asarray(inputs, dtype=bool).reshape(-1)
+        n = self.netlist.num_in
+        if bits.size != n:
+            bits = np.concatenate([bits[:n], np.zeros(max(0, n - bits.size), dtype=bool)])
+        return bits
+
+    def key(self, inputs: np.ndarray) -> int:
+        """Packed input bits (input 0 is the most significant), the table row."""
+        packed = np.packbits(self._bits(inputs)).tobytes()
+        return int.from_bytes(packed, "big") >> self._pad
+
+    def lookup(self, inputs: np.ndarray) -> np.ndarray:
+        """Output bits of the composite for `inputs` (its input ports, row-major)."""
+        k = self.key(inputs)
+        if self.table is not None:
+            self.hits += 1
+            return self.table[k].copy()
+
+        out = self._cache.get(k)
+        if out is not None:
+            self.hits += 1
+            self._cache.move_to_end(k)
+            return out.copy()
+
+        self.misses += 1
+        out = self.netlist.evaluate(self._bits(inputs))
+        self._cache[k] = out
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return out.copy()
+
+    def evaluate_bits(self, bits: np.ndarray) -> np.ndarray:
+        """Outputs (num_out, N) for the N input vectors in the columns of
+        `bits` (k, N); every vector counts as one lookup."""
+        bits = np.asarray(bits, dtype=bool)
+        n = bits.shape[1]
+        if n == 0:
+            return np.zeros((self.netlist.num_out, 0), dtype=bool)
+        if self.table is not None:
+            key = np.zeros(n, dtype=np.int64)
+            for row in self._bits_rows(bits):
+                key = (key << 1) | row
+            self.hits += n
+            return self.table[key].T
+
+        # one cache lookup per distinct vector, the repeats are hits
+        _, first, inverse = np.unique(np.packbits(bits, axis=0), axis=1, return_index=True, return_inverse=True)
+        out = np.stack([self.lookup(bits[:, j]) for j in first.tolist()], axis=1)
+        self.hits += n - len(first)
+        return out[:, inverse.reshape(-1)]
+
+    def _bits_rows(self, bits: np.ndarray) -> np.ndarray:
+        """(num_in, N) input rows, unwired template inputs read as 0."""
+        n = self.netlist.num_in
+        if len(bits) != n:
+            pad = np.zeros((max(0, n - len(bits)), bits.shape[1]), dtype=bool)
+            bits = np.concatenate([bits[:n], pad])
+        return bits.astype(np.int64)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache) if self.table is None else len(self.table),
+            "maxsize": self.maxsize,
+            "table": self.table is not None,
+        }
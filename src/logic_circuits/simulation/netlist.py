@@ -0,0 +1,891 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import hashlib
+import heapq
+import numpy as np
+
+import logic_circuits.gates.gates as gates
+
+__all__ = [
+    "OP_CONST0",
+    "OP_INPUT",
+    "OP_BUF",
+    "OP_NOT",
+    "OP_AND",
+    "OP_STATE",
+    "Netlist",
+    "compile_circuit",
+    "compile_connections",
+    "as_netlist",
+    "connected_gates",
+]
+
+# node opcodes
+OP_CONST0 = 0
+OP_INPUT = 1
+OP_BUF = 2
+OP_NOT = 3
+OP_AND = 4
+OP_STATE = 5    # register output, a pseudo-input updated on every clock
+
+OP_NAMES = {
+    OP_CONST0: "CONST0",
+    OP_INPUT: "INPUT",
+    OP_BUF: "BUF",
+    OP_NOT: "NOT",
+    OP_AND: "AND",
+    OP_STATE: "STATE",
+}
+
+# extra nodes of the AND/NOT multiplexer behind an enabled DFF or a latch
+_MUX_NODES = 7
+
+# schedule entry evaluating a memoized composite: (_OP_MACRO, macro index, None, None)
+_OP_MACRO = -1
+
+# memoized composite: (CompositeMemo, input nodes, output nodes)
+Macro = Tuple[object, np.ndarray, np.ndarray]
+
+# driver map: to_gate -> {to_port: (from_gate, from_port)}
+Drivers = Dict[object, Dict[int, Tuple[object, int]]]
+
+
+class Netlist:
+    """Flat, levelized single-bit netlist compiled from a gate graph.
+
+    Every gate output port becomes one node. Nodes are evaluated level by
+    level, each level with one vectorized op per opcode, so every gate is
+    evaluated exactly once per input vector.
+
+    Instances of memoized composite classes are inlined like any other,
+    but also recorded in `macros`: the value engines (evaluate_nodes,
+    sync, clock) compute their outputs with the class's CompositeMemo and
+    skip the inlined copy (`macro_body`, left at 0). Structural engines
+    (codegen, SAT, BDD, optimize, storage) only see the primitives.
+
+    `scopes` lists (instance path, start, stop) for the node range of every
+    inlined composite, nested instances after the one containing them.
+    """
+
+    # set by utils.profiling.GateProfiler while enabled: receives every
+    # node evaluation of evaluate_nodes() and _propagate()
+    _tracer = None
+
+    def __init__(
+        self,
+        op: np.ndarray,
+        fanin: np.ndarray,
+        inputs: np.ndarray,
+        outputs: np.ndarray,
+        names: List[str],
+        gate_nodes: Dict[object, range],
+        sysins: List[object],
+        state_nodes: Optional[np.ndarray] = None,
+        state_next: Optional[np.ndarray] = None,
+        state_init: Optional[np.ndarray] = None,
+        state_enable: Optional[np.ndarray] = None,
+        levels: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+        macros: Optional[List[Macro]] = None,
+        macro_body: Optional[np.ndarray] = None,
+        scopes: Optional[List[Tuple[str, int, int]]] = None,
+    ):
+        self.op = op                # (n_nodes,) int8
+        self.fanin = fanin          # (n_nodes, 2) int64, -1 if unused
+        self.inputs = inputs        # node ids of the primary inputs
+        self.outputs = outputs      # node ids of the circuit outputs
+        self.names = names
+        self.gate_nodes = gate_nodes
+        self.sysins = sysins
+
+        # registers: node holding the state, node computing its next value,
+        # the gate output node its initial value is taken from, and for a
+        # latch the EN node that makes it transparent (-1 for a flip-flop)
+        empty = np.zeros(0, dtype=np.int64)
+        self.state_nodes = empty if state_nodes is None else state_nodes
+        self.state_next = empty if state_next is None else state_next
+        self.state_init = self.state_nodes if state_init is None else state_init
+        if state_enable is None:
+            state_enable = np.full(len(self.state_nodes), -1, dtype=np.int64)
+        self.state_enable = state_enable
+
+        # (level, fanout_ptr, fanout) may be passed in precomputed, e.g. by load_netlist()
+        if levels is None:
+            levels = _levelize(op, fanin, names)
+        self.level, self.fanout_ptr, self.fanout = levels
+        self._sched = None
+
+        self.scopes: List[Tuple[str, int, int]] = scopes or []
+        self.macros: List[Macro] = macros or []
+        self.macro_body = empty if macro_body is None else macro_body
+        self._macro_op = self._macro_levels = None
+        if self.macros:
+            try:
+                self._macro_op, self._macro_levels = _macro_graph(op, fanin, self.macros, self.macro_body)
+            except ValueError:
+                # an instance output feeds back into its own inputs: only
+                # the inlined copy can evaluate that
+                self.macros, self.macro_body = [], empty
+        # set by GateBase when the wiring of one of the bound gates changes
+        self.stale = False
+
+        # contiguous value of every node; gates read it after bind()
+        self.values = np.zeros(len(op), dtype=bool)
+
+        # event-driven state, see sync()
+        self._values: Optional[List[bool]] = None
+        self._in_values: Optional[np.ndarray] = None
+        self._lists = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.op)
+
+    @property
+    def num_in(self) -> int:
+        return len(self.inputs)
+
+    @property
+    def num_out(self) -> int:
+        return len(self.outputs)
+
+    @property
+    def num_state(self) -> int:
+        return len(self.state_nodes)
+
+    @property
+    def depth(self) -> int:
+        return int(self.level.max()) if self.num_nodes else 0
+
+    @property
+    def _schedule(self):
+        if self._sched is None:
+            if self.macros:
+                level = self._macro_levels[0]
+                at = [(int(level[outs].min()), k) for k, (_, _, outs) in enumerate(self.macros)]
+                self._sched = _make_schedule(self._macro_op, self.fanin, level, at)
+            else:
+                self._sched = _make_schedule(self.op, self.fanin, self.level)
+        return self._sched
+
+    def check_combinational(self) -> None:
+        if self.num_state:
+            raise ValueError("Operation only supports combinational circuits (found registers).")
+
+    def structural_hash(self) -> str:
+        """Digest of the node ops and wiring (names are ignored)."""
+        h = hashlib.sha1()
+        h.update(np.ascontiguousarray(self.op, dtype=np.int8).tobytes())
+        for arr in (self.fanin, self.inputs, self.outputs, self.state_nodes, self.state_next):
+            h.update(b"|")
+            h.update(np.ascontiguousarray(arr, dtype=np.int64).tobytes())
+        return h.hexdigest()
+
+    def read_inputs(self) -> np.ndarray:
+        """Current port values of the SysIN gates driving this netlist."""
+        if not self.sysins:
+            return np.zeros(0, dtype=bool)
+        return np.concatenate([s._values for s in self.sysins])
+
+    def bind(self) -> None:
+        """Move the output storage of every gate onto `values`, so the gate
+        ports become views of this netlist's node buffer."""
+        for g, nodes in self.gate_nodes.items():
+            g._bind(self.values, nodes.start)
+        self.values[self.state_nodes] = self.values[self.state_init]
+
+    def evaluate_nodes(self, inputs: np.ndarray, state: Optional[np.ndarray] = None) -> np.ndarray:
+        """Values of all nodes, shape (n_nodes, *inputs.shape[1:]).
+
+        `inputs` has shape (num_in, ...) and may be bool (one vector or a batch
+        along the trailing axes) or an unsigned integer type (bit-parallel words).
+        `state` holds the register values in the same layout (default all 0).
+        Nodes inside memoized composite instances are not evaluated (0).
+        """
+        inputs = np.asarray(inputs)
+        if inputs.shape[:1] != (self.num_in,):
+            raise ValueError(f"Expected {self.num_in} inputs, got shape {inputs.shape}")
+
+        vals = np.zeros((self.num_nodes,) + inputs.shape[1:], dtype=inputs.dtype)
+        vals[self.inputs] = inputs
+        if state is not None:
+            vals[self.state_nodes] = state
+        trace = Netlist._tracer
+        if trace is not None:
+            trace.begin(self)
+        for op, out, a, b in self._schedule:
+            if op == _OP_MACRO:
+                memo, ins, outs = self.macros[out]
+                vals[outs] = _macro_values(memo, vals[ins])
+                if trace is not None:
+                    trace.macro_group(self, outs, vals[ins])
+                continue
+            elif op == OP_AND:
+                vals[out] = vals[a] & vals[b]
+            elif op == OP_NOT:
+                vals[out] = ~vals[a]
+            else:
+                vals[out] = vals[a]
+            if trace is not None:
+                trace.group(self, out, vals[a], vals[b] if op == OP_AND else None)
+        return vals
+
+    def evaluate(self, inputs: np.ndarray) -> np.ndarray:
+        """Output values, shape (num_out, *inputs.shape[1:])."""
+        return self.evaluate_nodes(inputs)[self.outputs]
+
+    def run(self, write_back: bool = True) -> np.ndarray:
+        """Evaluate on the current SysIN values and optionally store the
+        results in `values` (and so in the ports of the bound gates)."""
+        inputs = self.read_inputs()
+        vals = self.evaluate_nodes(inputs, self.values[self.state_nodes])
+        if write_back:
+            self.values[:] = vals
+            self._values = vals.tolist()
+            self._in_values = inputs
+            self._write_back(self._follow_latches())
+        return vals[self.outputs]
+
+    def sync(self) -> List[int]:
+        """Bring the gate ports up to date with the current SysIN values.
+
+        The first call evaluates everything; afterwards only the fan-out cone
+        of the inputs that changed since the last call is re-evaluated, and
+        propagation stops at every node whose value did not change. Returns
+        the ids of the nodes that changed.
+        """
+        inputs = self.read_inputs()
+        if self._values is None:
+            self.run()
+            return list(range(self.num_nodes))
+
+        changed_in = np.flatnonzero(inputs != self._in_values)
+        if len(changed_in) == 0:
+            return []
+        self._in_values = inputs
+
+        vals = self._values
+        seeds = []
+        for i in changed_in.tolist():
+            n = int(self.inputs[i])
+            vals[n] = bool(inputs[i])
+            seeds.append(n)
+        changed = self._propagate(seeds)
+        changed += self._follow_latches()
+        self._write_back(changed)
+        return changed
+
+    def clock(self) -> List[int]:
+        """Clock edge: load every register with its next value and propagate
+        the changes event-driven. Returns the ids of the nodes that changed."""
+        self.sync()
+        vals = self._values
+        nxt = [vals[n] for n in self.state_next.tolist()]
+        seeds = []
+        for n, v in zip(self.state_nodes.tolist(), nxt):
+            if vals[n] != v:
+                vals[n] = v
+                seeds.append(n)
+        changed = self._propagate(seeds)
+        self._write_back(changed)
+        return changed
+
+    def _follow_latches(self) -> List[int]:
+        """Load every latch whose EN is set with its output, so it keeps that
+        value once EN drops (a flip-flop only loads on clock()). Returns the
+        ids of the nodes that changed."""
+        vals = self._values
+        seeds = []
+        for n, q, en in zip(self.state_nodes.tolist(), self.state_next.tolist(), self.state_enable.tolist()):
+            if en >= 0 and vals[en] and vals[n] != vals[q]:
+                vals[n] = vals[q]
+                seeds.append(n)
+        return self._propagate(seeds) if seeds else []
+
+    def _propagate(self, seeds: List[int]) -> List[int]:
+        if self._lists is None:
+            op, (level, fo_ptr, fo) = self.op, (self.level, self.fanout_ptr, self.fanout)
+            if self.macros:
+                op, (level, fo_ptr, fo) = self._macro_op, self._macro_levels
+            macro_at = {n: k for k, (_, _, outs) in enumerate(self.macros) for n in outs.tolist()}
+            self._lists = (
+                op.tolist(), self.fanin[:, 0].tolist(), self.fanin[:, 1].tolist(),
+                level.tolist(), fo_ptr.tolist(), fo.tolist(), macro_at,
+            )
+        op, fa, fb, level, fo_ptr, fo, macro_at = self._lists
+        vals = self._values
+        done = set()
+        trace = Netlist._tracer
+        if trace is not None:
+            trace.begin(self)
+
+        heap: List[Tuple[int, int]] = []
+        queued = set()
+
+        def schedule(n: int):
+            for j in fo[fo_ptr[n]:fo_ptr[n + 1]]:
+                if j not in queued:
+                    queued.add(j)
+                    heapq.heappush(heap, (level[j], j))
+
+        for n in seeds:
+            schedule(n)
+
+        changed = list(seeds)
+        while heap:
+            _, j = heapq.heappop(heap)
+            queued.discard(j)
+            k = macro_at.get(j)
+            if k is not None:
+                # the lowest output of a macro comes after all its inputs:
+                # one lookup sets every output
+                if k not in done:
+                    done.add(k)
+                    memo, ins, outs = self.macros[k]
+                    x = [vals[i] for i in ins.tolist()]
+                    res = memo.lookup(np.array(x, dtype=bool))
+                    if trace is not None:
+                        trace.node(self, j, tuple(x))
+                    for n, v in zip(outs.tolist(), res.tolist()):
+                        if v != vals[n]:
+                            vals[n] = v
+                            changed.append(n)
+                            schedule(n)
+                continue
+            o = op[j]
+            if o == OP_AND:
+                v = vals[fa[j]] and vals[fb[j]]
+            elif o == OP_NOT:
+                v = not vals[fa[j]]
+            else:
+                v = vals[fa[j]]
+            if trace is not None:
+                trace.node(self, j, (vals[fa[j]], vals[fb[j]]) if o == OP_AND else vals[fa[j]])
+            if v != vals[j]:
+                vals[j] = v
+                changed.append(j)
+                schedule(j)
+        return changed
+
+    def _write_back(self, nodes) -> None:
+        vals = self._values
+        nodes = list(nodes)
+        self.values[nodes] = [vals[n] for n in nodes]
+
+    def __getstate__(self):
+        # drop the gate objects so the netlist can be sent to worker processes
+        state = self.__dict__.copy()
+        state.update(gate_nodes={}, sysins=[], _values=None, _in_values=None, _lists=None)
+        return state
+
+    def to_gates(self, name: str = "Netlist"):
+        """Rebuild the netlist as gate objects.
+
+        Returns (composite, sysin): a make_combined_gate_class instance whose
+        end gate is a SysOUT, driven by a fresh SysIN.
+        """
+        self.check_combinational()
+        sysin = gates.SysIN(num_in=max(1, self.num_in), num_out=max(1, self.num_in))
+        sysout = gates.SysOUT(num_in=max(1, self.num_out), num_out=max(1, self.num_out))
+        src = {int(n): (sysin, k) for k, n in enumerate(self.inputs)}
+        connections = []
+        for n in np.argsort(self.level, kind="stable").tolist():
+            o = int(self.op[n])
+            if o == OP_AND:
+                g = gates.GateAND(self.names[n])
+            elif o == OP_NOT:
+                g = gates.GateNOT(self.names[n])
+            elif o == OP_BUF:
+                g = gates.GatePASS(self.names[n])
+            else:
+                continue
+            for k, f in enumerate(self.fanin[n][:g.num_in].tolist()):
+                if f in src:
+                    connections.append((src[f][0], g, src[f][1], k))
+            src[n] = (g, 0)
+        for k, n in enumerate(self.outputs.tolist()):
+            if n in src:
+                connections.append((src[n][0], sysout, src[n][1], k))
+
+        composite = gates.make_combined_gate_class(
+            name, connections=connections, end_gates=[sysout],
+            num_in=sysin.num_out, num_out=sysout.num_out,
+        )(name)
+        return composite, sysin
+
+    def __repr__(self):
+        return (f"Netlist(nodes={self.num_nodes}, in={self.num_in}, "
+                f"out={self.num_out}, depth={self.depth})")
+
+
+def _levelize(op: np.ndarray, fanin: np.ndarray, names: Optional[List[str]] = None,
+              extra: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+    """Kahn topological sort; returns the logic level of every node and the
+    fan-out adjacency in CSR form (fanout_ptr, fanout). Registers (OP_STATE)
+    have no fan-in, so only loops without a register in them are rejected.
+    `extra` adds (from, to) edges besides the fan-ins."""
+    n = len(op)
+    level = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return level, np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    edges_to = np.concatenate([np.arange(n), np.arange(n)])
+    edges_from = np.concatenate([fanin[:, 0], fanin[:, 1]])
+    if extra is not None:
+        edges_from = np.concatenate([edges_from, extra[0]])
+        edges_to = np.concatenate([edges_to, extra[1]])
+    used = edges_from >= 0
+    edges_to, edges_from = edges_to[used], edges_from[used]
+
+    indeg = np.bincount(edges_to, minlength=n)
+    order = np.argsort(edges_from, kind="stable")
+    fanout_ptr = np.concatenate([[0], np.cumsum(np.bincount(edges_from, minlength=n))])
+    fanout_arr = edges_to[order]
+    fanout_ptr_arr = fanout_ptr
+
+    indeg = indeg.tolist()
+    fanout_ptr = fanout_ptr.tolist()
+    fanout = fanout_arr.tolist()
+    lvl = [0] * n
+
+    stack = [i for i in range(n) if indeg[i] == 0]
+    seen = 0
+    while stack:
+        i = stack.pop()
+        seen += 1
+        li = lvl[i] + 1
+        for j in fanout[fanout_ptr[i]:fanout_ptr[i + 1]]:
+            if lvl[j] < li:
+                lvl[j] = li
+            indeg[j] -= 1
+            if indeg[j] == 0:
+                stack.append(j)
+
+    if seen != n:
+        loop = _find_loop(fanin, indeg)
+        if names is not None:
+            loop = [names[i] for i in loop]
+        raise ValueError(f"Circuit contains a combinational loop: {' -> '.join(map(str, loop))}")
+    level[:] = lvl
+    return level, fanout_ptr_arr, fanout_arr
+
+
+def _find_loop(fanin: np.ndarray, indeg: List[int]) -> List[int]:
+    """One cycle among the nodes Kahn's algorithm could not order. Every such
+    node has an unordered fan-in, so walking those fan-ins must revisit a node."""
+    fa, fb = fanin[:, 0].tolist(), fanin[:, 1].tolist()
+    n = next(i for i, d in enumerate(indeg) if d > 0)
+    path: List[int] = []
+    pos: Dict[int, int] = {}
+    while n not in pos:
+        pos[n] = len(path)
+        path.append(n)
+        n = fa[n] if fa[n] >= 0 and indeg[fa[n]] > 0 else fb[n]
+    loop = path[pos[n]:][::-1]      # walked against the signal direction
+    return loop + loop[:1]
+
+
+def _make_schedule(op: np.ndarray, fanin: np.ndarray, level: np.ndarray, macros=()):
+    """(op, out, a, b) per level and opcode; `macros` are (level, index) of
+    memoized composites, evaluated before the primitives of their level."""
+    schedule = []
+    pending = sorted(macros)
+    evaluated = (op == OP_AND) | (op == OP_NOT) | (op == OP_BUF)
+    nodes = np.flatnonzero(evaluated)
+    nodes = nodes[np.lexsort((op[nodes], level[nodes]))]
+
+    if len(nodes):
+        key = level[nodes] * 8 + op[nodes]
+        bounds = [0] + (np.flatnonzero(np.diff(key)) + 1).tolist() + [len(nodes)]
+        ops = op[nodes].tolist()
+        lvl = level[nodes].tolist()
+        a, b = fanin[nodes, 0], fanin[nodes, 1]
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            while pending and pending[0][0] <= lvl[lo]:
+                schedule.append((_OP_MACRO, pending.pop(0)[1], None, None))
+            schedule.append((ops[lo], nodes[lo:hi], a[lo:hi], b[lo:hi]))
+    schedule.extend((_OP_MACRO, k, None, None) for _, k in pending)
+    return schedule
+
+
+def _macro_graph(op: np.ndarray, fanin: np.ndarray, macros: List[Macro], body: np.ndarray):
+    """Opcodes and levels of the netlist as the value engines see it: the
+    bodies of memoized instances are dropped and each instance output
+    depends on all of the instance's inputs instead."""
+    op = op.copy()
+    fanin = fanin.copy()
+    outs = np.concatenate([o for _, _, o in macros])
+    op[body] = OP_CONST0
+    op[outs] = OP_CONST0
+    fanin[body] = -1
+    fanin[outs] = -1
+    src = np.concatenate([np.repeat(i, len(o)) for _, i, o in macros]).astype(np.int64)
+    dst = np.concatenate([np.tile(o, len(i)) for _, i, o in macros]).astype(np.int64)
+    return op, _levelize(op, fanin, None, (src, dst))
+
+
+def _macro_values(memo, x: np.ndarray) -> np.ndarray:
+    """Outputs of a memoized composite for input values `x` of shape (k, ...)
+    in any evaluate_nodes() layout (bools or bit-parallel words)."""
+    shape = x.shape[1:]
+    flat = x.reshape(len(x), -1)
+    if x.dtype == bool:
+        return memo.evaluate_bits(flat).reshape((-1,) + shape)
+    # one column per bit of every word, packed back afterwards
+    words = np.ascontiguousarray(flat, dtype=x.dtype.newbyteorder("<"))
+    bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little").astype(bool)
+    out = np.ascontiguousarray(np.packbits(memo.evaluate_bits(bits), axis=1, bitorder="little"))
+    return out.view(words.dtype).astype(x.dtype).reshape((-1,) + shape)
+
+
+def _drivers_from_gates(gate_list) -> Drivers:
+    drivers: Drivers = {}
+    for g in gate_list:
+        d = drivers.setdefault(g, {})
+        for from_gate, from_port, to_port in zip(g.from_gate, g.from_port, g.to_port):
+            d[int(to_port)] = (from_gate, int(from_port))
+    return drivers
+
+
+def _is_composite(g) -> bool:
+    return getattr(g, "end_gates", None) is not None
+
+
+def _memo_of(g):
+    """The CompositeMemo of a memoized composite's class, else None."""
+    get = getattr(type(g), "_get_memo", None)
+    return get() if get is not None else None
+
+
+_KIND_CACHE: Dict[type, str] = {}
+
+
+def _kind(g) -> str:
+    """Primitive kind of a gate, cached per class (isinstance on the
+    Protocol-derived GateBase is slow)."""
+    if _is_composite(g):
+        return "COMPOSITE"
+    cls = type(g)
+    kind = _KIND_CACHE.get(cls)
+    if kind is None:
+        if issubclass(cls, gates.SysIN):
+            kind = "SYSIN"
+        elif issubclass(cls, gates.GateDFF):
+            kind = "DFF"
+        elif issubclass(cls, gates.GateLATCH):
+            kind = "LATCH"
+        elif issubclass(cls, gates.GateAND):
+            kind = "AND"
+        elif issubclass(cls, gates.GateNOT):
+            kind = "NOT"
+        elif issubclass(cls, gates.GatePASS):
+            kind = "PASS"
+        else:
+            raise TypeError(f"Cannot compile gate of type {cls.__name__}.")
+        _KIND_CACHE[cls] = kind
+    return kind
+
+
+def _is_inlined(g, drivers: Optional[Drivers]) -> bool:
+    """A composite with wired inputs is an instance inside a larger design and
+    gets inlined; an unwired one just exposes its end gates."""
+    if drivers is None:
+        return len(g.from_gate) > 0
+    return bool(drivers.get(g))
+
+
+def _upstream(g, drivers: Drivers) -> List[object]:
+    kind = _kind(g)
+    if kind == "SYSIN":
+        return []
+    if kind == "COMPOSITE" and not _is_inlined(g, drivers):
+        return list(g.end_gates)
+    if drivers is None:
+        return list(g.from_gate)
+    return [src for src, _ in drivers.get(g, {}).values()]
+
+
+def _as_list(x) -> list:
+    if x is None:
+        return []
+    if isinstance(x, (list, tuple)):
+        return list(x)
+    return [x]
+
+
+def _build(
+    out_gates: Sequence[object],
+    drivers: Optional[Drivers],
+    inputs: Optional[Sequence[object]],
+    templates: Optional[Dict[type, Netlist]] = None,
+) -> Netlist:
+    # discover the cone of every output gate (iterative, no recursion limit)
+    order: List[object] = []
+    seen = set()
+    stack = list(reversed(out_gates)) + list(reversed(_as_list(inputs)))
+    while stack:
+        g = stack.pop()
+        if id(g) in seen:
+            continue
+        seen.add(id(g))
+        order.append(g)
+        stack.extend(reversed(_upstream(g, drivers)))
+
+    inlined = [g for g in order if _kind(g) == "COMPOSITE" and _is_inlined(g, drivers)]
+    inlined_ids = {id(g) for g in inlined}
+    if drivers is None:
+        drivers = _drivers_from_gates(order)
+
+    sysins = _as_list(inputs) or [g for g in order if _kind(g) == "SYSIN"]
+    sysin_ids = {id(s) for s in sysins}
+    for g in order:
+        if _kind(g) == "SYSIN" and id(g) not in sysin_ids:
+            raise ValueError(f"SysIN {g.name!r} drives the circuit but is not an input.")
+
+    # allocate one node per output bit (a bus port has `width` of them),
+    # node 0 is the constant False
+    op: List[int] = [OP_CONST0]
+    names: List[str] = ["0"]
+    gate_nodes: Dict[object, range] = {}
+    for g in order:
+        start = len(op)
+        if g.width == 1:
+            names.extend(f"{g.name}[{k}]" for k in range(g.num_out))
+        else:
+            names.extend(f"{g.name}[{k}][{b}]" for k in range(g.num_out) for b in range(g.width))
+        op.extend([OP_BUF] * (g.num_out * g.width))
+        gate_nodes[g] = range(start, len(op))
+
+    # registers: a DFF output is a state node; enables and latches need a mux
+    # (and a latch its own state node), built from extra nodes behind the ports
+    extra: Dict[object, int] = {}
+    for g in order:
+        kind = _kind(g)
+        if kind == "LATCH" or (kind == "DFF" and g.num_in == 2):
+            extra[g] = len(op)
+            for k in range(_MUX_NODES + (kind == "LATCH")):
+                names.append(f"{g.name}.r{k}")
+                op.append(OP_BUF)
+
+    fanin = np.full((len(op), 2), -1, dtype=np.int64)
+    state_nodes: List[int] = []
+    state_next: List[int] = []
+    state_init: List[int] = []
+    state_enable: List[int] = []
+    reset: List[Tuple[int, bool]] = []     # (output node, init value) of every register
+    macros: List[Macro] = []
+    macro_body: List[np.ndarray] = []
+    scopes: List[Tuple[str, int, int]] = []
+
+    def mux(base: int, sel: int, a: int, b: int) -> int:
+        """sel ? a : b as NOT(NOT(sel AND a) AND NOT(NOT sel AND b)) in the
+        nodes base..base + _MUX_NODES - 1; returns the output node."""
+        nodes = [(OP_AND, sel, a), (OP_NOT, sel, -1), (OP_AND, base + 1, b),
+                 (OP_NOT, base, -1), (OP_NOT, base + 2, -1), (OP_AND, base + 3, base + 4),
+                 (OP_NOT, base + 5, -1)]
+        for k, (o, x, y) in enumerate(nodes):
+            op[base + k] = o
+            fanin[base + k] = (x, y)
+        return base + len(nodes) - 1
+
+    def src_node(g, port: int, bit: int = 0) -> int:
+        d = drivers.get(g, {})
+        if port not in d:
+            return 0
+        src, from_port = d[port]
+        return int(gate_nodes[src][from_port * src.width + bit])
+
+    for g in order:
+        nodes = gate_nodes[g]
+        kind = _kind(g)
+        if kind == "SYSIN":
+            for n in nodes:
+                op[n] = OP_INPUT
+        elif kind == "COMPOSITE":
+            if id(g) in inlined_ids:
+                continue
+            ends = np.concatenate([gate_nodes[eg] for eg in g.end_gates])
+            for n, e in zip(nodes, ends):
+                fanin[n, 0] = e
+            memo = _memo_of(g)
+            if memo is not None and all(s in gate_nodes for s in memo.netlist.sysins):
+                # unwired: the memo reads the inner SysIN(s) directly
+                ins = [gate_nodes[s] for s in memo.netlist.sysins]
+                macros.append((memo, np.concatenate(ins or [[]]).astype(np.int64), np.array(nodes)))
+        elif kind == "AND":
+            for b, n in enumerate(nodes):
+                op[n] = OP_AND
+                fanin[n] = (src_node(g, 0, b), src_node(g, 1, b))
+        elif kind == "NOT":
+            for b, n in enumerate(nodes):
+                op[n] = OP_NOT
+                fanin[n, 0] = src_node(g, 0, b)
+        elif kind == "DFF":
+            q = nodes[0]
+            op[q] = OP_STATE
+            nxt = src_node(g, 0)
+            if g.num_in == 2:
+                nxt = mux(extra[g], src_node(g, 1), nxt, q)
+            state_nodes.append(q); state_next.append(nxt); state_init.append(q); state_enable.append(-1)
+            reset.append((q, bool(g.init)))
+        elif kind == "LATCH":
+            q, held = nodes[0], extra[g] + _MUX_NODES
+            op[held] = OP_STATE
+            fanin[q, 0] = mux(extra[g], src_node(g, 1), src_node(g, 0), held)
+            state_nodes.append(held); state_next.append(q); state_init.append(q)
+            state_enable.append(src_node(g, 1))
+            reset.append((q, bool(g.init)))
+        else:
+            w = g.width
+            for i, n in enumerate(nodes):
+                fanin[n, 0] = src_node(g, i // w, i % w) if i < g.num_in * w else 0
+
+    op = np.array(op, dtype=np.int8)
+    state = [np.array(x, dtype=np.int64) for x in (state_nodes, state_next, state_init, state_enable)]
+    if inlined:
+        templates = {} if templates is None else templates
+        op, fanin, state = _inline(inlined, op, fanin, names, gate_nodes, src_node, templates, state, reset,
+                                   macros, macro_body, scopes)
+    fanin[(op == OP_BUF) & (fanin[:, 0] < 0), 0] = 0
+
+    in_nodes = np.concatenate(
+        [gate_nodes[s] for s in sysins] or [np.zeros(0, dtype=np.int64)]
+    ).astype(np.int64)
+    out_nodes = np.concatenate(
+        [gate_nodes[g] for g in out_gates] or [np.zeros(0, dtype=np.int64)]
+    ).astype(np.int64)
+
+    nl = Netlist(
+        op=op,
+        fanin=fanin,
+        inputs=in_nodes,
+        outputs=out_nodes,
+        names=names,
+        gate_nodes=gate_nodes,
+        sysins=sysins,
+        state_nodes=state[0],
+        state_next=state[1],
+        state_init=state[2],
+        state_enable=state[3],
+        macros=macros,
+        macro_body=np.concatenate(macro_body).astype(np.int64) if macro_body else None,
+        scopes=scopes,
+    )
+    if reset:
+        q, init = zip(*reset)
+        nl.values[list(q)] = init
+        nl.values[nl.state_nodes] = nl.values[nl.state_init]
+    return nl
+
+
+def _inline(inlined, op, fanin, names, gate_nodes, src_node, templates, state, reset, macros, macro_body, scopes):
+    """Append a renamed copy of every inlined composite's primitive netlist.
+
+    Composite input k drives input k of the inner SysIN(s) and output k is
+    bound to output k of the inner end gates, so port order is preserved.
+    Registers inside the composite are renumbered and appended to `state`,
+    their init values to `reset`. Memoized instances are added to
+    `macros`, their copy to `macro_body`, and every copy's node range
+    (with those of the instances nested in it) to `scopes`.
+    """
+    ops, fanins, states = [op], [fanin], [state]
+    n_total = len(op)
+    for g in inlined:
+        memo = _memo_of(g)
+        t = memo.netlist if memo is not None else templates.get(type(g))
+        if t is None:
+            t = _build(list(g.end_gates), None, None, templates)
+            templates[type(g)] = t
+
+        body = np.flatnonzero((t.op != OP_CONST0) & (t.op != OP_INPUT))
+        m = np.zeros(t.num_nodes, dtype=np.int64)
+        w = g.width
+        m[t.inputs] = [src_node(g, k // w, k % w) for k in range(t.num_in)]
+        m[body] = np.arange(n_total, n_total + len(body))
+        scopes.append((g.name, n_total, n_total + len(body)))
+        # a nested range only holds body nodes, which map to a contiguous range
+        scopes.extend((f"{g.name}.{name}", int(m[a]), int(m[b - 1]) + 1) for name, a, b in t.scopes if b > a)
+        n_total += len(body)
+
+        t_fanin = t.fanin[body]
+        ops.append(t.op[body])
+        fanins.append(np.where(t_fanin >= 0, m[np.maximum(t_fanin, 0)], -1))
+        names.extend(f"{g.name}.{t.names[n]}" for n in body.tolist())
+        if t.num_state:
+            en = t.state_enable
+            states.append([m[t.state_nodes], m[t.state_next], m[t.state_init], np.where(en >= 0, m[np.maximum(en, 0)], -1)])
+            reset.extend(zip(m[t.state_init].tolist(), t.values[t.state_init].tolist()))
+
+        for n, e in zip(gate_nodes[g], m[t.outputs]):
+            fanin[n, 0] = e
+        if memo is not None:
+            macros.append((memo, m[t.inputs], np.array(gate_nodes[g])))
+            macro_body.append(m[body])
+        else:
+            macros.extend((mm, m[ins], m[outs]) for mm, ins, outs in t.macros)
+            macro_body.append(m[t.macro_body])
+    state = [np.concatenate([st[k] for st in states]) for k in range(4)]
+    return np.concatenate(ops), np.concatenate(fanins), state
+
+
+def compile_circuit(circuit, inputs=None) -> Netlist:
+    """Compile the wiring recorded on the gates into a levelized netlist.
+
+    `circuit` is a gate (e.g. a composite from make_combined_gate_class) or a
+    list of gates whose outputs are concatenated. `inputs` is the SysIN (or
+    list of SysINs) providing the primary inputs; by default every SysIN
+    found in the fan-in cone is used.
+
+    Composites whose inputs are wired are flattened recursively into their
+    AND/NOT/PASS primitives, with nets renamed "<instance>.<gate>[k]".
+    """
+    return _build(_as_list(circuit), None, inputs)
+
+
+def compile_connections(
+    connections,
+    end_gates: List[object],
+    inputs: Union[object, List[object], None] = None,
+) -> Netlist:
+    """Compile from a list of (from_gate, to_gate, from_port, to_port) tuples
+    (as built by the editor) instead of the wiring stored on the gates."""
+    drivers: Drivers = {}
+    for from_gate, to_gate, from_port, to_port in connections:
+        drivers.setdefault(to_gate, {})[int(to_port)] = (from_gate, int(from_port))
+    return _build(_as_list(end_gates), drivers, inputs)
+
+
+def as_netlist(circuit, inputs=None) -> Netlist:
+    """Return `circuit` if it already is a Netlist, compile it otherwise."""
+    if isinstance(circuit, Netlist):
+        return circuit
+    return compile_circuit(circuit, inputs)
+
+
+def _exposes(eg, f) -> bool:
+    """Whether the fan-out link eg -> f joins eg's circuit: every composite
+    instance is linked from its class's end gates, but only an unwired
+    one reads them; wired instances are inlined from a template copy."""
+    if not _is_composite(f) or not any(e is eg for e in f.end_gates):
+        return True
+    return not f.from_gate
+
+
+def connected_gates(gate) -> List[object]:
+    """All gates wired (directly or transitively, in either direction) to `gate`.
+
+    The internals of a composite only belong to the circuit while the
+    composite is unwired, so circuits sharing a composite class stay apart.
+    """
+    order: List[object] = []
+    seen = set()
+    stack = [gate]
+    while stack:
+        g = stack.pop()
+        if id(g) in seen:
+            continue
+        seen.add(id(g))
+        order.append(g)
+        stack.extend(g.from_gate)
+        stack.extend(f for f in getattr(g, "_fanout", ()) if _exposes(g, f))
+        if _is_composite(g) and not g.from_gate:
+            stack.extend(g.end_gates)
+    return order
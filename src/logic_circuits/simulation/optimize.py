@@ -0,0 +1,118 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+from logic_circuits.simulation.netlist import (
+    Netlist, as_netlist,
+    OP_CONST0, OP_INPUT, OP_BUF, OP_NOT, OP_AND,
+)
+
+__all__ = [
+    "gate_count",
+    "optimize",
+]
+
+
+def gate_count(nl: Netlist) -> int:
+    """Number of AND/NOT/PASS primitives in the netlist."""
+    return int(np.count_nonzero((nl.op == OP_AND) | (nl.op == OP_NOT) | (nl.op == OP_BUF)))
+
+
+def optimize(circuit, inputs=None) -> Tuple[Netlist, Dict[str, int]]:
+    """Return an equivalent, smaller netlist and a report of what was removed.
+
+    A single pass in topological order rebuilds the circuit as an
+    AND-inverter graph: buffers are bypassed, constants propagated,
+    NOT(NOT(x)) collapsed, trivial ANDs (x&x, x&~x, x&0, x&1) folded, and
+    identical AND/NOT nodes over the same fan-ins merged (structural
+    hashing). Nodes that no longer reach an output are then dropped.
+    Primary inputs are always kept, so the input ordering is unchanged.
+    """
+    nl: Netlist = as_netlist(circuit, inputs)
+    nl.check_combinational()
+    op, fa, fb = nl.op.tolist(), nl.fanin[:, 0].tolist(), nl.fanin[:, 1].tolist()
+    stats = {"buffers": 0, "constants": 0, "double_not": 0, "hashed": 0, "dead": 0}
+
+    new_op: List[int] = [OP_CONST0]
+    new_fa: List[int] = [-1]
+    new_fb: List[int] = [-1]
+    new_names: List[str] = [nl.names[0]]
+    table: Dict[Tuple[int, int, int], int] = {}
+    repr_ = [0] * nl.num_nodes
+
+    def add(o: int, a: int, b: int, name: str) -> int:
+        key = (o, a, b)
+        if key in table:
+            stats["hashed"] += 1
+            return table[key]
+        new_op.append(o); new_fa.append(a); new_fb.append(b); new_names.append(name)
+        table[key] = len(new_op) - 1
+        return table[key]
+
+    def is_not(x: int) -> bool:
+        return new_op[x] == OP_NOT
+
+    def is_one(x: int) -> bool:
+        return is_not(x) and new_fa[x] == 0
+
+    for i, n in enumerate(nl.inputs.tolist()):
+        new_op.append(OP_INPUT); new_fa.append(-1); new_fb.append(-1); new_names.append(nl.names[n])
+        repr_[n] = len(new_op) - 1
+
+    for n in np.argsort(nl.level, kind="stable").tolist():
+        o = op[n]
+        if o == OP_BUF:
+            repr_[n] = repr_[fa[n]]
+            stats["buffers"] += 1
+        elif o == OP_NOT:
+            a = repr_[fa[n]]
+            if is_not(a):
+                repr_[n] = new_fa[a]
+                stats["double_not"] += 1
+            else:
+                repr_[n] = add(OP_NOT, a, -1, nl.names[n])
+        elif o == OP_AND:
+            a, b = sorted((repr_[fa[n]], repr_[fb[n]]))
+            if a == 0 or (is_not(a) and new_fa[a] == b) or (is_not(b) and new_fa[b] == a):
+                repr_[n] = 0
+                stats["constants"] += 1
+            elif is_one(a) or a == b:
+                repr_[n] = b
+                stats["constants"] += 1
+            elif is_one(b):
+                repr_[n] = a
+                stats["constants"] += 1
+            else:
+                repr_[n] = add(OP_AND, a, b, nl.names[n])
+
+    outputs = [repr_[n] for n in nl.outputs.tolist()]
+
+    # dead-gate removal: keep what reaches an output, plus all inputs
+    live = [False] * len(new_op)
+    live[0] = True
+    for x in list(range(1, 1 + nl.num_in)) + outputs:
+        live[x] = True
+    for x in range(len(new_op) - 1, 0, -1):
+        if live[x]:
+            for y in (new_fa[x], new_fb[x]):
+                if y >= 0:
+                    live[y] = True
+    remap = np.cumsum(live) - 1
+    keep = np.flatnonzero(live)
+    stats["dead"] = len(new_op) - len(keep)
+
+    fanin = np.stack([np.array(new_fa, dtype=np.int64)[keep], np.array(new_fb, dtype=np.int64)[keep]], axis=1)
+    fanin = np.where(fanin >= 0, remap[np.maximum(fanin, 0)], -1)
+
+    out = Netlist(
+        op=np.array(new_op, dtype=np.int8)[keep],
+        fanin=fanin,
+        inputs=remap[1:1 + nl.num_in].astype(np.int64),
+        outputs=remap[outputs].astype(np.int64),
+        names=[new_names[x] for x in keep.tolist()],
+        gate_nodes={},
+        sysins=nl.sysins,
+    )
+    stats["gates_before"] = gate_count(nl)
+    stats["gates_after"] = gate_count(out)
+    stats["removed"] = stats["gates_before"] - stats["gates_after"]
+    return out, stats
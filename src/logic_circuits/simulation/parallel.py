@@ -0,0 +1,172 @@
+# concurrent.futures / multiprocessing are imported where used: they add
+# tens of ms to `import logic_circuits` otherwise
+from typing import Optional, Tuple
+import os
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, as_netlist
+from logic_circuits.simulation.bitparallel import (
+    WORD_BITS, TruthTable, input_patterns, _evaluator, _num_words,
+)
+
+__all__ = [
+    "parallel_truth_table",
+    "exhaustive_counterexample",
+]
+
+# per-worker state, set once by the pool initializer
+_WORKER = {}
+
+
+def _shards(n_words: int, chunk_words: int):
+    return [(w0, min(w0 + chunk_words, n_words)) for w0 in range(0, n_words, chunk_words)]
+
+
+def _default_workers(n_shards: int, workers: Optional[int]) -> int:
+    return max(1, min(workers or os.cpu_count() or 1, n_shards))
+
+
+def _init_tt_worker(nl: Netlist, backend: str, shm_name: str, shape: Tuple[int, int], pooled: bool = True):
+    from multiprocessing import shared_memory, util
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER["shm"] = shm
+    _WORKER["out"] = np.ndarray(shape, dtype=np.uint64, buffer=shm.buf)
+    _WORKER["num_in"] = nl.num_in
+    _WORKER["evaluate"] = _evaluator(nl, backend)
+    if pooled:
+        # pool processes leave through os._exit() under fork, which skips
+        # atexit but still runs multiprocessing's finalizers
+        util.Finalize(None, _close_tt_worker, exitpriority=10)
+
+
+def _close_tt_worker() -> None:
+    """Release this process's handle on the output shared memory."""
+    _WORKER.pop("out", None)        # the view must go before the buffer is closed
+    shm = _WORKER.pop("shm", None)
+    if shm is not None:
+        shm.close()
+    _WORKER.clear()
+
+
+def _tt_shard(w0: int, w1: int) -> None:
+    _WORKER["out"][:, w0:w1] = _WORKER["evaluate"](input_patterns(_WORKER["num_in"], w0, w1))
+
+
+def parallel_truth_table(
+    circuit,
+    inputs=None,
+    workers: Optional[int] = None,
+    chunk_words: int = 1 << 14,
+    backend: str = "netlist",
+) -> TruthTable:
+    """truth_table() with the 2^n input space split into shards that are
+    evaluated on a process pool.
+
+    Every worker receives the compiled netlist once and writes its packed
+    output words directly into a shared-memory array.
+    """
+    nl: Netlist = as_netlist(circuit, inputs)
+    n_words = _num_words(nl.num_in)
+    shape = (nl.num_out, n_words)
+    shards = _shards(n_words, chunk_words)
+    workers = _default_workers(len(shards), workers)
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, nl.num_out * n_words * 8))
+    try:
+        if workers == 1:
+            _init_tt_worker(nl, backend, shm.name, shape, pooled=False)
+            try:
+                for w0, w1 in shards:
+                    _tt_shard(w0, w1)
+            finally:
+                _close_tt_worker()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_tt_worker,
+                initargs=(nl, backend, shm.name, shape),
+            ) as pool:
+                for f in [pool.submit(_tt_shard, w0, w1) for w0, w1 in shards]:
+                    f.result()
+        packed = np.ndarray(shape, dtype=np.uint64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if nl.num_in < 6:
+        packed &= np.uint64((1 << (1 << nl.num_in)) - 1)
+    return TruthTable(
+        nl.num_in,
+        packed,
+        in_names=[f"I{i}" for i in range(nl.num_in)],
+        out_names=[nl.names[n] for n in nl.outputs],
+    )
+
+
+def _init_eq_worker(nl_a: Netlist, nl_b: Netlist, backend: str):
+    _WORKER["num_in"] = nl_a.num_in
+    _WORKER["a"] = _evaluator(nl_a, backend)
+    _WORKER["b"] = _evaluator(nl_b, backend)
+
+
+def _eq_shard(w0: int, w1: int) -> Optional[int]:
+    pats = input_patterns(_WORKER["num_in"], w0, w1)
+    diff = np.bitwise_or.reduce(_WORKER["a"](pats) ^ _WORKER["b"](pats), axis=0)
+    if _WORKER["num_in"] < 6:
+        diff &= np.uint64((1 << (1 << _WORKER["num_in"])) - 1)
+    hits = np.flatnonzero(diff)
+    if len(hits) == 0:
+        return None
+    w = int(hits[0])
+    word = int(diff[w])
+    return (w0 + w) * WORD_BITS + (word & -word).bit_length() - 1
+
+
+def exhaustive_counterexample(
+    circuit_a,
+    circuit_b,
+    inputs_a=None,
+    inputs_b=None,
+    workers: Optional[int] = None,
+    chunk_words: int = 1 << 14,
+    backend: str = "netlist",
+) -> Optional[np.ndarray]:
+    """Exhaustively compare two circuits over all 2^n inputs, sharded over a
+    process pool. Returns the first input vector on which their outputs
+    differ, or None if they are equivalent.
+    """
+    nl_a: Netlist = as_netlist(circuit_a, inputs_a)
+    nl_b: Netlist = as_netlist(circuit_b, inputs_b)
+    if (nl_a.num_in, nl_a.num_out) != (nl_b.num_in, nl_b.num_out):
+        raise ValueError("Circuits have different numbers of inputs or outputs.")
+
+    shards = _shards(_num_words(nl_a.num_in), chunk_words)
+    workers = _default_workers(len(shards), workers)
+    if workers == 1:
+        _init_eq_worker(nl_a, nl_b, backend)
+        try:
+            rows = (_eq_shard(w0, w1) for w0, w1 in shards)
+            row = next((r for r in rows if r is not None), None)
+        finally:
+            _WORKER.clear()
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_eq_worker,
+            initargs=(nl_a, nl_b, backend),
+        ) as pool:
+            results = [pool.submit(_eq_shard, w0, w1) for w0, w1 in shards]
+            row = next((r for r in (f.result() for f in results) if r is not None), None)
+            for f in results:
+                f.cancel()
+
+    if row is None:
+        return None
+    shifts = np.arange(nl_a.num_in - 1, -1, -1)
+    return ((row >> shifts) & 1).astype(bool)
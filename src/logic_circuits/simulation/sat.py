@@ -0,0 +1,225 @@
+import heapq
+from typing import List, Optional, Sequence
+
+from logic_circuits.simulation.netlist import (
+    Netlist,
+    OP_CONST0, OP_BUF, OP_NOT, OP_AND,
+)
+
+__all__ = [
+    "solve",
+    "tseitin",
+]
+
+
+def tseitin(nl: Netlist) -> List[List[int]]:
+    """CNF clauses constraining variable n + 1 to the value of node n."""
+    nl.check_combinational()
+    clauses: List[List[int]] = []
+    op, fa, fb = nl.op.tolist(), nl.fanin[:, 0].tolist(), nl.fanin[:, 1].tolist()
+    for n in range(nl.num_nodes):
+        v, o = n + 1, op[n]
+        if o == OP_CONST0:
+            clauses.append([-v])
+        elif o == OP_BUF:
+            a = fa[n] + 1
+            clauses += [[-v, a], [v, -a]]
+        elif o == OP_NOT:
+            a = fa[n] + 1
+            clauses += [[-v, -a], [v, a]]
+        elif o == OP_AND:
+            a, b = fa[n] + 1, fb[n] + 1
+            clauses += [[-v, a], [-v, b], [v, -a, -b]]
+    return clauses
+
+
+def solve(num_vars: int, clauses: Sequence[Sequence[int]], max_conflicts: Optional[int] = None) -> Optional[List[bool]]:
+    """Small CDCL SAT solver (two watched literals, 1-UIP learning, VSIDS,
+    phase saving, geometric restarts).
+
+    Literals are non-zero ints, +v / -v for variable v in 1..num_vars.
+    Returns a model (index v holds the value of variable v, index 0 is
+    unused) or None if the clauses are unsatisfiable. Raises RuntimeError
+    when `max_conflicts` is exceeded.
+    """
+    n = num_vars
+    assign = [0] * (n + 1)          # +1 true, -1 false, 0 unassigned
+    level = [0] * (n + 1)
+    reason = [-1] * (n + 1)
+    phase = [-1] * (n + 1)
+    activity = [0.0] * (n + 1)
+    seen = [False] * (n + 1)
+    trail: List[int] = []
+    trail_lim: List[int] = []
+    db: List[List[int]] = []
+    watches: List[List[int]] = [[] for _ in range(2 * n + 2)]
+
+    def widx(lit: int) -> int:
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def value(lit: int) -> int:
+        a = assign[abs(lit)]
+        return a if lit > 0 else -a
+
+    def enqueue(lit: int, why: int) -> None:
+        v = abs(lit)
+        assign[v] = 1 if lit > 0 else -1
+        level[v] = len(trail_lim)
+        reason[v] = why
+        trail.append(lit)
+
+    def add_clause(c: List[int]) -> int:
+        db.append(c)
+        ci = len(db) - 1
+        watches[widx(c[0])].append(ci)
+        watches[widx(c[1])].append(ci)
+        return ci
+
+    # load clauses, units go straight onto the trail at level 0
+    for clause in clauses:
+        c = list(dict.fromkeys(clause))
+        if any(-lit in c for lit in c):
+            continue
+        if not c:
+            return None
+        if len(c) == 1:
+            if value(c[0]) == -1:
+                return None
+            if value(c[0]) == 0:
+                enqueue(c[0], -1)
+        else:
+            add_clause(c)
+
+    qhead = 0
+
+    def propagate() -> int:
+        nonlocal qhead
+        while qhead < len(trail):
+            false_lit = -trail[qhead]
+            qhead += 1
+            ws = watches[widx(false_lit)]
+            kept = []
+            i = 0
+            while i < len(ws):
+                ci = ws[i]
+                i += 1
+                c = db[ci]
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                if value(c[0]) == 1:
+                    kept.append(ci)
+                    continue
+                for k in range(2, len(c)):
+                    if value(c[k]) != -1:
+                        c[1], c[k] = c[k], c[1]
+                        watches[widx(c[1])].append(ci)
+                        break
+                else:
+                    kept.append(ci)
+                    if value(c[0]) == -1:
+                        kept.extend(ws[i:])
+                        watches[widx(false_lit)] = kept
+                        return ci
+                    enqueue(c[0], ci)
+            watches[widx(false_lit)] = kept
+        return -1
+
+    var_inc = 1.0
+    heap = [(0.0, v) for v in range(1, n + 1)]
+    heapq.heapify(heap)
+
+    def bump(v: int) -> None:
+        nonlocal var_inc
+        activity[v] += var_inc
+        if activity[v] > 1e100:
+            for u in range(1, n + 1):
+                activity[u] *= 1e-100
+            var_inc *= 1e-100
+        heapq.heappush(heap, (-activity[v], v))
+
+    def backtrack(lvl: int) -> None:
+        nonlocal qhead
+        if len(trail_lim) <= lvl:
+            return
+        for lit in trail[trail_lim[lvl]:]:
+            v = abs(lit)
+            phase[v] = assign[v]
+            assign[v] = 0
+            reason[v] = -1
+            heapq.heappush(heap, (-activity[v], v))
+        del trail[trail_lim[lvl]:]
+        del trail_lim[lvl:]
+        qhead = len(trail)
+
+    def analyze(confl: int):
+        learnt = [0]
+        counter = 0
+        p = 0
+        idx = len(trail) - 1
+        cur = len(trail_lim)
+        while True:
+            c = db[confl]
+            for q in (c if p == 0 else c[1:]):
+                v = abs(q)
+                if not seen[v] and level[v] > 0:
+                    seen[v] = True
+                    bump(v)
+                    if level[v] == cur:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[abs(trail[idx])]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            seen[abs(p)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            confl = reason[abs(p)]
+        learnt[0] = -p
+        for q in learnt[1:]:
+            seen[abs(q)] = False
+        if len(learnt) == 1:
+            return learnt, 0
+        k = max(range(1, len(learnt)), key=lambda j: level[abs(learnt[j])])
+        learnt[1], learnt[k] = learnt[k], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    conflicts = 0
+    restart_interval = 100.0
+    restart_at = 100
+    while True:
+        confl = propagate()
+        if confl >= 0:
+            conflicts += 1
+            if max_conflicts is not None and conflicts > max_conflicts:
+                raise RuntimeError(f"SAT conflict limit {max_conflicts} exceeded.")
+            if not trail_lim:
+                return None
+            learnt, back = analyze(confl)
+            backtrack(back)
+            if len(learnt) == 1:
+                enqueue(learnt[0], -1)
+            else:
+                enqueue(learnt[0], add_clause(learnt))
+            var_inc /= 0.95
+            continue
+
+        if conflicts >= restart_at:
+            restart_interval *= 1.5
+            restart_at = conflicts + int(restart_interval)
+            backtrack(0)
+            continue
+
+        # decide
+        v = 0
+        while heap:
+            _, u = heapq.heappop(heap)
+            if assign[u] == 0:
+                v = u
+                break
+        if v == 0:
+            return [False] + [assign[u] == 1 for u in range(1, n + 1)]
+        trail_lim.append(len(trail))
+        enqueue(v if phase[v] == 1 else -v, -1)
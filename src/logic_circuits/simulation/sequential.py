@@ -0,0 +1,170 @@
+from typing import Callable, List, Optional
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, as_netlist
+from logic_circuits.simulation.codegen import body_lines, compile_source, node_names
+from logic_circuits.simulation.batch import pack_vectors, unpack_vectors
+
+__all__ = [
+    "generate_step_source",
+    "SequentialSimulator",
+]
+
+
+def generate_step_source(nl: Netlist, record: bool = True, func_name: str = "step") -> str:
+    """Source of `step(seq, state, one)`, a loop running one clock cycle per
+    element of `seq` (a tuple of input values per cycle).
+
+    Every iteration evaluates the combinational core once in topological
+    order, optionally records the outputs (before the clock edge) and then
+    loads all registers at once with a single tuple assignment. Returns the
+    recorded outputs and the final register values.
+    """
+    names = node_names(nl)
+    ins = [names[n] for n in nl.inputs.tolist()]
+    regs = [names[n] for n in nl.state_nodes.tolist()]
+
+    lines = [f"def {func_name}(seq, state, one):"]
+    if regs:
+        lines.append(f"    {', '.join(regs)}, = state")
+    lines += ["    outs = []", "    append = outs.append"]
+    lines.append(f"    for {', '.join(ins) + ',' if ins else '_'} in seq:")
+    lines += body_lines(nl, names, "        ")
+    if record:
+        outs = ", ".join(names[n] for n in nl.outputs.tolist())
+        lines.append(f"        append(({outs}{',' if nl.num_out == 1 else ''}))")
+    if regs:
+        nxt = ", ".join(names[n] for n in nl.state_next.tolist())
+        lines.append(f"        {', '.join(regs)}, = {nxt},")
+    lines.append(f"    return outs, ({', '.join(regs)}{',' if len(regs) == 1 else ''})")
+    return "\n".join(lines) + "\n"
+
+
+def _compile_step(nl: Netlist, record: bool) -> Callable:
+    key = f"step{int(record)}:{nl.structural_hash()}"
+    return compile_source(key, lambda: generate_step_source(nl, record), "step")
+
+
+class SequentialSimulator:
+    """Cycle-accurate simulation of a circuit with DFF/LATCH registers.
+
+    The circuit is compiled once into a generated step loop. `lanes`
+    independent copies of the circuit run side by side, packed bit-wise into
+    Python ints, so one pass over the loop advances all of them.
+    """
+
+    def __init__(self, circuit, inputs=None, lanes: int = 1, chunk_cycles: int = 1 << 16):
+        if lanes < 1:
+            raise ValueError("lanes must be at least 1.")
+        self.netlist: Netlist = as_netlist(circuit, inputs)
+        self.lanes = lanes
+        self.chunk_cycles = chunk_cycles
+        self.cycle = 0
+        self._one = (1 << lanes) - 1
+        self._fns = {}
+        self.reset()
+
+    @property
+    def num_in(self) -> int:
+        return self.netlist.num_in
+
+    @property
+    def num_out(self) -> int:
+        return self.netlist.num_out
+
+    @property
+    def num_state(self) -> int:
+        return self.netlist.num_state
+
+    # ---- lane packing ----
+    def _pack(self, bits: np.ndarray) -> List[int]:
+        """(k, lanes) bool -> k ints, lane j in bit j."""
+        packed = pack_vectors(bits)
+        if self.lanes <= 64:
+            return packed[:, 0].tolist()
+        return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+    def _unpack(self, ints: List[int]) -> np.ndarray:
+        """k ints -> (k, lanes) bool."""
+        if self.lanes <= 64:
+            return unpack_vectors(np.array(ints, dtype=np.uint64).reshape(-1, 1), self.lanes)
+        n_bytes = -(-self.lanes // 64) * 8
+        raw = b"".join(v.to_bytes(n_bytes, "little") for v in ints)
+        return unpack_vectors(np.frombuffer(raw, dtype=np.uint64).reshape(len(ints), -1), self.lanes)
+
+    def _as_bits(self, arr: np.ndarray, width: int) -> np.ndarray:
+        arr = np.asarray(arr, dtype=bool)
+        if arr.shape[-1] != width:
+            raise ValueError(f"Expected last axis of size {width}, got shape {arr.shape}")
+        return arr
+
+    # ---- state ----
+    def reset(self, state: Optional[np.ndarray] = None) -> None:
+        """Load the registers with `state`, shape (num_state,) or
+        (lanes, num_state); by default with the init values of the gates."""
+        nl = self.netlist
+        if state is None:
+            state = nl.values[nl.state_init]
+        state = np.broadcast_to(self._as_bits(state, nl.num_state), (self.lanes, nl.num_state))
+        self._state = tuple(self._pack(state.T))
+        self.cycle = 0
+
+    @property
+    def state(self) -> np.ndarray:
+        """Register values, shape (num_state,) for one lane, (lanes, num_state) otherwise."""
+        bits = self._unpack(list(self._state)).T
+        return bits[0] if self.lanes == 1 else bits
+
+    # ---- stepping ----
+    def step(self, n_cycles: int = 1, stimuli: Optional[np.ndarray] = None, record: bool = True) -> Optional[np.ndarray]:
+        """Advance `n_cycles` clock cycles.
+
+        `stimuli` gives the inputs of every cycle, shape (n_cycles, num_in)
+        (the same for all lanes) or (n_cycles, lanes, num_in); by default the
+        current SysIN values are held. Returns the outputs of each cycle
+        before its clock edge, shape (n_cycles, num_out) for one lane and
+        (n_cycles, lanes, num_out) otherwise, or None if `record` is False.
+        """
+        nl = self.netlist
+        if stimuli is None:
+            held = nl.read_inputs()
+            stimuli = np.broadcast_to(held, (n_cycles, nl.num_in))
+        stimuli = self._as_bits(stimuli, nl.num_in)
+        if len(stimuli) != n_cycles:
+            raise ValueError(f"Expected stimuli for {n_cycles} cycles, got {len(stimuli)}")
+
+        fn = self._fns.get(record)
+        if fn is None:
+            fn = self._fns[record] = _compile_step(nl, record)
+
+        results = []
+        for c0 in range(0, n_cycles, self.chunk_cycles):
+            chunk = stimuli[c0:c0 + self.chunk_cycles]
+            n = len(chunk)
+            if nl.num_in:
+                lanes = np.broadcast_to(
+                    chunk if chunk.ndim == 3 else chunk[:, None, :],
+                    (n, self.lanes, nl.num_in),
+                )
+                ints = self._pack(lanes.transpose(0, 2, 1).reshape(n * nl.num_in, self.lanes))
+                seq = [ints[k:k + nl.num_in] for k in range(0, len(ints), nl.num_in)]
+            else:
+                seq = range(n)
+            outs, self._state = fn(seq, self._state, self._one)
+            self.cycle += n
+            if record and n:
+                flat = [v for row in outs for v in row]
+                bits = self._unpack(flat).reshape(n, nl.num_out, self.lanes)
+                results.append(bits.transpose(0, 2, 1))
+
+        if not record:
+            return None
+        if results:
+            out = np.concatenate(results)
+        else:
+            out = np.zeros((0, self.lanes, nl.num_out), dtype=bool)
+        return out[:, 0, :] if self.lanes == 1 else out
+
+    def __repr__(self):
+        return (f"SequentialSimulator(in={self.num_in}, out={self.num_out}, "
+                f"registers={self.num_state}, lanes={self.lanes}, cycle={self.cycle})")
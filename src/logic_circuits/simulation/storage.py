@@ -0,0 +1,314 @@
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import numpy as np
+
+import logic_circuits.gates.gates as gates
+from logic_circuits.simulation.netlist import (
+    Netlist, compile_circuit, compile_connections,
+    _as_list, _drivers_from_gates, _kind,
+)
+
+__all__ = [
+    "save_netlist",
+    "save_circuit",
+    "load_netlist",
+    "CircuitFile",
+]
+
+# file layout:
+#   b"LCNL" | uint32 version | uint32 header length | JSON header | sections
+# The JSON header maps every section name to its dtype, shape and byte offset
+# (relative to the first section, 64-byte aligned); sections are raw arrays.
+MAGIC = b"LCNL"
+VERSION = 1
+_ALIGN = 64
+
+# gate kinds of the gate-level section
+GATE_KINDS = ["SYSIN", "SYSOUT", "AND", "NOT", "PASS", "DFF", "LATCH"]
+
+# columns of the optional layout section: rect x, y, w, h and the _x, _y origin
+LAYOUT_COLUMNS = ("x", "y", "w", "h", "_x", "_y")
+
+Connection = Tuple[object, object, int, int]
+
+
+def _index_dtype(n: int):
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def _encode_strings(strings: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Strings -> (utf-8 blob, offsets) with string i in blob[ptr[i]:ptr[i+1]]."""
+    raw = [s.encode("utf-8") for s in strings]
+    ptr = np.zeros(len(raw) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in raw], out=ptr[1:])
+    return np.frombuffer(b"".join(raw), dtype=np.uint8), ptr
+
+
+class _Names(Sequence):
+    """Read-only list of strings decoded on access from a (memory-mapped) blob."""
+
+    def __init__(self, blob: np.ndarray, ptr: np.ndarray):
+        self._blob = blob
+        self._ptr = ptr
+
+    def __len__(self) -> int:
+        return len(self._ptr) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        return self._blob[self._ptr[i]:self._ptr[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[k] for k in range(len(self)))
+
+
+def _write(path: Union[str, os.PathLike], sections: Dict[str, np.ndarray], meta: dict) -> None:
+    table = {}
+    offset = 0
+    for name, arr in sections.items():
+        arr = np.ascontiguousarray(arr)
+        sections[name] = arr
+        table[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+    header = json.dumps({"meta": meta, "sections": table}).encode("utf-8")
+    start = len(MAGIC) + 8 + len(header)
+    pad = -start % _ALIGN
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.array([VERSION, len(header) + pad], dtype="<u4").tobytes())
+        f.write(header + b" " * pad)
+        for name, arr in sections.items():
+            f.write(arr.tobytes())
+            f.write(b"\0" * (-arr.nbytes % _ALIGN))
+
+
+def _netlist_sections(nl: Netlist) -> Dict[str, np.ndarray]:
+    idx = _index_dtype(nl.num_nodes + 1)
+    blob, ptr = _encode_strings(nl.names)
+    return {
+        "op": nl.op.astype(np.int8),
+        "fanin": nl.fanin.astype(idx),
+        "inputs": nl.inputs.astype(idx),
+        "outputs": nl.outputs.astype(idx),
+        "state_nodes": nl.state_nodes.astype(idx),
+        "state_next": nl.state_next.astype(idx),
+        "state_init": nl.state_init.astype(idx),
+        "state_enable": nl.state_enable.astype(idx),
+        "level": nl.level.astype(idx),
+        "fanout_ptr": nl.fanout_ptr.astype(np.int64),
+        "fanout": nl.fanout.astype(idx),
+        "reset": nl.values[nl.state_init],
+        "names": blob,
+        "names_ptr": ptr,
+    }
+
+
+def save_netlist(path: Union[str, os.PathLike], nl: Netlist) -> None:
+    """Write a compiled netlist (node ops, fan-in, port maps, levels, names)."""
+    _write(path, _netlist_sections(nl), {"num_nodes": nl.num_nodes})
+
+
+def _gate_kind(g) -> str:
+    kind = _kind(g)
+    if kind == "PASS" and isinstance(g, gates.SysOUT):
+        return "SYSOUT"
+    return kind
+
+
+def save_circuit(
+    path: Union[str, os.PathLike],
+    circuit,
+    inputs=None,
+    connections: Optional[Sequence[Connection]] = None,
+    blocks: Optional[Sequence[object]] = None,
+) -> None:
+    """Write the compiled netlist of `circuit` plus a gate-level section that
+    load can turn back into gate objects.
+
+    `circuit` and `inputs` are as for compile_circuit(). `connections` is an
+    editor-style list of (from_gate, to_gate, from_port, to_port); by default
+    the wiring stored on the gates is used. `blocks` lists every gate to keep
+    (e.g. unconnected editor blocks); by default the gates of the netlist.
+    Gates with a pygame `rect` get their position in the layout section.
+    """
+    if connections is not None:
+        nl = compile_connections(connections, _as_list(circuit), inputs)
+    else:
+        nl = compile_circuit(circuit, inputs)
+    gate_list = list(blocks) if blocks is not None else list(nl.gate_nodes)
+    for g in nl.gate_nodes:
+        if _kind(g) == "COMPOSITE":
+            raise ValueError(f"Composite gate {g.name!r} cannot be saved gate by gate; use save_netlist().")
+    index = {id(g): i for i, g in enumerate(gate_list)}
+
+    if connections is None:
+        connections = [
+            (src, g, from_port, to_port)
+            for g, d in _drivers_from_gates(gate_list).items()
+            for to_port, (src, from_port) in d.items()
+        ]
+    conns = [
+        (index[id(a)], index[id(b)], fp, tp) for a, b, fp, tp in connections
+        if id(a) in index and id(b) in index
+    ]
+
+    sections = _netlist_sections(nl)
+    g_idx = _index_dtype(len(gate_list) + 1)
+    blob, ptr = _encode_strings([str(g.name) for g in gate_list])
+    sections.update({
+        "gate_kind": np.array([GATE_KINDS.index(_gate_kind(g)) for g in gate_list], dtype=np.uint8),
+        "gate_io": np.array([(g.num_in, g.num_out, g.width) for g in gate_list], dtype=np.int32).reshape(-1, 3),
+        "gate_node": np.array([nl.gate_nodes[g].start if g in nl.gate_nodes else -1 for g in gate_list], dtype=np.int64),
+        "gate_init": np.array([bool(getattr(g, "init", False)) for g in gate_list], dtype=bool),
+        "gate_names": blob,
+        "gate_names_ptr": ptr,
+        "connections": np.array(conns, dtype=np.int32).reshape(-1, 4),
+        "input_gates": np.array([index[id(s)] for s in nl.sysins if id(s) in index], dtype=g_idx),
+        "output_gates": np.array([index[id(g)] for g in _as_list(circuit) if id(g) in index], dtype=g_idx),
+    })
+
+    if any(hasattr(g, "rect") for g in gate_list):
+        layout = np.zeros((len(gate_list), len(LAYOUT_COLUMNS)), dtype=np.int32)
+        for i, g in enumerate(gate_list):
+            rect = getattr(g, "rect", None)
+            if rect is not None:
+                layout[i] = (rect.x, rect.y, rect.w, rect.h, getattr(g, "_x", rect.x), getattr(g, "_y", rect.y))
+        sections["layout"] = layout
+
+    _write(path, sections, {"num_nodes": nl.num_nodes, "num_gates": len(gate_list)})
+
+
+def _default_gate(kind: str, name: str, num_in: int, num_out: int, width: int, init: bool, layout):
+    if kind == "SYSIN":
+        return gates.SysIN(name, num_in, num_out, width=width)
+    if kind == "SYSOUT":
+        return gates.SysOUT(name, num_in, num_out, width=width)
+    if kind == "AND":
+        return gates.GateAND(name, num_in, num_out, width=width)
+    if kind == "NOT":
+        return gates.GateNOT(name, num_in, num_out, width=width)
+    if kind == "PASS":
+        return gates.GatePASS(name, num_in, num_out, width=width)
+    if kind == "DFF":
+        return gates.GateDFF(name, num_in, num_out, init=init)
+    return gates.GateLATCH(name, num_in, num_out, init=init)
+
+
+class CircuitFile:
+    """A saved circuit, opened with np.memmap.
+
+    Opening only parses the small header; sections are mapped views of the
+    file, and no Python objects are built until netlist() or gates() is
+    called.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(len(MAGIC) + 8)
+            if head[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path!s} is not a logic_circuits netlist file.")
+            version, header_len = np.frombuffer(head[len(MAGIC):], dtype="<u4").tolist()
+            if version > VERSION:
+                raise ValueError(f"Unsupported netlist file version {version}.")
+            header = json.loads(f.read(header_len))
+        self.meta = header["meta"]
+        self._table = header["sections"]
+        self._start = len(MAGIC) + 8 + header_len
+        self._mm = np.memmap(path, dtype=np.uint8, mode="r") if self._table else None
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._table
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        arr = self._cache.get(name)
+        if arr is None:
+            spec = self._table[name]
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            start = self._start + spec["offset"]
+            arr = self._mm[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+            self._cache[name] = arr
+        return arr
+
+    @property
+    def has_gates(self) -> bool:
+        return "gate_kind" in self
+
+    @property
+    def layout(self) -> Optional[np.ndarray]:
+        """(num_gates, 6) int32 positions (see LAYOUT_COLUMNS), or None."""
+        return self["layout"] if "layout" in self else None
+
+    def netlist(self) -> Netlist:
+        """The compiled netlist, backed by the mapped arrays (not bound to gates)."""
+        nl = Netlist(
+            op=self["op"],
+            fanin=self["fanin"],
+            inputs=self["inputs"],
+            outputs=self["outputs"],
+            names=_Names(self["names"], self["names_ptr"]),
+            gate_nodes={},
+            sysins=[],
+            state_nodes=self["state_nodes"],
+            state_next=self["state_next"],
+            state_init=self["state_init"],
+            # files written before latches recorded their EN node
+            state_enable=self["state_enable"] if "state_enable" in self else None,
+            levels=(self["level"], self["fanout_ptr"], self["fanout"]),
+        )
+        nl.values[nl.state_init] = self["reset"]
+        nl.values[nl.state_nodes] = self["reset"]
+        return nl
+
+    def gates(
+        self,
+        make_gate: Optional[Callable] = None,
+        wire: bool = True,
+    ) -> Tuple[List[object], List[Connection], List[object], List[object]]:
+        """Rebuild the gate objects of a file written by save_circuit().
+
+        `make_gate(kind, name, num_in, num_out, width, init, layout_row)`
+        creates one gate (the default builds the core gate classes; the editor
+        passes its graphical ones). With `wire`, the connections are applied
+        with wire_up(). Returns (gates, connections, input gates, output gates).
+        """
+        if not self.has_gates:
+            raise ValueError(f"{self.path!s} has no gate-level section; use netlist().")
+        make_gate = make_gate or _default_gate
+        names = _Names(self["gate_names"], self["gate_names_ptr"])
+        layout = self.layout
+        io = self["gate_io"].tolist()
+        init = self["gate_init"].tolist()
+
+        gate_list = [
+            make_gate(GATE_KINDS[k], names[i], *io[i], init[i], None if layout is None else layout[i].tolist())
+            for i, k in enumerate(self["gate_kind"].tolist())
+        ]
+        connections = [
+            (gate_list[a], gate_list[b], fp, tp) for a, b, fp, tp in self["connections"].tolist()
+        ]
+        if wire:
+            for a, b, fp, tp in connections:
+                b.wire_up(a, b, fp, tp)
+        return (
+            gate_list,
+            connections,
+            [gate_list[i] for i in self["input_gates"].tolist()],
+            [gate_list[i] for i in self["output_gates"].tolist()],
+        )
+
+    def __repr__(self):
+        return f"CircuitFile({str(self.path)!r}, sections={list(self._table)})"
+
+
+def load_netlist(path: Union[str, os.PathLike]) -> Netlist:
+    """Open a netlist file memory-mapped; the arrays are read lazily by the OS."""
+    return CircuitFile(path).netlist()
@@ -0,0 +1,202 @@
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Union
+import os
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, as_netlist
+from logic_circuits.simulation.bitparallel import TruthTable, _evaluator
+from logic_circuits.simulation.batch import pack_vectors, unpack_vectors
+
+__all__ = [
+    "VectorReader",
+    "VectorWriter",
+    "port_columns",
+    "stream_simulate",
+    "simulate_file",
+    "write_truth_table",
+]
+
+# Vector file formats:
+#   "bits": raw rows of ceil(width / 8) bytes, column k in bit k % 8 of byte k // 8
+#   "csv":  one vector per line of 0/1 digits (separators and spaces are
+#           ignored), with an optional header line of column names
+FORMATS = ("bits", "csv")
+
+Path = Union[str, os.PathLike]
+
+
+def _format(path: Path, fmt: Optional[str]) -> str:
+    fmt = fmt or ("csv" if str(path).lower().endswith((".csv", ".txt")) else "bits")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown vector format {fmt!r}, expected one of {FORMATS}.")
+    return fmt
+
+
+def port_columns(circuit, sysin=None) -> List[str]:
+    """Column names of the stimulus file for `circuit`: the SysIN port
+    bits in port order (bus bits expanded), e.g. "SysIN[0]", "SysIN[1]"."""
+    nl: Netlist = as_netlist(circuit, sysin)
+    return [nl.names[n] for n in nl.inputs.tolist()]
+
+
+class VectorReader:
+    """Iterate over a vector file in chunks of at most `chunk_vectors` rows,
+    each a (n, width) bool array. Only one chunk is held in memory."""
+
+    def __init__(self, path: Path, width: int, fmt: Optional[str] = None,
+                 chunk_vectors: int = 1 << 20, columns: Optional[Sequence[str]] = None):
+        self.path = path
+        self.width = width
+        self.fmt = _format(path, fmt)
+        self.chunk_vectors = chunk_vectors
+        self.columns = list(columns) if columns is not None else None
+        self._order: Optional[np.ndarray] = None
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        with open(self.path, "rb") as f:
+            if self.fmt == "bits":
+                yield from self._read_bits(f)
+            else:
+                yield from self._read_csv(f)
+
+    def _read_bits(self, f: BinaryIO) -> Iterator[np.ndarray]:
+        row = -(-self.width // 8)
+        while True:
+            data = f.read(row * self.chunk_vectors)
+            if not data:
+                return
+            if len(data) % row:
+                raise ValueError(f"{self.path!s}: truncated vector ({len(data) % row} trailing bytes).")
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, row)
+            yield np.unpackbits(raw, axis=1, count=self.width, bitorder="little").astype(bool)
+
+    def _header(self, line: bytes) -> None:
+        """Map named header columns onto the circuit's column order."""
+        names = [c.strip() for c in line.decode("utf-8").replace(";", ",").split(",")]
+        if len(names) != self.width:
+            raise ValueError(f"{self.path!s}: header has {len(names)} columns, circuit has {self.width} inputs.")
+        if self.columns is not None and names != self.columns:
+            missing = set(self.columns) - set(names)
+            if missing:
+                raise ValueError(f"{self.path!s}: header lacks columns {sorted(missing)}.")
+            self._order = np.array([names.index(c) for c in self.columns])
+
+    def _read_csv(self, f: BinaryIO) -> Iterator[np.ndarray]:
+        first = True
+        hint = self.chunk_vectors * (2 * self.width + 1)
+        while True:
+            lines = f.readlines(hint)
+            if not lines:
+                return
+            if first:
+                first = False
+                if lines[0].strip(b"01,; \t\r\n"):
+                    self._header(lines[0])
+                    lines = lines[1:]
+            data = np.frombuffer(b"".join(lines), dtype=np.uint8)
+            digits = data[(data == ord("0")) | (data == ord("1"))] == ord("1")
+            rows = sum(1 for ln in lines if ln.strip())
+            if digits.size != rows * self.width:
+                raise ValueError(f"{self.path!s}: expected {self.width} digits per line.")
+            bits = digits.reshape(rows, self.width)
+            if self._order is not None:
+                bits = bits[:, self._order]
+            for lo in range(0, rows, self.chunk_vectors):
+                yield bits[lo:lo + self.chunk_vectors]
+
+
+class VectorWriter:
+    """Append (n, width) bool chunks to a vector file; a context manager."""
+
+    def __init__(self, path: Path, width: int, fmt: Optional[str] = None,
+                 columns: Optional[Sequence[str]] = None):
+        self.path = path
+        self.width = width
+        self.fmt = _format(path, fmt)
+        self.count = 0
+        self._f = open(path, "wb")
+        if self.fmt == "csv" and columns is not None:
+            self._f.write((",".join(columns) + "\n").encode("utf-8"))
+
+    def write(self, bits: np.ndarray) -> None:
+        bits = np.asarray(bits, dtype=bool).reshape(-1, self.width)
+        if self.fmt == "bits":
+            self._f.write(np.packbits(bits, axis=1, bitorder="little").tobytes())
+        else:
+            # "d,d,...,d\n": digits on even columns, separators on odd ones
+            text = np.full((len(bits), 2 * self.width), ord(","), dtype=np.uint8)
+            text[:, 0::2] = bits + ord("0")
+            text[:, -1] = ord("\n")
+            self._f.write(text.tobytes())
+        self.count += len(bits)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream_simulate(
+    circuit,
+    stimuli: Union[Path, Iterable[np.ndarray]],
+    sysin=None,
+    fmt: Optional[str] = None,
+    chunk_vectors: int = 1 << 20,
+    backend: str = "netlist",
+) -> Iterator[np.ndarray]:
+    """Lazily evaluate `circuit` on a stream of stimuli.
+
+    `stimuli` is a vector file (see VectorReader; CSV header names are
+    matched against port_columns()) or any iterable of (n, num_in) bool
+    chunks, columns in SysIN port order. Yields one (n, num_out) bool chunk
+    per input chunk, so memory is bounded by `chunk_vectors`.
+    """
+    nl: Netlist = as_netlist(circuit, sysin)
+    evaluate = _evaluator(nl, backend)
+    if isinstance(stimuli, (str, os.PathLike)):
+        columns = [nl.names[n] for n in nl.inputs.tolist()]
+        stimuli = VectorReader(stimuli, nl.num_in, fmt, chunk_vectors, columns)
+
+    for chunk in stimuli:
+        chunk = np.asarray(chunk, dtype=bool)
+        if chunk.ndim != 2 or chunk.shape[1] != nl.num_in:
+            raise ValueError(f"Expected chunks of shape (n, {nl.num_in}), got {chunk.shape}")
+        for lo in range(0, len(chunk), chunk_vectors):
+            part = chunk[lo:lo + chunk_vectors]
+            words = evaluate(pack_vectors(part.T))
+            yield unpack_vectors(words, len(part)).T
+
+
+def simulate_file(
+    circuit,
+    in_path: Path,
+    out_path: Path,
+    sysin=None,
+    in_fmt: Optional[str] = None,
+    out_fmt: Optional[str] = None,
+    chunk_vectors: int = 1 << 20,
+    backend: str = "netlist",
+) -> int:
+    """Simulate every vector of `in_path` and write the responses to
+    `out_path` (CSV output gets a header with the output names). Returns the
+    number of vectors processed."""
+    nl: Netlist = as_netlist(circuit, sysin)
+    out_names = [nl.names[n] for n in nl.outputs.tolist()]
+    with VectorWriter(out_path, nl.num_out, out_fmt, columns=out_names) as out:
+        for chunk in stream_simulate(nl, in_path, None, in_fmt, chunk_vectors, backend):
+            out.write(chunk)
+    return out.count
+
+
+def write_truth_table(table: TruthTable, path: Path, fmt: Optional[str] = None, chunk_rows: int = 1 << 20) -> int:
+    """Export `table` row by row (input columns, then output columns) without
+    materializing it; CSV output gets a header with the column names.
+    Returns the number of rows written."""
+    columns = list(table.in_names) + list(table.out_names)
+    with VectorWriter(path, table.num_in + table.num_out, fmt, columns=columns) as out:
+        for _, ins, outs in table.chunks(chunk_rows):
+            out.write(np.hstack([ins, outs]))
+    return out.count
@@ -0,0 +1,213 @@
+from typing import Callable, Dict, List, Optional, Sequence
+import copy
+import queue
+import threading
+import numpy as np
+
+from logic_circuits.simulation.netlist import Netlist, compile_connections, _is_composite
+
+__all__ = [
+    "CircuitCapture",
+    "Snapshot",
+    "SimulationWorker",
+]
+
+
+def _gate_connections(end_gates: Sequence[object]) -> List[tuple]:
+    """The wiring stored on the gates upstream of `end_gates`, as
+    (from_gate, to_gate, from_port, to_port) tuples."""
+    connections = []
+    seen = set()
+    stack = list(end_gates)
+    while stack:
+        g = stack.pop()
+        if id(g) in seen:
+            continue
+        seen.add(id(g))
+        if _is_composite(g) and not g.from_gate:
+            stack.extend(g.end_gates)
+            continue
+        for f, fp, tp in zip(g.from_gate, g.from_port, g.to_port):
+            connections.append((f, g, fp, tp))
+            stack.append(f)
+    return connections
+
+
+class CircuitCapture:
+    """A copy of a circuit's wiring that another thread can compile while
+    the original gates keep being edited.
+
+    Taken on the thread that edits the gates: the connections (see
+    compile_connections; by default the wiring stored on the gates) are
+    copied, and every gate they mention is replaced by a shallow clone
+    with its own output values, so later resizes, renames or input
+    toggles do not reach it. compile() maps the netlist's gate_nodes back
+    to the original gates. Composite templates are shared, not copied.
+    """
+
+    def __init__(self, end_gates: Sequence[object], connections=None, inputs=None):
+        end_gates = list(end_gates)
+        if connections is None:
+            connections = _gate_connections(end_gates)
+        self._driven = {id(t) for _, t, _, _ in connections}
+        self._clones: Dict[object, object] = {}
+        self.connections = [
+            (self._clone(f), self._clone(t), int(fp), int(tp)) for f, t, fp, tp in connections
+        ]
+        self.end_gates = [self._clone(g) for g in end_gates]
+        if inputs is not None:
+            inputs = [self._clone(g) for g in (inputs if isinstance(inputs, (list, tuple)) else [inputs])]
+        self.inputs = inputs
+
+    def _clone(self, g):
+        c = self._clones.get(g)
+        if c is None:
+            c = self._clones[g] = copy.copy(g)
+            c._values = g._values.copy()
+            if _is_composite(g) and id(g) not in self._driven:
+                # an unwired composite exposes its end gates, copy them too
+                c.end_gates = [self._clone(e) for e in g.end_gates]
+        return c
+
+    def compile(self) -> Netlist:
+        nl = compile_connections(self.connections, self.end_gates, self.inputs)
+        original = {c: g for g, c in self._clones.items()}
+        nl.gate_nodes = {original.get(g, g): nodes for g, nodes in nl.gate_nodes.items()}
+        return nl
+
+
+class Snapshot:
+    """Net values published by a SimulationWorker: a read-only node buffer
+    plus the gate -> node mapping of the netlist it was computed with."""
+    __slots__ = ("version", "values", "gate_nodes", "error")
+
+    def __init__(self, version: int, values: np.ndarray, gate_nodes: Dict[object, range],
+                 error: Optional[BaseException] = None):
+        self.version = version
+        self.values = values
+        self.gate_nodes = gate_nodes
+        self.error = error      # set if the last load/evaluation failed (values are the previous ones)
+
+    def value(self, gate, port: int = 0, bit: int = 0) -> bool:
+        """Output bit of `gate`; False for gates (or ports) not in the simulated circuit."""
+        nodes = self.gate_nodes.get(gate)
+        k = port * gate.width + bit
+        if nodes is None or k >= len(nodes) or not len(self.values):
+            return False
+        return bool(self.values[nodes[k]])
+
+    def __repr__(self):
+        return f"Snapshot(version={self.version}, nodes={len(self.values)})"
+
+
+class SimulationWorker:
+    """Simulates a circuit on a background thread.
+
+    The UI thread only posts changes (load() after rewiring, set_inputs()
+    after an input toggles) and reads `snapshot`, which is replaced
+    atomically after every evaluation. Every snapshot owns a fresh
+    read-only node buffer, so it stays valid for as long as it is held.
+    Queued changes are coalesced: only the newest load is compiled, and
+    one evaluation covers them all.
+
+    Long jobs such as truth tables go through submit() and run on a second
+    thread, so they never hold up the snapshots. `on_publish(snapshot)` is
+    called from the worker thread, e.g. to wake an idle event loop.
+    """
+
+    def __init__(self, on_publish: Optional[Callable[[Snapshot], None]] = None):
+        self.on_publish = on_publish
+        self._cmds: "queue.Queue" = queue.Queue()
+        self._snapshot = Snapshot(0, np.zeros(0, dtype=bool), {})
+        self._nl: Optional[Netlist] = None
+        self._inputs: Optional[np.ndarray] = None
+        self._jobs = None
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    # ------------------------------------------------------------ UI thread
+
+    def load(self, end_gates: Sequence[object], connections=None, inputs=None) -> None:
+        """Simulate the circuit of `end_gates` from now on, wired by
+        `connections` (see compile_connections) or by the gates themselves.
+        The wiring is captured here (see CircuitCapture), the caller may
+        keep editing the gates and lists."""
+        self._cmds.put(("load", CircuitCapture(end_gates, connections, inputs)))
+
+    def set_inputs(self, values) -> None:
+        """New primary input values, in netlist input order."""
+        self._cmds.put(("inputs", np.array(values, dtype=bool).reshape(-1)))
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the job thread; returns a Future.
+        Pass circuits as a CircuitCapture (or a compiled Netlist), not as
+        gates the UI thread may still change."""
+        if self._jobs is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._jobs = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simulation-job")
+        return self._jobs.submit(fn, *args, **kwargs)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._cmds.put(None)
+        self._thread.join(timeout)
+        if self._jobs is not None:
+            self._jobs.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "SimulationWorker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -------------------------------------------------------- worker thread
+
+    def _run(self) -> None:
+        while True:
+            cmds: List = [self._cmds.get()]
+            while True:
+                try:
+                    cmds.append(self._cmds.get_nowait())
+                except queue.Empty:
+                    break
+
+            error = None
+            capture = None
+            for cmd in cmds:
+                if cmd is None:
+                    return
+                kind, arg = cmd
+                if kind == "load":
+                    capture = arg       # superseded loads are never compiled
+                else:
+                    self._inputs = arg
+            if capture is not None:
+                try:
+                    nl = capture.compile()
+                    nl.check_combinational()
+                    self._nl = nl
+                except Exception as e:
+                    error = e
+            self._publish(error)
+
+    def _publish(self, error: Optional[BaseException]) -> None:
+        nl = self._nl
+        if nl is not None and error is None:
+            inputs = self._inputs
+            if inputs is None or len(inputs) != nl.num_in:
+                inputs = nl.read_inputs()
+            try:
+                vals = nl.evaluate_nodes(inputs)
+            except Exception as e:
+                error = e
+        if nl is None or error is not None:
+            old = self._snapshot
+            self._snapshot = Snapshot(old.version + 1, old.values, old.gate_nodes, error)
+        else:
+            vals.flags.writeable = False
+            self._snapshot = Snapshot(self._snapshot.version + 1, vals, nl.gate_nodes)
+        if self.on_publish is not None:
+            self.on_publish(self._snapshot)
@@ -1 +1,2 @@
-from .base_classes import *
\ No newline at end of file
+from .base_classes import *
+from .profiling import *
@@ -1,36 +1,61 @@
 from typing import Protocol, Iterable, List, Union
 from logic_circuits.gates.port import Port
 import logic_circuits.gates.gates as gates
+import logic_circuits.simulation.netlist as netlist
 import numpy as np
 
 Idxs = Union[int, Iterable[int]]
 
 class HasState(Protocol):
+    __slots__ = ()
+
     @property
     def state(self) -> np.ndarray: ...   # shape: (n,)
 
 
 class GateBase(HasState):
-    """Single node with k>=1 output wires; concrete gates implement _compute()."""
-    def __init__(self, num_in: int = 1, num_out: int = 1, name: str = None):
+    """Single node with k>=1 output wires; concrete gates implement _compute().
+
+    Circuits are evaluated by their compiled netlist (see compile()).
+    _compute() only gives one gate's outputs from the current outputs of its
+    drivers, without evaluating them; SysIN uses it to read its own ports.
+
+    Every port is `width` bits wide (a bus if width > 1); the outputs are
+    stored port-major, bit b of port k at _values[k * width + b].
+    """
+    __slots__ = (
+        "num_in", "num_out", "width", "name", "_values", "_outs", "base_layer", "brigde",
+        "from_gate", "from_port", "to_gate", "to_port", "_fanout", "_netlist",
+    )
+
+    def __init__(self, num_in: int = 1, num_out: int = 1, name: str = None, width: int = 1):
         if num_in < 1 or num_out < 1:
             raise ValueError("number of I/O must be >= 1")
+        if width < 1:
+            raise ValueError("width must be >= 1")
 
         self.num_in = num_in
         self.num_out = num_out
+        self.width = width
         self.name = name
 
-        self._outs: List[Port] = [Port(self) for _ in range(self.num_out)]
+        # output values, a view into the compiled netlist's buffer once bound
+        self._values = np.zeros(self.num_out * width, dtype=bool)
+        self._outs: List[Port] = [
+            Port(self, buf=self._values, idx=k * width, width=width) for k in range(self.num_out)
+        ]
         self.base_layer = False
 
         # buffer
-        self.brigde = np.zeros(self.num_in, dtype=bool)
+        self.brigde = np.zeros((self.num_in, width), dtype=bool)
 
         # wiring
         self.from_gate: List["GateBase"] = []
         self.from_port: List[int] = []
         self.to_gate: List["GateBase"] = []
         self.to_port: List[int] = []
+        self._fanout: List["GateBase"] = []
+        self._netlist = None
         
     @property
     def out_ports(self) -> List[Port]:
@@ -38,38 +63,101 @@ class GateBase(HasState):
 
     @property
     def state(self) -> np.ndarray:
-        if not self.base_layer: self._recompute()
-        return np.concatenate([p.state for p in self._outs])
+        if not self.base_layer: self.compile().sync()
+        return self._values.copy()
 
     def _set_state_vec(self, vec: np.ndarray) -> None:
         vec = np.asarray(vec, dtype=bool).reshape(-1)
         
-        if vec.size != len(self._outs):
-            raise ValueError(f"Output length {vec.size} != {len(self._outs)}")
+        if vec.size != self._values.size:
+            raise ValueError(f"Output length {vec.size} != {self._values.size}")
         
-        for p, v in zip(self._outs, vec):
-            p.value = bool(v)
-
-    def _recompute(self) -> None:
-        self._set_state_vec(self._compute())
+        self._values[:] = vec
+
+    def _bind(self, buf: np.ndarray, start: int) -> None:
+        """Store the outputs in buf[start:start+num_out*width], keeping their values."""
+        stop = start + self._values.size
+        buf[start:stop] = self._values
+        self._values = buf[start:stop]
+        for k, p in enumerate(self._outs):
+            p.bind(buf, start + k * self.width)
+
+    def _resize(self, num_in: int, num_out: int) -> None:
+        """Change the number of ports in place; the outputs that remain keep
+        their values. Wires into removed inputs and out of removed outputs
+        are unwired on both ends."""
+        if num_in < 1 or num_out < 1:
+            raise ValueError("number of I/O must be >= 1")
+        self._unwire(lambda src, fp, tp: tp >= num_in)
+        for g in set(self._fanout):
+            g._unwire(lambda src, fp, tp: src is self and fp >= num_out)
+        old = self._values
+        self.num_in = num_in
+        self.num_out = num_out
+        self._values = np.zeros(num_out * self.width, dtype=bool)
+        self._outs = [
+            Port(self, buf=self._values, idx=k * self.width, width=self.width) for k in range(num_out)
+        ]
+        keep = min(self._values.size, old.size)
+        self._values[:keep] = old[:keep]
+        self.brigde = np.zeros((num_in, self.width), dtype=bool)
+        self._invalidate()
+        self._netlist = None
+
+    def _unwire(self, drop) -> None:
+        """Remove the wires into this gate for which drop(from_gate, from_port,
+        to_port) is true, with their entries in the drivers' fan-out."""
+        wires = list(zip(self.from_gate, self.from_port, self.to_gate, self.to_port))
+        keep = [w for w in wires if not drop(w[0], w[1], w[3])]
+        if len(keep) == len(wires):
+            return
+        for src, fp, _, tp in wires:
+            if drop(src, fp, tp):
+                src._fanout.remove(self)
+                src._invalidate()
+        self.from_gate = [w[0] for w in keep]
+        self.from_port = [w[1] for w in keep]
+        self.to_gate = [w[2] for w in keep]
+        self.to_port = [w[3] for w in keep]
+        self._invalidate()
 
     def _compute(self) -> np.ndarray:
         raise NotImplementedError
+
+    def compile(self) -> "netlist.Netlist":
+        """Levelized netlist of the circuit this gate belongs to, shared by all
+        its gates and cached until the wiring of one of them changes."""
+        if self._netlist is None or self._netlist.stale:
+            nl = netlist.compile_circuit(netlist.connected_gates(self))
+            nl.bind()
+            for g in nl.gate_nodes:
+                g._netlist = nl
+        return self._netlist
+
+    def _invalidate(self) -> None:
+        """Mark the compiled netlist of this gate's circuit out of date;
+        other circuits keep theirs."""
+        if self._netlist is not None:
+            self._netlist.stale = True
     
     def wire_up(self, from_gate, to_gate, from_port: int, to_port: int):
         assert from_gate != to_gate, "No self wiring is allowed"
+        if from_gate.width != to_gate.width:
+            raise ValueError(
+                f"Cannot wire {from_gate.width}-bit {from_gate.name!r} to {to_gate.width}-bit {to_gate.name!r}."
+            )
         self.from_gate.append(from_gate)
         self.to_gate.append(to_gate)
         self.from_port.append(from_port)
         self.to_port.append(to_port)
+        from_gate._fanout.append(to_gate)
+        for g in (self, from_gate, to_gate):
+            g._invalidate()
 
     def _collect_inputs(self) -> List[np.ndarray]:
         # if len(np.unique(self.to_port)) != self.num_in:
         #     raise Exception(f"Gate {self.name} not fully wired up. ports {np.unique(self.to_port)}")
 
-        for g in self.from_gate:
-            g._recompute()
-
         for _from_gate, _from_port, _to_port in zip(self.from_gate, self.from_port, self.to_port):
             self.brigde[_to_port] = gates._read(_from_gate, _from_port)
 
@@ -0,0 +1,379 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import time
+import numpy as np
+
+from logic_circuits.utils.base_classes import GateBase
+import logic_circuits.simulation.netlist as netlist
+
+__all__ = [
+    "GateProfiler",
+]
+
+
+class _NodeStats:
+    """Per-node counters of one netlist."""
+    __slots__ = ("nl", "evals", "redundant", "updates", "time", "last", "_map")
+
+    def __init__(self, nl):
+        n = nl.num_nodes
+        self.nl = nl
+        self.evals = np.zeros(n, dtype=np.int64)
+        self.redundant = np.zeros(n, dtype=np.int64)
+        self.updates = np.zeros(n, dtype=np.int64)
+        # entry point ("Netlist.sync", ...) -> seconds per node
+        self.time: Dict[str, np.ndarray] = {}
+        # input values at the previous single-vector evaluation of each node
+        self.last: List[object] = [None] * n
+        self._map = None
+
+    def add_time(self, label: str, nodes, seconds) -> None:
+        t = self.time.get(label)
+        if t is None:
+            t = self.time[label] = np.zeros(len(self.evals))
+        t[nodes] += seconds
+
+    def node_map(self):
+        """(owner, gates, scope, scope names, scope parents, type, type names):
+        the gate owning every node (index into gates, -1 for nodes of inlined
+        composites and register muxes), the innermost composite instance it
+        belongs to and its type key (gate class, or opcode for unowned nodes)."""
+        if self._map is not None:
+            return self._map
+        nl = self.nl
+        n = nl.num_nodes
+        gates = list(nl.gate_nodes)
+        owner = np.full(n, -1, dtype=np.int64)
+        for i, g in enumerate(gates):
+            r = nl.gate_nodes[g]
+            owner[r.start:r.stop] = i
+
+        # nested scopes come right after the one containing them
+        scope = np.full(n, -1, dtype=np.int64)
+        names: List[str] = []
+        parent: List[int] = []
+        open_: List[Tuple[int, int]] = []
+        for k, (name, a, b) in enumerate(nl.scopes):
+            while open_ and a >= open_[-1][1]:
+                open_.pop()
+            parent.append(open_[-1][0] if open_ else -1)
+            names.append(name)
+            scope[a:b] = k
+            open_.append((k, b))
+        # a composite's own output nodes belong to its instance (for a
+        # memoized instance they are all the work there is)
+        top = {}
+        for k, name in enumerate(names):
+            if parent[k] < 0:
+                top.setdefault(name, k)
+        for i, g in enumerate(gates):
+            if netlist._is_composite(g):
+                k = top.get(g.name)
+                if k is None:
+                    k = top[g.name] = len(names)
+                    names.append(g.name)
+                    parent.append(-1)
+                r = nl.gate_nodes[g]
+                scope[r.start:r.stop] = k
+
+        keys = [type(g).__name__ for g in gates] + [netlist.OP_NAMES[o] for o in sorted(netlist.OP_NAMES)]
+        type_names = sorted(set(keys))
+        code = {t: j for j, t in enumerate(type_names)}
+        gate_type = np.array([code[type(g).__name__] for g in gates] + [0], dtype=np.int64)
+        op_type = np.array([code[netlist.OP_NAMES[o]] for o in range(len(netlist.OP_NAMES))], dtype=np.int64)
+        node_type = np.where(owner >= 0, gate_type[owner], op_type[nl.op.astype(np.int64)])
+
+        self._map = (owner, gates, scope, names, parent, node_type, type_names)
+        return self._map
+
+
+class GateProfiler:
+    """Opt-in instrumentation of the netlist engines that evaluate gates.
+
+    While enabled (``with GateProfiler() as prof:`` or enable()/disable()),
+    the profiler is installed as Netlist._tracer and sees every evaluation
+    of a node: evaluate_nodes() reports each level/opcode group (its time is
+    shared by the group's nodes), the event-driven _propagate() behind
+    sync(), clock() and .state reports each node. Netlist.sync/run/clock
+    and GateBase.state are wrapped to name the entry point and to count
+    state reads and node updates. Disabled, the wrappers are gone and the
+    engines only test the unset tracer once per node.
+
+    Work is recorded per node and mapped through gate_nodes to gates, gate
+    types and composite instances (nodes of inlined composites count for
+    their instance path). Collected per gate: evaluations, redundant ones
+    (same input values as the node's previous single-vector evaluation),
+    state reads and node updates. Time is aggregated per gate type, per
+    composite instance (total and self) and per stack "entry point;
+    instance;...;type" for flame graphs (see write_folded()). max_depth is
+    the deepest logic level evaluated.
+    """
+
+    _active: Optional["GateProfiler"] = None
+
+    def __init__(self, timer: Callable[[], float] = time.perf_counter):
+        self.timer = timer
+        self.max_depth = 0
+
+        self._stats: Dict[int, _NodeStats] = {}
+        self._reads: Dict[GateBase, int] = {}
+        self._entry: List[str] = []
+        self._t = 0.0
+        self._saved: Dict[Tuple[type, str], object] = {}
+
+    # ---------------------------------------------------------------- control
+
+    def enable(self) -> "GateProfiler":
+        if GateProfiler._active is not None:
+            raise RuntimeError("Another GateProfiler is already enabled.")
+        GateProfiler._active = self
+        for cls, attr, wrap in (
+            (GateBase, "state", self._wrap_state),
+            (netlist.Netlist, "sync", self._wrap_netlist),
+            (netlist.Netlist, "run", self._wrap_netlist),
+            (netlist.Netlist, "clock", self._wrap_netlist),
+        ):
+            orig = cls.__dict__[attr]
+            self._saved[cls, attr] = orig
+            setattr(cls, attr, wrap(orig, attr))
+        netlist.Netlist._tracer = self
+        return self
+
+    def disable(self) -> None:
+        for (cls, attr), orig in self._saved.items():
+            setattr(cls, attr, orig)
+        self._saved.clear()
+        if netlist.Netlist._tracer is self:
+            netlist.Netlist._tracer = None
+        if GateProfiler._active is self:
+            GateProfiler._active = None
+
+    def __enter__(self) -> "GateProfiler":
+        return self.enable()
+
+    def __exit__(self, *exc) -> None:
+        self.disable()
+
+    # ---------------------------------------------------- tracer (engines)
+
+    def _node_stats(self, nl) -> _NodeStats:
+        st = self._stats.get(id(nl))
+        if st is None or st.nl is not nl:
+            st = self._stats[id(nl)] = _NodeStats(nl)
+        return st
+
+    @property
+    def _label(self) -> str:
+        return self._entry[-1] if self._entry else "Netlist.evaluate_nodes"
+
+    def begin(self, nl) -> None:
+        self._t = self.timer()
+
+    def node(self, nl, j: int, inputs) -> None:
+        """One node evaluated by _propagate() on `inputs`."""
+        dt = self.timer() - self._t
+        st = self._node_stats(nl)
+        st.evals[j] += 1
+        st.add_time(self._label, j, dt)
+        if st.last[j] == inputs:
+            st.redundant[j] += 1
+        st.last[j] = inputs
+        level = int(nl.level[j])
+        if level > self.max_depth:
+            self.max_depth = level
+        self._t = self.timer()
+
+    def group(self, nl, nodes: np.ndarray, a: np.ndarray, b: Optional[np.ndarray]) -> None:
+        """One level/opcode group evaluated by evaluate_nodes() on fan-in
+        values `a` (and `b` for AND), one row per node."""
+        dt = self.timer() - self._t
+        self._account_group(nl, nodes, a, None if b is None else b, dt)
+        self._t = self.timer()
+
+    def macro_group(self, nl, outs: np.ndarray, x: np.ndarray) -> None:
+        """A memoized composite evaluated by evaluate_nodes() on inputs `x`;
+        counted once, on its first output node."""
+        dt = self.timer() - self._t
+        sig = None if x.ndim > 1 else [tuple(x.tolist())]
+        self._account_group(nl, outs[:1], x[:1] if x.ndim > 1 else x, None, dt, sig)
+        self._t = self.timer()
+
+    def _account_group(self, nl, nodes, a, b, dt, sig=None) -> None:
+        st = self._node_stats(nl)
+        vectors = int(np.prod(a.shape[1:], dtype=np.int64)) if a.ndim > 1 else 1
+        if a.dtype != bool:
+            vectors *= a.dtype.itemsize * 8     # bit-parallel words
+        st.evals[nodes] += vectors
+        st.add_time(self._label, nodes, dt / max(1, len(nodes)))
+        if a.ndim == 1 and a.dtype == bool:
+            if sig is None:
+                sig = a.tolist() if b is None else list(zip(a.tolist(), b.tolist()))
+            last = st.last
+            for n, s in zip(nodes.tolist(), sig):
+                if last[n] == s:
+                    st.redundant[n] += 1
+                last[n] = s
+        if len(nodes):
+            level = int(nl.level[nodes].max())
+            if level > self.max_depth:
+                self.max_depth = level
+
+    # -------------------------------------------------------------- wrappers
+
+    def _wrap_state(self, orig, attr):
+        prof = self
+        fget = orig.fget
+
+        def state(g: GateBase) -> np.ndarray:
+            prof._reads[g] = prof._reads.get(g, 0) + 1
+            prof._entry.append(f"{type(g).__name__}:{g.name}.state")
+            try:
+                return fget(g)
+            finally:
+                prof._entry.pop()
+
+        return property(state, doc=orig.__doc__)
+
+    def _wrap_netlist(self, orig, attr):
+        prof = self
+
+        def method(nl, *args, **kwargs):
+            prof._entry.append(f"Netlist.{attr}")
+            try:
+                result = orig(nl, *args, **kwargs)
+            finally:
+                prof._entry.pop()
+            # run() evaluates every node, sync()/clock() return the updated ones
+            prof._count_updates(nl, None if attr == "run" else result)
+            return result
+
+        method.__name__ = attr
+        method.__doc__ = orig.__doc__
+        return method
+
+    def _count_updates(self, nl, nodes: Optional[List[int]]) -> None:
+        st = self._node_stats(nl)
+        if nodes is None:
+            st.updates += 1
+        elif len(nodes):
+            np.add.at(st.updates, np.asarray(nodes, dtype=np.int64), 1)
+
+    # --------------------------------------------------------------- results
+
+    def _node_time(self, st: _NodeStats) -> np.ndarray:
+        total = np.zeros(len(st.evals))
+        for t in st.time.values():
+            total += t
+        return total
+
+    @property
+    def gates(self) -> Dict[GateBase, List[int]]:
+        """gate -> [evals, redundant, reads, updates], summed over its nodes."""
+        out: Dict[GateBase, List[int]] = {}
+        for st in self._stats.values():
+            owner, gates = st.node_map()[:2]
+            if not len(gates):
+                continue
+            mask = owner >= 0
+            sums = [np.bincount(owner[mask], weights=arr[mask], minlength=len(gates))
+                    for arr in (st.evals, st.redundant, st.updates)]
+            for i, g in enumerate(gates):
+                row = out.setdefault(g, [0, 0, 0, 0])
+                row[0] += int(sums[0][i])
+                row[1] += int(sums[1][i])
+                row[3] += int(sums[2][i])
+        for g, reads in self._reads.items():
+            out.setdefault(g, [0, 0, 0, 0])[2] += reads
+        return {g: row for g, row in out.items() if any(row)}
+
+    @property
+    def by_type(self) -> Dict[str, List[float]]:
+        """gate type (opcode for nodes of inlined composites) -> [evals, total s, self s]."""
+        out: Dict[str, List[float]] = {}
+        for st in self._stats.values():
+            node_type, type_names = st.node_map()[5:]
+            evals = np.bincount(node_type, weights=st.evals, minlength=len(type_names))
+            secs = np.bincount(node_type, weights=self._node_time(st), minlength=len(type_names))
+            for j, name in enumerate(type_names):
+                if evals[j] or secs[j]:
+                    row = out.setdefault(name, [0, 0.0, 0.0])
+                    row[0] += int(evals[j])
+                    row[1] += float(secs[j])
+                    row[2] += float(secs[j])
+        return out
+
+    @property
+    def by_composite(self) -> Dict[str, List[float]]:
+        """composite instance path -> [evals, total s (with nested instances), self s]."""
+        out: Dict[str, List[float]] = {}
+        for st in self._stats.values():
+            _, _, scope, names, parent = st.node_map()[:5]
+            if not names:
+                continue
+            mask = scope >= 0
+            evals = np.bincount(scope[mask], weights=st.evals[mask], minlength=len(names))
+            own = np.bincount(scope[mask], weights=self._node_time(st)[mask], minlength=len(names))
+            total_evals, total = evals.copy(), own.copy()
+            for k in range(len(names) - 1, -1, -1):
+                if parent[k] >= 0:
+                    total_evals[parent[k]] += total_evals[k]
+                    total[parent[k]] += total[k]
+            for k, name in enumerate(names):
+                if total_evals[k] or total[k]:
+                    row = out.setdefault(name, [0, 0.0, 0.0])
+                    row[0] += int(total_evals[k])
+                    row[1] += float(total[k])
+                    row[2] += float(own[k])
+        return out
+
+    @property
+    def stacks(self) -> Dict[str, float]:
+        """"entry;instance;...;type" -> self time in s."""
+        out: Dict[str, float] = {}
+        for st in self._stats.values():
+            _, _, scope, names, parent, node_type, type_names = st.node_map()
+            chains = []
+            for k, name in enumerate(names):
+                chains.append(name if parent[k] < 0 else f"{chains[parent[k]]};{name}")
+            combined = (scope + 1) * len(type_names) + node_type
+            for label, t in st.time.items():
+                secs = np.bincount(combined, weights=t)
+                for c in np.flatnonzero(secs).tolist():
+                    k, j = divmod(c, len(type_names))
+                    frames = [label] + ([chains[k - 1]] if k else []) + [type_names[j]]
+                    key = ";".join(frames)
+                    out[key] = out.get(key, 0.0) + float(secs[c])
+        return out
+
+    def reset(self) -> None:
+        """Drop everything collected so far (keeps the profiler enabled)."""
+        self._stats.clear()
+        self._reads.clear()
+        self.max_depth = 0
+
+    def folded(self) -> List[str]:
+        """Call stacks in the folded format of flamegraph.pl / speedscope /
+        inferno: "frame;frame;frame <self time in microseconds>"."""
+        return [f"{stack} {round(s * 1e6)}" for stack, s in self.stacks.items() if round(s * 1e6) > 0]
+
+    def write_folded(self, path) -> None:
+        with open(path, "w") as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def report(self, top: int = 10) -> str:
+        lines = [f"max logic depth: {self.max_depth}", ""]
+
+        for title, table in (("gate type", self.by_type), ("composite", self.by_composite)):
+            if not table:
+                continue
+            lines.append(f"{title:<24} {'evals':>9} {'total ms':>10} {'self ms':>10}")
+            for key, (evals, total, own) in sorted(table.items(), key=lambda kv: -kv[1][1])[:top]:
+                lines.append(f"{key:<24} {evals:>9} {total * 1e3:>10.3f} {own * 1e3:>10.3f}")
+            lines.append("")
+
+        gates = self.gates
+        if gates:
+            lines.append(f"{'gate':<24} {'evals':>9} {'redundant':>10} {'reads':>9} {'updates':>9}")
+            busiest = sorted(gates.items(), key=lambda kv: -(kv[1][0] + kv[1][3]))[:top]
+            for g, (evals, redundant, reads, updates) in busiest:
+                lines.append(f"{str(g.name):<24} {evals:>9} {redundant:>10} {reads:>9} {updates:>9}")
+        return "\n".join(lines)
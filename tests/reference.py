@@ -0,0 +1,59 @@
+"""Small random circuits and a reference evaluator that reads the wiring
+off the gate objects one signal at a time, independent of the engines."""
+import itertools
+
+import numpy as np
+
+from logic_circuits.gates.gates import GateAND, GateNOT, GatePASS, SysIN
+
+
+def random_circuit(seed, num_in=5, num_gates=30, num_out=3):
+    """(output gate, SysIN) of a random acyclic AND/NOT network whose last
+    `num_out` gates drive the outputs."""
+    rng = np.random.default_rng(seed)
+    sysin = SysIN("in", num_in, num_in)
+    signals = [(sysin, k) for k in range(num_in)]
+    for k in range(num_gates):
+        if rng.random() < 0.3:
+            g = GateNOT(f"g{k}")
+            ports = 1
+        else:
+            g = GateAND(f"g{k}")
+            ports = 2
+        for port in range(ports):
+            src, src_port = signals[rng.integers(len(signals))]
+            g.wire_up(src, g, src_port, port)
+        signals.append((g, 0))
+    out = GatePASS("out", num_out, num_out)
+    for k, (g, port) in enumerate(signals[-num_out:]):
+        out.wire_up(g, out, port, k)
+    return out, sysin
+
+
+def reference(gate, x):
+    """Output values of `gate` for SysIN values `x`."""
+    memo = {}
+
+    def signal(g, port):
+        key = (id(g), port)
+        if key not in memo:
+            if isinstance(g, SysIN):
+                memo[key] = bool(x[port])
+            else:
+                wires = sorted(zip(g.to_port, g.from_gate, g.from_port), key=lambda w: w[0])
+                ins = [signal(f, fp) for _, f, fp in wires]
+                if isinstance(g, GateAND):
+                    memo[key] = all(ins)
+                elif isinstance(g, GateNOT):
+                    memo[key] = not ins[0]
+                else:
+                    memo[key] = ins[port]
+        return memo[key]
+
+    return [signal(gate, k) for k in range(gate.num_out)]
+
+
+def reference_table(gate, num_in):
+    """(2**num_in, num_out) outputs, inputs in itertools.product order."""
+    rows = itertools.product([False, True], repeat=num_in)
+    return np.array([reference(gate, x) for x in rows], dtype=bool)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from logic_circuits.simulation import codegen, pack_vectors, simulate, unpack_vectors
+from reference import random_circuit, reference
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_simulate(seed):
+    out, sysin = random_circuit(seed)
+    rng = np.random.default_rng(seed)
+    stimuli = rng.integers(0, 2, size=(200, 5)).astype(bool)
+    expected = np.array([reference(out, x) for x in stimuli], dtype=bool)
+    assert np.array_equal(simulate(out, stimuli, sysin), expected)
+    assert np.array_equal(simulate(out, stimuli, sysin, batch_size=70), expected)
+    assert simulate(out, stimuli[0], sysin).tolist() == expected[0].tolist()
+
+
+def test_pack_round_trip():
+    bits = np.random.default_rng(0).integers(0, 2, size=(3, 130)).astype(bool)
+    assert np.array_equal(unpack_vectors(pack_vectors(bits), 130), bits)
+
+
+def test_codegen_backend(monkeypatch):
+    out, sysin = random_circuit(0)
+    stimuli = np.random.default_rng(0).integers(0, 2, size=(100, 5)).astype(bool)
+    expected = simulate(out, stimuli, sysin)
+    assert np.array_equal(simulate(out, stimuli, sysin, backend="codegen"), expected)
+    # large netlists are left to the interpreter instead of being compiled
+    monkeypatch.setattr(codegen, "MAX_NODES", 0)
+    monkeypatch.setattr(codegen, "compile_python", None)
+    assert np.array_equal(simulate(out, stimuli, sysin, backend="codegen"), expected)
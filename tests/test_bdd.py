@@ -0,0 +1,29 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from logic_circuits.simulation import bdd_equivalent, circuit_to_bdd, optimize
+from reference import random_circuit, reference_table
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bdd_matches_truth_table(seed):
+    out, sysin = random_circuit(seed)
+    bdd, roots = circuit_to_bdd(out, sysin)
+    table = reference_table(out, 5)
+    rows = list(itertools.product([False, True], repeat=5))
+    for k, f in enumerate(roots):
+        assert [bdd.evaluate(f, x) for x in rows] == table[:, k].tolist()
+        assert bdd.count_sat(f) == int(table[:, k].sum())
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bdd_equivalent(seed):
+    a, a_in = random_circuit(seed, num_gates=12, num_out=2)
+    b, b_in = random_circuit(seed + 100, num_gates=12, num_out=2)
+    same = np.array_equal(reference_table(a, 5), reference_table(b, 5))
+    assert bdd_equivalent(a, b, a_in, b_in) == same
+
+    opt, _ = optimize(a, a_in)
+    assert bdd_equivalent(a, opt, a_in)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from logic_circuits.simulation import truth_table
+from reference import random_circuit, reference_table
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_truth_table(seed):
+    out, sysin = random_circuit(seed)
+    table = truth_table(out, sysin)
+    assert len(table) == 32
+    assert np.array_equal(table.outputs, reference_table(out, 5))
+
+
+def test_truth_table_spans_several_words():
+    out, sysin = random_circuit(0, num_in=8, num_gates=60)
+    assert np.array_equal(truth_table(out, sysin).outputs, reference_table(out, 8))
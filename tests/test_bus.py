@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from logic_circuits.gates.gates import GateAND, GateNOT, SysIN, SysOUT
+from logic_circuits.simulation import compile_circuit, truth_table
+
+
+def bus_circuit(width):
+    """out = NOT(a AND b) on two `width`-bit buses."""
+    sysin = SysIN("in", 2, 2, width=width)
+    g = GateAND("g", width=width)
+    g.wire_up(sysin, g, 0, 0)
+    g.wire_up(sysin, g, 1, 1)
+    n = GateNOT("n", width=width)
+    n.wire_up(g, n, 0, 0)
+    out = SysOUT("out", width=width)
+    out.wire_up(n, out, 0, 0)
+    return sysin, out
+
+
+def test_bus_words():
+    sysin, out = bus_circuit(16)
+    nl = compile_circuit(out, sysin)
+    assert (nl.num_in, nl.num_out) == (32, 16)
+    rng = np.random.default_rng(0)
+    for a, b in rng.integers(0, 1 << 16, size=(20, 2)).tolist():
+        sysin.set_state([0, 1], [a, b])
+        word = int(np.dot(out.state.astype(np.int64), 1 << np.arange(16)))
+        assert word == ~(a & b) & 0xFFFF
+
+
+def test_bus_truth_table():
+    sysin, out = bus_circuit(3)
+    table = truth_table(out, sysin)
+    ins = table.inputs
+    assert np.array_equal(table.outputs, ~(ins[:, :3] & ins[:, 3:]))
+
+
+def test_width_mismatch():
+    sysin = SysIN("in", 1, 1, width=4)
+    g = GateNOT("n", width=8)
+    with pytest.raises(Exception):
+        g.wire_up(sysin, g, 0, 0)
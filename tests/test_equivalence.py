@@ -0,0 +1,59 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from logic_circuits.simulation import compile_circuit, equivalent, optimize, solve, tseitin
+from reference import random_circuit, reference, reference_table
+
+
+def satisfiable(num_vars, clauses):
+    return any(
+        all(any(m[abs(lit) - 1] == (lit > 0) for lit in c) for c in clauses)
+        for m in itertools.product([False, True], repeat=num_vars)
+    )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_solve_random_cnf(seed):
+    rng = np.random.default_rng(seed)
+    num_vars = 6
+    clauses = [
+        ((rng.choice(num_vars, size=3, replace=False) + 1) * rng.choice([-1, 1], size=3)).tolist()
+        for _ in range(rng.integers(10, 40))
+    ]
+    model = solve(num_vars, clauses)
+    assert (model is not None) == satisfiable(num_vars, clauses)
+    if model is not None:
+        assert all(any(model[abs(lit)] == (lit > 0) for lit in c) for c in clauses)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_solve_circuit_outputs(seed):
+    out, sysin = random_circuit(seed)
+    nl = compile_circuit(out, sysin)
+    table = reference_table(out, 5)
+    for k, node in enumerate(nl.outputs.tolist()):
+        for value in (True, False):
+            model = solve(nl.num_nodes, tseitin(nl) + [[node + 1 if value else -(node + 1)]])
+            assert (model is not None) == bool((table[:, k] == value).any())
+            if model is not None:
+                x = [model[n + 1] for n in nl.inputs.tolist()]
+                assert reference(out, x)[k] == value
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_equivalent(seed):
+    a, a_in = random_circuit(seed, num_gates=12, num_out=2)
+    b, b_in = random_circuit(seed + 100, num_gates=12, num_out=2)
+    same = np.array_equal(reference_table(a, 5), reference_table(b, 5))
+
+    for sim_words in (1, 0):                # simulation, then SAT alone
+        result = equivalent(a, b, a_in, b_in, sim_words=sim_words, seed=seed)
+        assert bool(result) == same
+        if not same:
+            cex = result.counterexample
+            assert reference(a, cex) != reference(b, cex)
+
+    opt, _ = optimize(a, a_in)
+    assert equivalent(a, opt, a_in, sim_words=0)
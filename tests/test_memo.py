@@ -0,0 +1,101 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from logic_circuits.gates.gates import SysIN, SysOUT, make_combined_gate_class
+from logic_circuits.benchmarks import ripple_carry_adder
+from logic_circuits.simulation import compile_circuit, simulate, truth_table
+
+
+def full_adder_class():
+    out, _ = ripple_carry_adder(1)      # inputs a, b, cin; outputs s, cout
+    return make_combined_gate_class("FA", [], [out], 3, 2)
+
+
+def ripple_adder(fa_class, n):
+    """n-bit adder built from n instances of `fa_class`."""
+    sysin = SysIN("s", num_in=2 * n + 1, num_out=2 * n + 1)
+    fas = [fa_class(f"fa{k}") for k in range(n)]
+    carry = (sysin, 2 * n)
+    for k, fa in enumerate(fas):
+        fa.wire_up(sysin, fa, k, 0)
+        fa.wire_up(sysin, fa, n + k, 1)
+        fa.wire_up(carry[0], fa, carry[1], 2)
+        carry = (fa, 1)
+    sysout = SysOUT("out", num_in=n + 1, num_out=n + 1)
+    for k, fa in enumerate(fas):
+        sysout.wire_up(fa, sysout, 0, k)
+    sysout.wire_up(fas[-1], sysout, 1, n)
+    return sysin, sysout
+
+
+def expected_sum(bits, n):
+    a = int("".join(map(str, bits[:n][::-1])), 2)
+    b = int("".join(map(str, bits[n:2 * n][::-1])), 2)
+    total = a + b + bits[2 * n]
+    return [bool(total >> k & 1) for k in range(n + 1)]
+
+
+@pytest.mark.parametrize("table", [True, False])
+def test_memoized_instances_hit_the_cache(table):
+    n = 3
+    FA = full_adder_class()
+    sysin, sysout = ripple_adder(FA, n)
+    reference = truth_table(compile_circuit(sysout, sysin)).output_rows()
+
+    FA.memoize(maxsize=64, table=table)
+    nl = compile_circuit(sysout, sysin)
+    assert len(nl.macros) == n
+
+    # batch engine
+    assert np.array_equal(truth_table(nl).output_rows(), reference)
+    info = FA.cache_info()
+    assert info["hits"] > 0
+
+    # event-driven engine behind .state
+    lookups = info["hits"] + info["misses"]
+    for bits in itertools.product([0, 1], repeat=2 * n + 1):
+        sysin.set_state(list(range(2 * n + 1)), [bool(b) for b in bits])
+        assert list(sysout.state) == expected_sum(bits, n)
+    info = FA.cache_info()
+    assert info["hits"] + info["misses"] > lookups
+    assert sysout.compile().macros
+
+    x = np.random.default_rng(0).integers(0, 2, (40, 2 * n + 1)).astype(bool)
+    assert np.array_equal(simulate(nl, x), [expected_sum(row.astype(int).tolist(), n) for row in x])
+
+
+def test_unmemoize_recompiles_with_gates():
+    FA = full_adder_class()
+    sysin, sysout = ripple_adder(FA, 2)
+    FA.memoize()
+    assert sysout.compile().macros
+    FA.unmemoize()
+    assert not sysout.compile().macros
+    assert FA.cache_info() is None
+
+
+def test_nested_memoized_composites():
+    FA = full_adder_class()
+    sysin2, sysout2 = ripple_adder(FA, 2)
+    reference = truth_table(compile_circuit(sysout2, sysin2)).output_rows()
+    A2 = make_combined_gate_class("A2", [], [sysout2], 5, 3)
+
+    for inner, outer in [(True, False), (False, True), (True, True)]:
+        FA.unmemoize()
+        A2.unmemoize()
+        if inner:
+            FA.memoize()
+        if outer:
+            A2.memoize()
+        sysin = SysIN("x", num_in=5, num_out=5)
+        adder = A2("a")
+        sysout = SysOUT("y", num_in=3, num_out=3)
+        for k in range(5):
+            adder.wire_up(sysin, adder, k, k)
+        for k in range(3):
+            sysout.wire_up(adder, sysout, k, k)
+        nl = compile_circuit(sysout, sysin)
+        assert np.array_equal(truth_table(nl).output_rows(), reference)
+        assert (A2 if outer else FA).cache_info()["hits"] > 0
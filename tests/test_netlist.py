@@ -0,0 +1,61 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from logic_circuits.gates.gates import GateAND, GateNOT, GatePASS, SysIN
+from logic_circuits.simulation import compile_circuit
+from reference import random_circuit, reference, reference_table
+
+SEEDS = range(8)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_evaluate_matches_gates(seed):
+    out, sysin = random_circuit(seed)
+    nl = compile_circuit(out, sysin)
+    assert (nl.num_in, nl.num_out) == (5, 3)
+    rows = np.array(list(itertools.product([False, True], repeat=5)), dtype=bool)
+    assert np.array_equal(nl.evaluate(rows.T).T, reference_table(out, 5))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_state_follows_inputs(seed):
+    out, sysin = random_circuit(seed)
+    rng = np.random.default_rng(seed)
+    for x in rng.integers(0, 2, size=(10, 5)).astype(bool):
+        sysin.set_state(list(range(5)), x.tolist())
+        assert out.state.tolist() == reference(out, x)
+
+
+def test_rewiring_recompiles():
+    sysin = SysIN("in", 2, 2)
+    n = GateNOT("n")
+    n.wire_up(sysin, n, 0, 0)
+    sysin.set_state([0, 1], [False, True])
+    assert n.state.tolist() == [True]
+
+    g = GateAND("g")
+    g.wire_up(n, g, 0, 0)
+    g.wire_up(sysin, g, 1, 1)
+    assert g.state.tolist() == [True]
+    sysin.set_state(0, True)
+    assert n.state.tolist() == [False] and g.state.tolist() == [False]
+
+
+def test_resize_unwires_removed_ports():
+    sysin = SysIN("in", 3, 3)
+    p = GatePASS("p", 3, 3)
+    for k in range(3):
+        p.wire_up(sysin, p, k, k)
+    a = GateAND("a")
+    a.wire_up(p, a, 0, 0)
+    a.wire_up(p, a, 2, 1)
+    assert a.state[0] == False
+
+    p._resize(2, 2)
+    assert p.to_port == [0, 1] and sysin._fanout == [p, p]
+    assert a.from_port == [0] and a.to_port == [0] and p._fanout == [a]
+    a.wire_up(p, a, 1, 1)
+    sysin.set_state([0, 1], [True, True])
+    assert a.state[0] == True
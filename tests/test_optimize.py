@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+
+from logic_circuits.simulation import compile_circuit, gate_count, optimize, truth_table
+from reference import random_circuit, reference_table
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_optimize_preserves_truth_table(seed):
+    out, sysin = random_circuit(seed)
+    opt, stats = optimize(out, sysin)
+    assert np.array_equal(truth_table(opt).outputs, reference_table(out, 5))
+    assert gate_count(opt) <= gate_count(compile_circuit(out, sysin))
+    assert set(stats) >= {"buffers", "constants", "double_not", "hashed", "dead"}
@@ -0,0 +1,50 @@
+from logic_circuits.gates.gates import SysIN, SysOUT, GateAND, GateNOT, make_combined_gate_class
+from logic_circuits.simulation import Netlist
+from logic_circuits.utils import GateBase, GateProfiler
+
+
+def nand_circuit():
+    a = SysIN("in", num_in=2, num_out=2)
+    g = GateAND("g")
+    n = GateNOT("n")
+    g.wire_up(a, g, 0, 0)
+    g.wire_up(a, g, 1, 1)
+    n.wire_up(g, n, 0, 0)
+    nand = make_combined_gate_class("NAND", [], [n], 2, 1)
+
+    s = SysIN("s", num_in=2, num_out=2)
+    x = nand("x1")
+    x.wire_up(s, x, 0, 0)
+    x.wire_up(s, x, 1, 1)
+    out = SysOUT("o")
+    out.wire_up(x, out, 0, 0)
+    return s, x, out
+
+
+def test_profiler_counts_netlist_work():
+    state = GateBase.__dict__["state"]
+    s, x, out = nand_circuit()
+    with GateProfiler() as prof:
+        out.state
+        s.set_state(0, True)
+        out.state
+        s.set_state(1, True)
+        out.state
+    assert GateBase.__dict__["state"] is state and Netlist._tracer is None
+
+    assert prof.max_depth > 0
+    assert prof.gates[out][2] == 3          # reads
+    assert prof.gates[out][0] > 0           # evaluations
+    assert "x1" in prof.by_composite and {"AND", "NOT"} <= set(prof.by_type)
+    assert any(stack.startswith("Netlist.sync;x1;") for stack in prof.stacks)
+
+
+def test_profiler_counts_redundant_evaluations():
+    s, x, out = nand_circuit()
+    out.state
+    nl = out.compile()
+    with GateProfiler() as prof:
+        nl.evaluate_nodes(nl.read_inputs())
+        nl.evaluate_nodes(nl.read_inputs())
+    evals, redundant = prof.gates[out][:2]
+    assert evals == 2 and redundant == 1
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from reference import random_circuit, reference
+
+
+def fanout_cone(nl, seeds):
+    cone, stack = set(seeds), list(seeds)
+    while stack:
+        n = stack.pop()
+        for j in nl.fanout[nl.fanout_ptr[n]:nl.fanout_ptr[n + 1]].tolist():
+            if j not in cone:
+                cone.add(j)
+                stack.append(j)
+    return cone
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_toggles_follow_reference(seed):
+    out, sysin = random_circuit(seed)
+    rng = np.random.default_rng(seed)
+    x = [False] * 5
+    sysin.set_state(list(range(5)), x)
+    for k in rng.integers(0, 5, size=30).tolist():
+        x[k] = not x[k]
+        sysin.set_state(k, x[k])
+        assert out.state.tolist() == reference(out, x)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_sync_stays_in_fanout_cone(seed):
+    out, sysin = random_circuit(seed)
+    nl = out.compile()
+    nl.sync()
+    assert nl.sync() == []
+    for k in range(5):
+        x = sysin.state.copy()
+        x[k] = not x[k]
+        sysin._set_state_vec(x)
+        changed = nl.sync()
+        assert int(nl.inputs[k]) in changed
+        assert set(changed) <= fanout_cone(nl, [int(nl.inputs[k])])
+        assert out.state.tolist() == reference(out, x)
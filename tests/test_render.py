@@ -0,0 +1,51 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from logic_circuits.pygame_representation.render import Renderer, background
+
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((200, 120))
+    pygame.display.quit()
+
+
+def box(key, rect, color):
+    rect = pygame.Rect(rect)
+    return (key, rect, (tuple(rect), color), lambda surf: surf.fill(color, rect))
+
+
+def test_redraws_only_changes(screen):
+    r = Renderer(screen)
+    a = box("a", (10, 10, 20, 20), (255, 0, 0))
+    b = box("b", (100, 50, 30, 30), (0, 255, 0))
+    assert r.frame([a, b]) == [screen.get_rect()]
+    assert screen.get_at((15, 15))[:3] == (255, 0, 0)
+    assert r.frame([a, b]) == []
+
+    # a moves: its old and new place are redrawn, b is untouched
+    moved = box("a", (40, 10, 20, 20), (255, 0, 0))
+    dirty = r.frame([moved, b])
+    assert dirty and not any(d.colliderect(b[1]) for d in dirty)
+    assert any(d.contains(pygame.Rect(10, 10, 20, 20)) for d in dirty)
+    assert screen.get_at((15, 15)) == background(200, 120).get_at((15, 15))
+    assert screen.get_at((45, 15))[:3] == (255, 0, 0)
+
+    # b changes colour, then disappears
+    assert r.frame([moved, box("b", (100, 50, 30, 30), (0, 0, 255))]) == [b[1]]
+    assert screen.get_at((110, 60))[:3] == (0, 0, 255)
+    assert r.frame([moved]) == [b[1]]
+    assert screen.get_at((110, 60)) == background(200, 120).get_at((110, 60))
+
+
+def test_invalidate_redraws_everything(screen):
+    r = Renderer(screen)
+    items = [box("a", (10, 10, 20, 20), (255, 0, 0))]
+    r.frame(items)
+    r.invalidate()
+    assert r.frame(items) == [screen.get_rect()]
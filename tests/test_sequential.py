@@ -0,0 +1,90 @@
+import numpy as np
+
+from logic_circuits.gates.gates import GateDFF, GateLATCH, GateNOT, GatePASS, SysIN
+from logic_circuits.simulation import SequentialSimulator, compile_circuit
+
+
+def toggle(init=False):
+    q = GateDFF("q", init=init)
+    n = GateNOT("n")
+    n.wire_up(q, n, 0, 0)
+    q.wire_up(n, q, 0, 0)
+    out = GatePASS("out")
+    out.wire_up(q, out, 0, 0)
+    return q, out
+
+
+def shift_register():
+    sysin = SysIN("in")
+    q1, q2 = GateDFF("q1"), GateDFF("q2")
+    q1.wire_up(sysin, q1, 0, 0)
+    q2.wire_up(q1, q2, 0, 0)
+    out = GatePASS("out", 2, 2)
+    out.wire_up(q1, out, 0, 0)
+    out.wire_up(q2, out, 0, 1)
+    return sysin, out
+
+
+def test_toggle():
+    _, out = toggle()
+    sim = SequentialSimulator(out)
+    assert sim.step(4)[:, 0].tolist() == [False, True, False, True]
+    sim.reset()
+    assert sim.cycle == 0 and sim.step(1)[0, 0] == False
+
+
+def test_reset_uses_constructor_init():
+    q, out = toggle()
+    q.clock()
+    assert out.state[0] == True
+    # a recompiled netlist starts from init, not from the current output
+    assert SequentialSimulator(compile_circuit(out)).step(1)[0, 0] == False
+
+
+def test_shift_register_lanes():
+    sysin, out = shift_register()
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 2, size=(20, 3, 1)).astype(bool)
+    got = SequentialSimulator(out, sysin, lanes=3).step(20, x)
+    for c in range(20):
+        for lane in range(3):
+            q1 = bool(x[c - 1, lane, 0]) if c >= 1 else False
+            q2 = bool(x[c - 2, lane, 0]) if c >= 2 else False
+            assert got[c, lane].tolist() == [q1, q2]
+
+
+def test_clock_through_gates():
+    sysin, out = shift_register()
+    q1 = out.from_gate[0]
+    sysin.set_state(0, True)
+    assert out.state.tolist() == [False, False]
+    q1.clock()
+    assert out.state.tolist() == [True, False]
+    sysin.set_state(0, False)
+    q1.clock()
+    assert out.state.tolist() == [False, True]
+
+
+def test_latch_cycles():
+    sysin = SysIN("in", 2, 2)
+    latch = GateLATCH("l")
+    latch.wire_up(sysin, latch, 0, 0)
+    latch.wire_up(sysin, latch, 1, 1)
+    # (D, EN) per cycle: transparent, hold, transparent, hold
+    stimuli = np.array([[1, 1], [0, 0], [0, 1], [1, 0]], dtype=bool)
+    got = SequentialSimulator(latch, sysin).step(4, stimuli)
+    assert got[:, 0].tolist() == [True, True, False, False]
+
+
+def test_latch_holds_between_clocks():
+    sysin = SysIN("in", 2, 2)
+    latch = GateLATCH("l")
+    latch.wire_up(sysin, latch, 0, 0)
+    latch.wire_up(sysin, latch, 1, 1)
+    out = GatePASS("out")
+    out.wire_up(latch, out, 0, 0)
+    got = []
+    for d, en in [(1, 1), (1, 0), (0, 0), (0, 1), (1, 0)]:
+        sysin.set_state([0, 1], [bool(d), bool(en)])
+        got.append(bool(out.state[0]))
+    assert got == [True, True, True, False, False]
@@ -0,0 +1,89 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from logic_circuits.pygame_representation.gates_graphical import GateAND_graphical, GatePass_graphical, SysIN_graphical
+from logic_circuits.pygame_representation.spatial import EditorIndex, SpatialGrid
+from logic_circuits.pygame_representation.utils import block_under_mouse, find_wire_under_mouse, port_under_mouse
+from logic_circuits.pygame_representation.wires import Wire
+
+
+def scene(seed, n_blocks=30, n_wires=30):
+    rng = np.random.default_rng(seed)
+    blocks = [GateAND_graphical(f"g{k}", *rng.integers(0, 1200, size=2).tolist(), w=120, h=80)
+              for k in range(n_blocks)]
+    wires = []
+    for _ in range(n_wires):
+        a, b = rng.choice(n_blocks, size=2, replace=False).tolist()
+        wires.append(Wire(blocks[a].outputs[0], blocks[b].inputs[int(rng.integers(2))]))
+    index = EditorIndex()
+    for b in blocks:
+        index.add_block(b)
+    for w in wires:
+        index.add_wire(w)
+    return rng, blocks, wires, index
+
+
+def probes(rng, blocks, wires):
+    pts = rng.integers(0, 1400, size=(300, 2)).tolist()
+    pts += [tuple(p.screen_pos() + rng.integers(-9, 10, size=2)) for b in blocks for p in b.inputs + b.outputs]
+    for w in wires:
+        line = w._points()
+        pts += [tuple(np.add(line[k], rng.integers(-8, 9, size=2))) for k in range(0, len(line), 5)]
+    return [(int(x), int(y)) for x, y in pts]
+
+
+def check(rng, blocks, wires, index):
+    for pos in probes(rng, blocks, wires):
+        assert index.block_at(pos) is block_under_mouse(pos, blocks)
+        assert index.port_at(pos) is port_under_mouse(pos, blocks)
+        assert index.port_at(pos, "in") is port_under_mouse(pos, blocks, "in")
+        assert index.wire_at(pos) is find_wire_under_mouse(pos, wires)
+
+
+def test_queries_match_linear_scans():
+    check(*scene(0))
+
+
+def test_queries_after_moves_and_removal():
+    rng, blocks, wires, index = scene(1)
+    for b in blocks[:10]:
+        b.move_by(*rng.integers(-200, 200, size=2).tolist())
+        index.update_block(b)
+    gone = blocks.pop(3)
+    index.remove_block(gone)
+    wires = [w for w in wires if gone not in (w.a.gate, w.b.gate)]
+    check(rng, blocks, wires, index)
+
+
+def test_resize_buttons_match_scan():
+    rng = np.random.default_rng(2)
+    blocks = [cls(f"b{k}", *rng.integers(0, 400, size=2).tolist())
+              for k, cls in enumerate([SysIN_graphical, GatePass_graphical] * 5)]
+    index = EditorIndex()
+    for b in blocks:
+        index.add_block(b)
+    for b in blocks[:5]:
+        # moves leave the buttons behind vertically; draw() re-centres them
+        b.rect.move_ip(*rng.integers(-100, 100, size=2).tolist())
+        index.update_block(b)
+        b.plus.centerx = b.minus.centerx = b.rect.centerx
+    pts = [tuple(r.center + rng.integers(-15, 16, size=2)) for b in blocks for r in (b.plus, b.minus) for _ in range(10)]
+    pts += rng.integers(0, 700, size=(300, 2)).tolist()
+    for pos in pts:
+        hits = index.resizers_at(pos)
+        assert [b for b in hits if b.hover_plus(pos)] == [b for b in blocks if b.hover_plus(pos)]
+        assert [b for b in hits if b.hover_minus(pos)] == [b for b in blocks if b.hover_minus(pos)]
+
+
+def test_grid_moves_objects():
+    grid = SpatialGrid(cell=10)
+    grid.insert("a", pygame.Rect(0, 0, 25, 5))
+    assert list(grid.at((22, 2))) == ["a"]
+    grid.insert("a", pygame.Rect(50, 50, 5, 5))
+    assert list(grid.at((22, 2))) == [] and list(grid.at((52, 52))) == ["a"]
+    grid.remove("a")
+    assert "a" not in grid and len(grid) == 0
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from logic_circuits.gates.gates import GateDFF, GateNOT, GatePASS
+from logic_circuits.simulation import CircuitFile, compile_circuit, load_netlist, save_circuit, save_netlist, truth_table
+from reference import random_circuit, reference_table
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_save_circuit_round_trip(seed, tmp_path):
+    out, sysin = random_circuit(seed)
+    path = tmp_path / "circuit.lcnl"
+    save_circuit(path, out, sysin)
+    table = reference_table(out, 5)
+
+    f = CircuitFile(path)
+    assert np.array_equal(truth_table(f.netlist()).outputs, table)
+    _, _, inputs, outputs = f.gates()
+    assert np.array_equal(truth_table(outputs[0], inputs[0]).outputs, table)
+
+
+def test_save_netlist_round_trip(tmp_path):
+    out, sysin = random_circuit(0)
+    nl = compile_circuit(out, sysin)
+    save_netlist(tmp_path / "n.lcnl", nl)
+    loaded = load_netlist(tmp_path / "n.lcnl")
+    assert list(loaded.names) == list(nl.names)
+    assert truth_table(loaded) == truth_table(nl)
+
+
+def test_save_circuit_keeps_register_init(tmp_path):
+    q, n, out = GateDFF("q", init=True), GateNOT("n"), GatePASS("out")
+    n.wire_up(q, n, 0, 0)
+    q.wire_up(n, q, 0, 0)
+    out.wire_up(q, out, 0, 0)
+    q.clock()
+    assert out.state[0] == False
+    save_circuit(tmp_path / "c.lcnl", out)
+    gate_list, _, _, _ = CircuitFile(tmp_path / "c.lcnl").gates()
+    assert [g.init for g in gate_list if isinstance(g, GateDFF)] == [True]
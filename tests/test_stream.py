@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from logic_circuits.simulation import VectorReader, VectorWriter, port_columns, simulate_file, stream_simulate
+from reference import random_circuit, reference
+
+
+@pytest.mark.parametrize("fmt", ["csv", "bits"])
+@pytest.mark.parametrize("seed", range(8))
+def test_stream_simulate(seed, fmt, tmp_path):
+    out, sysin = random_circuit(seed)
+    rng = np.random.default_rng(seed)
+    stimuli = rng.integers(0, 2, size=(50, 5)).astype(bool)
+    expected = np.array([reference(out, x) for x in stimuli], dtype=bool)
+
+    in_path = tmp_path / f"in.{fmt}"
+    with VectorWriter(in_path, 5, fmt) as w:
+        w.write(stimuli[:20])
+        w.write(stimuli[20:])
+    chunks = list(stream_simulate(out, in_path, sysin, fmt=fmt, chunk_vectors=7))
+    assert max(len(c) for c in chunks) <= 7
+    assert np.array_equal(np.vstack(chunks), expected)
+
+    out_path = tmp_path / f"out.{fmt}"
+    assert simulate_file(out, in_path, out_path, sysin, in_fmt=fmt, out_fmt=fmt, chunk_vectors=7) == 50
+    assert np.array_equal(np.vstack(list(VectorReader(out_path, 3, fmt))), expected)
+
+
+def test_csv_header_reorders_columns(tmp_path):
+    out, sysin = random_circuit(0)
+    x = np.random.default_rng(0).integers(0, 2, size=(10, 5)).astype(bool)
+    names = port_columns(out, sysin)
+    path = tmp_path / "in.csv"
+    with VectorWriter(path, 5, columns=names[::-1]) as w:
+        w.write(x[:, ::-1])
+    got = np.vstack(list(stream_simulate(out, path, sysin)))
+    assert np.array_equal(got, np.array([reference(out, v) for v in x], dtype=bool))
@@ -0,0 +1,42 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from logic_circuits.pygame_representation.gates_graphical import GateAND_graphical
+from logic_circuits.pygame_representation.utils import bezier_array, segment_distances
+from logic_circuits.pygame_representation.wires import Wire
+
+
+def test_bezier_matches_formula():
+    p = np.array([(3, 7), (90, 7), (20, 150), (200, 160)], dtype=float)
+    pts = bezier_array(*map(tuple, p), steps=36)
+    for k, t in enumerate(np.linspace(0, 1, 37)):
+        exact = (1 - t) ** 3 * p[0] + 3 * (1 - t) ** 2 * t * p[1] + 3 * (1 - t) * t ** 2 * p[2] + t ** 3 * p[3]
+        assert np.abs(pts[k] - exact).max() <= 1
+
+
+def test_segment_distances():
+    rng = np.random.default_rng(0)
+    p, q = rng.uniform(0, 100, size=(2, 50, 2))
+    q[0] = p[0]                 # degenerate segment
+    pos = (40.0, 60.0)
+    for d, a, b in zip(segment_distances(p, q, pos), p, q):
+        ts = np.linspace(0, 1, 20001)[:, None]
+        brute = np.sqrt((((a + ts * (b - a)) - pos) ** 2).sum(axis=1)).min()
+        assert abs(d - brute) < 1e-2
+
+
+def test_wire_points_follow_blocks():
+    a = GateAND_graphical("a", 0, 0)
+    b = GateAND_graphical("b", 400, 300)
+    w = Wire(a.outputs[0], b.inputs[0])
+    pts = w.points_array()
+    assert w.points_array() is pts
+    assert tuple(pts[0]) == tuple(map(int, a.outputs[0].screen_pos()))
+    b.move_by(50, -20)
+    moved = w.points_array()
+    assert moved is not pts
+    assert tuple(moved[-1]) == tuple(map(int, b.inputs[0].screen_pos()))
+    assert w.hit_test(tuple(moved[18])) and not w.hit_test((-500, -500))
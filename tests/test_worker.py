@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+import pytest
+
+from logic_circuits.gates.gates import GateNOT
+from logic_circuits.simulation import SimulationWorker
+from reference import random_circuit, reference
+
+
+class Published:
+    """on_publish callback that lets the test wait for a snapshot."""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def __call__(self, snapshot):
+        self.event.set()
+
+    def wait(self, worker, version):
+        while worker.snapshot.version < version:
+            assert self.event.wait(5)
+            self.event.clear()
+        return worker.snapshot
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_snapshots_follow_inputs(seed):
+    out, sysin = random_circuit(seed)
+    published = Published()
+    with SimulationWorker(published) as worker:
+        worker.load([out], inputs=sysin)
+        snap = published.wait(worker, 1)
+        assert snap.error is None
+        x0 = [False] * 5
+        assert [snap.value(out, k) for k in range(3)] == reference(out, x0)
+
+        rng = np.random.default_rng(seed)
+        version = snap.version
+        for x in rng.integers(0, 2, size=(10, 5)).astype(bool):
+            worker.set_inputs(x)
+            version += 1
+            snap = published.wait(worker, version)
+            assert [snap.value(out, k) for k in range(3)] == reference(out, x)
+
+
+def test_load_error_keeps_last_values():
+    out, sysin = random_circuit(0)
+    published = Published()
+    with SimulationWorker(published) as worker:
+        worker.load([out], inputs=sysin)
+        ok = published.wait(worker, 1)
+        a, b = GateNOT("a"), GateNOT("b")
+        a.wire_up(b, a, 0, 0)
+        b.wire_up(a, b, 0, 0)
+        worker.load([a])            # combinational loop
+        snap = published.wait(worker, 2)
+        assert snap.error is not None
+        assert snap.gate_nodes is ok.gate_nodes